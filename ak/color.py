@@ -32,6 +32,16 @@ ColorBytes - analog of ColorFmt, but for bytes.
       can be converted to str
     - ColorBytes produces simple bytes.
 
+set_display_width_mode - by default length of a text is the number of characters
+    in it. Text containing wide (CJK, emoji) or zero-width (combining) characters
+    takes different number of positions on screen. Turn on display-width mode
+    to make CHText (and tables and other objects printed with it) take it
+    into account.
+
+strip_colors_file - copies a (large) file removing color sequences from it.
+    Use it to clean up colored log files. bin/strip_colors.py is a command line
+    interface to this function.
+
 Example of usage:
     green_fmt = ColorFmt('GREEN')  # check doc for more options
     t = green_fmt("some green text") + " and normal text "
@@ -45,11 +55,26 @@ Example of usage:
     # produce string with same text but no color escape sequences
     t_plain_text = t.plain_text()
 
+    # restore CHText from a string with color escape sequences
+    t1 = CHText.from_ansi(str(t))   # t1 == t
+
+Thread safety:
+    Palettes and ColorsConfig lazily fill internal caches on first use. These
+    caches are copy-on-write dictionaries: readers never take a lock, writers
+    build an updated copy under a module-level lock and publish it with a single
+    assignment. So palettes can be used to render text from several threads.
+
 Colors examples:
     use bin/colors_demo.py script to print examples of colored text.
 """
 
+import os
 import re
+import json
+import mmap
+import functools
+import threading
+import unicodedata
 from dataclasses import dataclass
 
 from typing import Iterator
@@ -314,9 +339,120 @@ class _ColorCodesSet:
             f"Invalid {param_name} object: {type(orig_color_arg)}: {orig_color_arg!r}")
 
 
+#########################
+# Display width of text
+
+# Function which calculates the number of screen positions taken by a text.
+# Depends on display-width mode, check set_display_width_mode.
+text_width = len
+
+# Widths of the code points in range(_WIDTH_TABLE_SIZE) are stored in a table
+# (bytearray, a byte per code point). The table is created on demand. Widths of
+# other (rare) code points are calculated using unicodedata.
+_WIDTH_TABLE_SIZE = 0x40000
+_WIDTH_TABLE = None
+
+
+def set_display_width_mode(enabled):
+    """Turn on/off display-width mode.
+
+    By default length of a text is the number of characters in it. In
+    display-width mode the length of a text is the number of screen positions
+    it takes: East Asian wide and fullwidth characters take two positions,
+    combining marks, format and control characters - zero.
+
+    This mode affects lengths of CHText objects, slicing, padding and truncation
+    of texts, so that tables with CJK or emoji values remain aligned. Texts
+    consisting of ASCII characters only are processed almost as fast as in
+    default mode.
+
+    (!) The mode is supposed to be set at application start-up: lengths of
+    CHText objects created before the mode change are not recalculated.
+    """
+    global text_width
+    text_width = _display_width if enabled else len
+
+
+def get_display_width_mode() -> bool:
+    """Check if display-width mode is turned on."""
+    return text_width is not len
+
+
+def _display_width(text) -> int:
+    # number of screen positions taken by the text
+    if text.isascii():
+        return len(text)
+    return _non_ascii_display_width(text)
+
+
+@functools.lru_cache(maxsize=4096)
+def _non_ascii_display_width(text) -> int:
+    # part of _display_width implementation
+    table = _WIDTH_TABLE or _make_width_table()
+    return sum(
+        table[code] if code < _WIDTH_TABLE_SIZE else _char_width(chr(code))
+        for code in map(ord, text))
+
+
+def _char_width(char) -> int:
+    # number of screen positions taken by a character
+    if unicodedata.category(char) in ('Mn', 'Me', 'Cf', 'Cc'):
+        return 0
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+    return 1
+
+
+def _make_width_table():
+    # create the table of widths of code points in range(_WIDTH_TABLE_SIZE)
+    global _WIDTH_TABLE
+    table = bytearray(b"\x01") * _WIDTH_TABLE_SIZE
+    table[:0x20] = bytes(0x20)  # control characters
+    table[0x7f] = 0
+    for code in range(0x80, _WIDTH_TABLE_SIZE):
+        width = _char_width(chr(code))
+        if width != 1:
+            table[code] = width
+    _WIDTH_TABLE = table
+    return table
+
+
+def _cut_text(text, width) -> str:
+    # -> longest beginning of the text which takes not more than width positions
+    if text_width is len or text.isascii():
+        return text[:width]
+    if text_width(text) <= width:
+        return text
+    cur_width = 0
+    for pos, char in enumerate(text):
+        cur_width += text_width(char)
+        if cur_width > width:
+            return text[:pos]
+    return text
+
+
+def _skip_text(text, width) -> str:
+    # -> the text w/o the beginning which takes width positions.
+    # (!) wide character which does not fit into width positions entirely
+    # is also skipped
+    if text_width is len or text.isascii():
+        return text[width:]
+    cur_width = 0
+    for pos, char in enumerate(text):
+        if cur_width >= width:
+            return text[pos:]
+        cur_width += text_width(char)
+    return ""
+
+
 #########################
 # CHText - colored text
 
+# escape sequences which return terminal to the default state
+_RESET_SEQ = "\033[0m"
+_RESET_SEQS = frozenset([_RESET_SEQ, "\033[m"])
+
+
 @dataclass(frozen=True)
 class _CHTextChunk:
     # Colored Text is stored not as string, but as a list of chunks. Each chunk
@@ -372,7 +508,7 @@ class _CHTextChunk:
         return CHText.strip_colors(text)
 
     def __len__(self):
-        return len(self.text)
+        return text_width(self.text)
 
     def __eq__(self, other):
         if self is other:
@@ -406,21 +542,42 @@ class _CHTextChunk:
         return self.clone(self.text[index])
 
     def fixed_len(self, desired_len) -> 'CHText':
-        len_diff = desired_len - len(self.text)
+        len_diff = desired_len - text_width(self.text)
         if len_diff > 0:
             return CHText(self, " "*len_diff)
         if len_diff < 0:
-            return CHText(self.clone(self.text[:desired_len]))
+            return CHText(self.clone(self.text[:desired_len])).fixed_len(desired_len)
         return CHText(self)
 
     def __format__(self, format_spec):
         return CHText(self).__format__(format_spec)
 
 
+class _RenderCacheStats:
+    # statistics of usage of the rendered strings cached in CHText objects
+    __slots__ = 'hits', 'misses'
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+
+_RENDER_CACHE_STATS = _RenderCacheStats()
+
+
 class CHText:
-    """Colored text. Consists of several mono-colored parts."""
+    """Colored text. Consists of several mono-colored parts.
+
+    Length of CHText is the number of positions it takes on screen (which is
+    the number of characters unless display-width mode is turned on, check
+    set_display_width_mode).
+
+    Rendered string (and plain text) is cached in the object, the cache is reset
+    when the object is modified with '+=' operation. 'chunks' attribute
+    must not be modified directly.
+    """
 
-    __slots__ = 'scrlen', 'chunks'
+    __slots__ = 'scrlen', 'chunks', '_str', '_plain'
 
     Chunk = _CHTextChunk
 
@@ -436,6 +593,8 @@ class CHText:
         """
         self.scrlen = 0
         self.chunks = []
+        self._str = None  # cached rendered string
+        self._plain = None  # cached plain text
         for part in parts:
             self += part
 
@@ -448,25 +607,110 @@ class CHText:
         """
         chunks_list = cls._merge_chunks(chunks_list)
         result = cls()
-        result.scrlen = sum(len(c.text) for c in chunks_list)
+        result.scrlen = sum(text_width(c.text) for c in chunks_list)
         result.chunks = chunks_list
         return result
 
     def __str__(self):
         # produce colored text
-        return "".join(f"{p.c_prefix}{p.text}{p.c_suffix}" for p in self.chunks)
+        s = self._str
+        if s is None:
+            _RENDER_CACHE_STATS.misses += 1
+            s = self._str = "".join(
+                f"{p.c_prefix}{p.text}{p.c_suffix}" for p in self.chunks)
+        else:
+            _RENDER_CACHE_STATS.hits += 1
+        return s
 
     def plain_text(self) -> str:
         """produce simple str w/o color sequences."""
-        return "".join(part.text for part in self.chunks)
+        s = self._plain
+        if s is None:
+            _RENDER_CACHE_STATS.misses += 1
+            s = self._plain = "".join(part.text for part in self.chunks)
+        else:
+            _RENDER_CACHE_STATS.hits += 1
+        return s
+
+    @staticmethod
+    def get_render_cache_stats() -> dict:
+        """Get statistics of usage of cached rendered strings.
+
+        Returns {'hits': n, 'misses': m}; 'misses' is the number of times the
+        string (either colored or plain) was actually generated.
+        """
+        return {
+            'hits': _RENDER_CACHE_STATS.hits,
+            'misses': _RENDER_CACHE_STATS.misses,
+        }
+
+    @staticmethod
+    def reset_render_cache_stats():
+        """Reset statistics of usage of cached rendered strings."""
+        _RENDER_CACHE_STATS.hits = 0
+        _RENDER_CACHE_STATS.misses = 0
 
     @classmethod
     def strip_colors(cls, text: str) -> str:
         """Colorer-formatted string -> same string w/o coloring."""
+        return cls._get_seq_re().sub("", text)
+
+    @classmethod
+    def from_ansi(cls, text: str) -> 'CHText':
+        """Colorer-formatted string -> CHText.
+
+        Reverse of str(ch_text): color escape sequences found in the text become
+        prefixes of the chunks of the result. Consequent opening sequences
+        are accumulated, reset sequence ("\\033[0m" or "\\033[m") returns
+        text to the default (plain) state.
+        """
+        chunks, _ = cls._parse_ansi(text, "")
+        return cls.make(chunks)
+
+    @classmethod
+    def iter_from_ansi(cls, lines) -> Iterator['CHText']:
+        """Colorer-formatted lines -> CHText objects.
+
+        Streaming version of 'from_ansi', to be used for processing large
+        files. Color state is carried over from one line to the next one, so that
+        a colored text which spans several lines is processed correctly.
+        Trailing line terminators ("\\n" or "\\r\\n") are not included into
+        the produced CHText objects.
+        """
+        prefix = ""
+        for line in lines:
+            if line.endswith("\n"):
+                line = line[:-2] if line.endswith("\r\n") else line[:-1]
+            chunks, prefix = cls._parse_ansi(line, prefix)
+            yield cls.make(chunks)
+
+    @classmethod
+    def _get_seq_re(cls):
+        # Re matching any color sequence
         if cls._SEQ_RE is None:
             cls._SEQ_RE = re.compile("\033\\[[;:\\d]*m")
+        return cls._SEQ_RE
 
-        return re.sub(cls._SEQ_RE, "", text)
+    @classmethod
+    def _parse_ansi(cls, text, prefix):
+        # Split colorer-formatted text into chunks.
+        # (text, initial color prefix) -> ([Chunk], color prefix at the end of text)
+        chunks = []
+        pos = 0
+        for match in cls._get_seq_re().finditer(text):
+            start = match.start()
+            if start > pos:
+                chunks.append(cls.Chunk(
+                    prefix, text[pos:start], _RESET_SEQ if prefix else ""))
+            seq = match.group()
+            if seq in _RESET_SEQS:
+                prefix = ""
+            else:
+                prefix += seq
+            pos = match.end()
+        if pos < len(text):
+            chunks.append(cls.Chunk(prefix, text[pos:], _RESET_SEQ if prefix else ""))
+        return chunks, prefix
 
     def __len__(self):
         return self.scrlen
@@ -500,12 +744,17 @@ class CHText:
 
     def __iadd__(self, other):
         """add some text (of a given type or 'plain') to self"""
+        self._str = self._plain = None
         if isinstance(other, self.Chunk):
             self._append_chunk(other)
         elif isinstance(other, (list, tuple)):
             for part in other:
                 self += part
         elif isinstance(other, type(self)):
+            if not self.chunks:
+                # self is a copy of other, so are the cached strings
+                self._str = other._str
+                self._plain = other._plain
             need_merge = (
                 len(self.chunks) > 0
                 and len(other.chunks) > 0
@@ -570,7 +819,8 @@ class CHText:
             if chunk_id is None:
                 raise IndexError(f"Index {orig_index_value} is out of range")
             cur_chunk = self.chunks[chunk_id]
-            return type(self)(cur_chunk.clone(cur_chunk.text[chunk_pos]))
+            return type(self)(
+                cur_chunk.clone(_skip_text(cur_chunk.text, chunk_pos)[:1]))
 
         if not isinstance(index, slice):
             raise ValueError(
@@ -605,16 +855,18 @@ class CHText:
             return type(self)()  # start_pos is out of range
 
         cur_chunk = self.chunks[chunk_id]
-        cur_chunk = cur_chunk.clone(cur_chunk.text[chunk_pos:])
+        cur_chunk = cur_chunk.clone(_skip_text(cur_chunk.text, chunk_pos))
 
         new_chunks = []
         while remain_len > 0:
-            if remain_len <= len(cur_chunk.text):
-                new_chunks.append(cur_chunk.clone(cur_chunk.text[:remain_len]))
+            cur_chunk_len = text_width(cur_chunk.text)
+            if remain_len <= cur_chunk_len:
+                new_chunks.append(
+                    cur_chunk.clone(_cut_text(cur_chunk.text, remain_len)))
                 remain_len = 0
                 break
             new_chunks.append(cur_chunk)
-            remain_len -= len(cur_chunk.text)
+            remain_len -= cur_chunk_len
             chunk_id += 1
             if chunk_id < len(self.chunks):
                 cur_chunk = self.chunks[chunk_id]
@@ -630,7 +882,11 @@ class CHText:
         """
         len_diff = desired_len - len(self)
         if len_diff < 0:
-            return self[:desired_len]
+            result = self[:desired_len]
+            if len(result) < desired_len:
+                # wide character did not fit entirely
+                result += " "*(desired_len - len(result))
+            return result
         if len_diff > 0:
             return self + " "*len_diff
         return self
@@ -699,7 +955,7 @@ class CHText:
     @classmethod
     def calc_chunks_len(cls, chunks) -> int:
         """[Chunk, ] -> total len of the text in the chunks"""
-        return sum(len(c.text) for c in chunks)
+        return sum(text_width(c.text) for c in chunks)
 
     @classmethod
     def resize_chunks_list(cls, chunks, new_len):  # -> [cls.Chunk]:
@@ -715,13 +971,18 @@ class CHText:
         for item in chunks:
             if remaining_len == 0:
                 return result
-            cur_item_len = len(item.text)
+            cur_item_len = text_width(item.text)
             if cur_item_len <= remaining_len:
                 result.append(item)
                 remaining_len -= cur_item_len
             else:
-                result.append(item.clone(item.text[:remaining_len]))
-                remaining_len = 0
+                item_text = _cut_text(item.text, remaining_len)
+                result.append(item.clone(item_text))
+                # (remaining_len may be not 0 if a wide character did not fit)
+                remaining_len -= text_width(item_text)
+                if remaining_len:
+                    result.append(cls.Chunk.make_plain(" "*remaining_len))
+                    return result
         result.append(cls.Chunk.make_plain(" "*remaining_len))
         return result
 
@@ -754,9 +1015,10 @@ class CHText:
         if position < 0:
             return None, None
         for chunk_id, chunk in enumerate(self.chunks):
-            if position < len(chunk.text):
+            chunk_len = text_width(chunk.text)
+            if position < chunk_len:
                 return chunk_id, position
-            position -= len(chunk.text)
+            position -= chunk_len
         return None, None  # position >= total length
 
     def _append_chunk(self, chunk):
@@ -768,13 +1030,14 @@ class CHText:
             # followed by c_suffix has no visible effect and leaves terminal
             # in the same (default) state.
             return
+        self._str = self._plain = None
         if self.chunks and chunk.has_same_type(self.chunks[-1]):
             # merge with previous chunk
             prev_chunk = self.chunks[-1]
             self.chunks[-1] = prev_chunk.clone(prev_chunk.text + chunk.text)
         else:
             self.chunks.append(chunk)
-        self.scrlen += len(chunk.text)
+        self.scrlen += text_width(chunk.text)
 
 
 class ColorFmt:
@@ -830,6 +1093,15 @@ class ColorFmt:
         self._color_prefix = color_prefix
         self._color_suffix = color_suffix
 
+    @classmethod
+    def _from_ansi_sequences(cls, color_codes, color_prefix, color_suffix) -> 'ColorFmt':
+        # internal constructor: create ColorFmt from precalculated data
+        color_fmt = cls.__new__(cls)
+        color_fmt._color_codes = color_codes
+        color_fmt._color_prefix = color_prefix
+        color_fmt._color_suffix = color_suffix
+        return color_fmt
+
     @classmethod
     def get_plaintext_fmt(cls) -> 'ColorFmt':
         """Get dummy ColorFmt object (it produces text w/o any effects)."""
@@ -868,9 +1140,101 @@ class ColorBytes:
         return self._color_prefix + bytes_text + self._color_suffix
 
 
+#########################
+# Removing color sequences from large files
+
+# re matching any color sequence in bytes
+_SEQ_BYTES_RE = re.compile(b"\033\\[[;:\\d]*m")
+
+# default size of a block of a file processed at once
+_STRIP_BLOCK_SIZE = 16 * 1024 * 1024
+_STRIP_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def strip_colors_bytes(data: bytes) -> bytes:
+    """Bytes with color sequences -> same bytes w/o color sequences."""
+    return _SEQ_BYTES_RE.sub(b"", data)
+
+
+def strip_colors_file(
+        src_filename, dst_filename, *, block_size=_STRIP_BLOCK_SIZE, workers=None):
+    """Copy file removing color sequences from it.
+
+    Intended for large files, such as colored log files: the source file is
+    memory-mapped and processed in large blocks. Blocks boundaries are aligned
+    to newlines (color sequences never contain newlines), so the blocks can be
+    processed independently - in several processes if 'workers' is specified.
+
+    Arguments:
+    - src_filename: name of the file with color sequences
+    - dst_filename: name of the file to write results to
+    - block_size: approximate size of a block of the source file processed at once
+    - workers: number of worker processes. By default the file is processed in
+        the current process.
+    """
+    if os.path.exists(dst_filename) and os.path.samefile(src_filename, dst_filename):
+        # opening the destination file would truncate the source file
+        raise ValueError(
+            f"source and destination are the same file: '{src_filename}'")
+    with open(src_filename, "rb") as src_f, open(
+        dst_filename, "wb", buffering=_STRIP_WRITE_BUFFER_SIZE,
+    ) as dst_f:
+        if os.fstat(src_f.fileno()).st_size == 0:
+            # empty file can't be memory-mapped
+            return
+        with mmap.mmap(src_f.fileno(), 0, access=mmap.ACCESS_READ) as src_map:
+            segments = _get_file_segments(src_map, block_size)
+            if workers is None or workers < 2 or len(segments) < 2:
+                for start, end in segments:
+                    dst_f.write(_SEQ_BYTES_RE.sub(b"", src_map[start:end]))
+                return
+
+        # parallel processing. Each worker process maps the file itself, so
+        # only the positions of segments are sent to workers.
+        import multiprocessing  # pylint: disable=import-outside-toplevel
+
+        with multiprocessing.Pool(workers) as pool:
+            for chunk in pool.imap(
+                _strip_colors_file_segment,
+                [(src_filename, start, end) for start, end in segments],
+            ):
+                dst_f.write(chunk)
+
+
+def _get_file_segments(src_map, block_size):
+    # split memory-mapped file into segments: [(start, end), ]
+    # segments end after newline characters (except the last one)
+    segments = []
+    file_size = len(src_map)
+    start = 0
+    while start < file_size:
+        end = src_map.find(b"\n", start + block_size - 1)
+        end = file_size if end < 0 else end + 1
+        segments.append((start, end))
+        start = end
+    return segments
+
+
+def _strip_colors_file_segment(args):
+    # part of the strip_colors_file; executed in worker process
+    # (filename, start, end) -> stripped bytes of the file segment
+    filename, start, end = args
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as src_map:
+            return _SEQ_BYTES_RE.sub(b"", src_map[start:end])
+
+
 #########################
 # GlobalPalette and ColorsConfig
 
+# Lock which protects modifications of palettes and colors configs caches.
+# Read access to the caches does not require the lock: modifications are done
+# on copies of the dictionaries, which then replace the originals.
+# Reentrant, because creation of a palette may register new syntaxes in the
+# config and resync the global palettes.
+_CACHES_LOCK = threading.RLock()
+
+
 class _ColorConfColorDescr:
     # Description of a color initialization rules used in ColorsConfig.
     #
@@ -934,6 +1298,8 @@ class _ColorConfColorDescr:
             self.bg_color,
             self.modifiers
         ) = self._parse_init_str(init_str)
+        # results of _parse_init_str are memoized, do not modify the shared dict
+        self.modifiers = dict(self.modifiers)
         if self.fg_color is None:
             self.fg_color = ""
         if self.bg_color is None:
@@ -983,11 +1349,70 @@ class _ColorConfColorDescr:
             self.color_fmt = ColorFmt(
                 self.fg_color, bg_color=self.bg_color, **self.modifiers)
 
+    def make_snapshot_item(self) -> dict:
+        """Make json-serializable description of the resolved self.
+
+        Description of not resolved object contains only initialization data.
+        """
+        item = {
+            'init_str': self.init_str,
+            'src': self.src_obj_name,
+        }
+        if self.color_fmt is not None:
+            item.update({
+                'prefix': self.color_fmt._color_prefix,
+                'suffix': self.color_fmt._color_suffix,
+                'codes': self.color_fmt._color_codes._ccodes,
+                'fg_color': self.fg_color,
+                'bg_color': self.bg_color,
+                'modifiers': self.modifiers,
+            })
+        return item
+
+    @classmethod
+    def from_snapshot_item(cls, synt_id, item, no_color) -> '_ColorConfColorDescr':
+        """Alternative constructor. Restore object from snapshot item.
+
+        Resolved item is restored without parsing of the init string.
+        """
+        if 'codes' not in item:
+            return cls(synt_id, item['init_str'], item['src'], no_color)
+
+        syntax_color = cls.__new__(cls)
+        syntax_color.synt_id = synt_id
+        syntax_color.init_str = item['init_str']
+        syntax_color.src_obj_name = item['src']
+        syntax_color.parent_syntax_id = None  # not needed, the item is resolved
+        # json converts tuples into lists, restore them
+        syntax_color.fg_color = cls._tuples_from_json(item['fg_color'])
+        syntax_color.bg_color = cls._tuples_from_json(item['bg_color'])
+        syntax_color.modifiers = {
+            name: cls._tuples_from_json(value)
+            for name, value in item['modifiers'].items()}
+        if no_color:
+            syntax_color.color_fmt = ColorsConfig._NO_EFFECTS_FMT
+        else:
+            syntax_color.color_fmt = ColorFmt._from_ansi_sequences(
+                _ColorCodesSet(tuple(item['codes'])),
+                item['prefix'], item['suffix'])
+        return syntax_color
+
+    @classmethod
+    def _tuples_from_json(cls, value):
+        # [1, [2, 3]] -> (1, (2, 3))
+        if isinstance(value, list):
+            return tuple(cls._tuples_from_json(x) for x in value)
+        return value
+
     @classmethod
+    @functools.lru_cache(maxsize=1024)
     def _parse_init_str(cls, init_str):
         # parse string description of a color
         # color_descr_srt -> (parent_syntax_id, fg_color, bg_color, modifiers)
         #
+        # Results are memoized: same init strings are parsed for each ColorsConfig
+        # created. (!) The returned modifiers dict is shared between callers.
+        #
         # The init_str may contain up to 3 sections and may look like:
         #
         # "PARENT_SYNTAX:NEW_COLOR/NEW_BG_COLOR:bold,no_crossed"
@@ -1155,6 +1580,7 @@ class _ColorConfColorDescr:
             f"color identifier '{color}'.{problem_descr}")
 
     @classmethod
+    @functools.lru_cache(maxsize=1024)
     def _parse_color_impl(cls, color):
         # part of _parse_init_str operation.
         # do all the job for _parse_color method
@@ -1378,13 +1804,14 @@ class ColorsConfig:
         '_cache',
     )
 
-    def __init__(self, init_config=None, *, no_color=False):
+    def __init__(self, init_config=None, *, no_color=False, _snapshot_items=None):
         """Constructor.
 
         Arguments:
         - init_config: colors config (*)
         - no_color: if True - ignores all other config settings and creates
           'no-color' config
+        - _snapshot_items: argument for internal use only (see 'load_snapshot')
 
         (*) data for the colors config is expected to be read from the config file.
         Example of colors config:
@@ -1436,6 +1863,11 @@ class ColorsConfig:
         self.registered_sources = set()
         self.syntax_map = {}
 
+        if _snapshot_items is not None:
+            for synt_id, item in _snapshot_items.items():
+                self.syntax_map[synt_id] = _ColorConfColorDescr.from_snapshot_item(
+                    synt_id, item, no_color)
+
         new_init_items = self._flatten_dict(init_config)
         self.add_new_items(new_init_items, "config")
 
@@ -1460,17 +1892,26 @@ class ColorsConfig:
         if not new_items:
             return
 
+        with _CACHES_LOCK:
+            self._add_new_items(new_items, src_obj_descr)
+
+    def _add_new_items(self, new_items, src_obj_descr):
+        # implementation of add_new_items; must be called under _CACHES_LOCK
+        #
+        # (!) items are added to a copy of syntax_map; the copy replaces the
+        # original when it's ready, so readers never see dictionary being modified
+        syntax_map = dict(self.syntax_map)
         any_modifications = False
 
-        if any(synt_id not in self.syntax_map for synt_id in new_items):
+        if any(synt_id not in syntax_map for synt_id in new_items):
             self._cache = {}
 
         for synt_id, init_str in new_items.items():
-            if synt_id in self.syntax_map:
+            if synt_id in syntax_map:
                 # properties of this syntax are defined already. Probably in
                 # config file.
                 continue
-            self.syntax_map[synt_id] = _ColorConfColorDescr(
+            syntax_map[synt_id] = _ColorConfColorDescr(
                 synt_id, init_str, src_obj_descr, self.no_color)
             any_modifications = True
 
@@ -1487,7 +1928,7 @@ class ColorsConfig:
 
         to_resolve = {
             synt_id: syntax_color
-            for synt_id, syntax_color in self.syntax_map.items()
+            for synt_id, syntax_color in syntax_map.items()
             if syntax_color.color_fmt is None
         }
 
@@ -1507,7 +1948,7 @@ class ColorsConfig:
                         # all the syntaxes accumulated in path may be resolved now
                         parent_syntax_color = syntax_color
                         for synt_id in reversed(path):
-                            syntax_color = self.syntax_map[synt_id]
+                            syntax_color = syntax_map[synt_id]
                             syntax_color.resolve(
                                 parent_syntax_color, self.no_color)
                             new_resolved.add(syntax_color.synt_id)
@@ -1515,24 +1956,54 @@ class ColorsConfig:
                         break
                     if (
                         syntax_color.synt_id in cant_resolve
-                        or syntax_color.parent_syntax_id not in self.syntax_map
+                        or syntax_color.parent_syntax_id not in syntax_map
                     ):
                         # all the syntaxes accumulated in path can't be resolved now
                         cant_resolve.update(path)
                         break
                     path.append(syntax_color.synt_id)
-                    syntax_color = self.syntax_map[syntax_color.parent_syntax_id]
+                    syntax_color = syntax_map[syntax_color.parent_syntax_id]
             if new_resolved:
                 any_modifications = True
             else:
                 # no more items can be resolved
                 break
 
+        self.syntax_map = syntax_map
+
         if any_modifications and self is _GLOBAL_COLORS_CONF:
             # self is the global config, so it is necessary to update all the
             # synced palette objects
             set_global_colors_config(self)
 
+    def dump_snapshot(self, filename):
+        """Save the resolved state of self into a json file.
+
+        The ColorsConfig can be restored from this file with 'load_snapshot'
+        method. Parsing of color descriptions is not required in this case,
+        so this may speed up application start-up.
+        """
+        snapshot = {
+            'no_color': self.no_color,
+            'syntaxes': {
+                synt_id: syntax_color.make_snapshot_item()
+                for synt_id, syntax_color in sorted(self.syntax_map.items())
+            },
+        }
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=1)
+
+    @classmethod
+    def load_snapshot(cls, filename) -> 'ColorsConfig':
+        """Alternative constructor. Create ColorsConfig from a snapshot file.
+
+        The file should be created with 'dump_snapshot' method.
+        """
+        with open(filename, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return cls(
+            no_color=snapshot['no_color'], _snapshot_items=snapshot['syntaxes'])
+
     def put_into_cache(self, cache_key, the_obj):
         """Put some object to the ColorsConfig cache.
 
@@ -1544,7 +2015,8 @@ class ColorsConfig:
         Responsibility of the ColorsConfig is to reset the cache if the config's
         data is updated.
         """
-        self._cache[cache_key] = the_obj
+        with _CACHES_LOCK:
+            self._cache = {**self._cache, cache_key: the_obj}
 
     def get_cached_obj(self, cache_key):
         """Get object from ColorsConfig cache.
@@ -1588,10 +2060,11 @@ class ColorsConfig:
 
     def register_color_conf_component(self, syntax_map, src_obj):
         """Register Palette object in the ColorsConfig"""
-        assert src_obj not in self.registered_sources, f"{src_obj=}"
-        self.registered_sources.add(src_obj)
-        new_items_flat_init_conf = self._flatten_dict(syntax_map)
-        self.add_new_items(new_items_flat_init_conf, str(src_obj))
+        with _CACHES_LOCK:
+            assert src_obj not in self.registered_sources, f"{src_obj=}"
+            new_items_flat_init_conf = self._flatten_dict(syntax_map)
+            self.add_new_items(new_items_flat_init_conf, str(src_obj))
+            self.registered_sources = self.registered_sources | {src_obj}
 
     def make_report(self) -> str:
         """Create colored report of self."""
@@ -1746,6 +2219,19 @@ class _PaletteMeta(type):
             if existing_palette is not None:
                 return existing_palette
 
+        with _CACHES_LOCK:
+            # repeat the checks: the palette could be created by other thread
+            if synced:
+                palette = _GSYNCED_PALETTES.get(palette_class)
+            else:
+                palette = palette_class._get_existing_palette(colors_conf, no_color)
+            if palette is None:
+                palette = palette_class._create_palette(colors_conf, no_color, synced)
+
+        return palette
+
+    def _create_palette(palette_class, colors_conf, no_color, synced):
+        # create new palette object and put it into the cache
         _local_colors = palette_class._prepare_local_colors(colors_conf, no_color)
 
         # there is no existing palette of this class. Need to create a new one
@@ -1755,7 +2241,7 @@ class _PaletteMeta(type):
             palette, colors_conf, no_color, _local_colors, synced=synced)
 
         if synced:
-            palette = _GSYNCED_PALETTES.setdefault(palette_class, palette)
+            _register_synced_palette(palette_class, palette)
         else:
             palette_class._store_palette_in_cache(palette, colors_conf, no_color)
 
@@ -1948,6 +2434,15 @@ class Palette(metaclass=_PaletteMeta):
             plt_synt_id = ConfColor(...)
         - connotations: syntax ids to be used as connotations.
         """
+        # fast path: the combination of the names was requested before
+        try:
+            color_fmt = self._color_fmts.get(
+                (plt_synt_id, *connotations) if connotations else plt_synt_id)
+        except TypeError:
+            color_fmt = None  # some of the connotations are not hashable
+        if color_fmt is not None:
+            return color_fmt
+
         srcs = list(connotations)
         srcs.insert(0, plt_synt_id)
 
@@ -1973,20 +2468,39 @@ class Palette(metaclass=_PaletteMeta):
 
         color_fmt = self._color_fmts.get(key)
         if color_fmt is None:
-            # components w/o unknown connotations
-            stripped_components = [c for c in components if c[1] is not None]
+            with _CACHES_LOCK:
+                color_fmt = self._register_color_fmt(key, components)
 
-            stripped_key = tuple(c[0] for c in stripped_components)
-            color_fmt = self._color_fmts.get(stripped_key)
-            if color_fmt is None:
-                # we do need to create new formatter
-                fmts_to_combine = [c[1] for c in stripped_components]
-                color_fmt = self._construct_color_fmt(fmts_to_combine)
-                color_fmt = PaletteColorFmt(self, color_fmt)
-                self._color_fmts[stripped_key] = color_fmt
-                self._fmts_keys[color_fmt] = stripped_key
+        return color_fmt
 
-            self._color_fmts[key] = color_fmt
+    def _register_color_fmt(self, key, components) -> PaletteColorFmt:
+        # part of get_color operation: find or create the formatter for the
+        # combination of components and register it under the key.
+        # Must be called under _CACHES_LOCK.
+        color_fmts = self._color_fmts
+        color_fmt = color_fmts.get(key)
+        if color_fmt is not None:
+            # other thread has registered it already
+            return color_fmt
+
+        # components w/o unknown connotations
+        stripped_components = [c for c in components if c[1] is not None]
+
+        stripped_key = tuple(c[0] for c in stripped_components)
+        new_items = {}
+        color_fmt = color_fmts.get(stripped_key)
+        if color_fmt is None:
+            # we do need to create new formatter
+            fmts_to_combine = [c[1] for c in stripped_components]
+            color_fmt = self._construct_color_fmt(fmts_to_combine)
+            color_fmt = PaletteColorFmt(self, color_fmt)
+            new_items[stripped_key] = color_fmt
+            # publish the reverse mapping first: the formatter may be used as
+            # a connotation as soon as it becomes visible in _color_fmts
+            self._fmts_keys = {**self._fmts_keys, color_fmt: stripped_key}
+
+        new_items[key] = color_fmt
+        self._color_fmts = {**color_fmts, **new_items}
 
         return color_fmt
 
@@ -2085,10 +2599,13 @@ class CompoundPalette(Palette):
         key = (palette_class, shade_name)
         result = self._sub_palettes.get(key)
         if result is None:
-            actual_palette_class = self.SUB_PALETTES_MAP.get(
-                key, palette_class)
-            result = actual_palette_class(self._no_color, self.colors_conf)
-            self._sub_palettes[key] = result
+            with _CACHES_LOCK:
+                result = self._sub_palettes.get(key)
+                if result is None:
+                    actual_palette_class = self.SUB_PALETTES_MAP.get(
+                        key, palette_class)
+                    result = actual_palette_class(self._no_color, self.colors_conf)
+                    self._sub_palettes = {**self._sub_palettes, key: result}
         return result
 
 
@@ -2218,7 +2735,9 @@ def get_global_colors_config():
     """
     global _GLOBAL_COLORS_CONF
     if _GLOBAL_COLORS_CONF is None:
-        _GLOBAL_COLORS_CONF = ColorsConfig()
+        with _CACHES_LOCK:
+            if _GLOBAL_COLORS_CONF is None:
+                _GLOBAL_COLORS_CONF = ColorsConfig()
     return _GLOBAL_COLORS_CONF
 
 
@@ -2227,10 +2746,18 @@ def set_global_colors_config(colors_config):
     global _GLOBAL_COLORS_CONF
     if colors_config is None:
         colors_config = ColorsConfig()
-    _GLOBAL_COLORS_CONF = colors_config
+    with _CACHES_LOCK:
+        _GLOBAL_COLORS_CONF = colors_config
+
+        for palette in _GSYNCED_PALETTES.values():
+            palette._sync_with_config(colors_config)
+
 
-    for palette in _GSYNCED_PALETTES.values():
-        palette._sync_with_config(colors_config)
+def _register_synced_palette(palette_class, palette):
+    # put the palette into _GSYNCED_PALETTES. Must be called under _CACHES_LOCK
+    global _GSYNCED_PALETTES
+    assert palette_class not in _GSYNCED_PALETTES
+    _GSYNCED_PALETTES = {**_GSYNCED_PALETTES, palette_class: palette}
 
 
 _GLOBAL_COLORS_CONF = None
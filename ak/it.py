@@ -4,35 +4,38 @@ Usage example:
 >> x = {"a": 10, "b":20}
 >> from ak.it import pp
 >> pp(x)     # prints colored formatted text
+>> pp.full(x)  # same, but the size of printed object is not limited
 """
 
 from . import ppobj
 
 
 class _PPrintCommand:
-    """Pretty-print console command."""
+    """Pretty-print console command.
 
-    # !!!! need tests
-    _GLOBAL_PP = None
+    Size of printed json-like objects is limited, so that accidental printing
+    of a huge object does not flood the console. Use pp.full(obj) to print
+    the whole object.
+    """
 
-    def __init__(self):
-        self._pprinter = ppobj.PPStdFormatter(style="py")
+    # limits of printed objects size, check ppobj.PPStdFormatter for details
+    _DFLT_LIMITS = {'max_items': 100, 'max_depth': None, 'max_string_len': 1000}
+
+    def __init__(self, **limits):
+        self._pp_cmd = ppobj.PPCommand(style="py", **{**self._DFLT_LIMITS, **limits})
+        self._pp_full_cmd = ppobj.PPCommand(style="py")
 
     def __call__(self, obj_to_print):
-        if isinstance(obj_to_print, ppobj.PPObjBase):
-            for line in obj_to_print.gen_pplines():
-                print(line)
-        else:
-            for line in self._pprinter.gen_pplines(obj_to_print):
-                print(line)
+        self._pp_cmd(obj_to_print)
+
+    def full(self, obj_to_print):
+        """Pretty-print the whole object, w/o size limits."""
+        self._pp_full_cmd(obj_to_print)
 
     def _get_ll_descr(self):
         # object description for 'll' command
         return "Console tools", "Command which pretty prints objects"
 
 
-def pp(obj_to_print):
-    """Pretty-print json-like object."""
-    if _PPrintCommand._GLOBAL_PP is None:
-        _PPrintCommand._GLOBAL_PP = _PPrintCommand()
-    _PPrintCommand._GLOBAL_PP(obj_to_print)
+# pretty-print command to be used in interactive console
+pp = _PPrintCommand()
@@ -14,6 +14,8 @@ use already created instances of these objects:
 - date_time_field_type
 """
 
+import weakref
+import functools
 from datetime import datetime
 from numbers import Number
 
@@ -62,20 +64,76 @@ class PPDateTimeFieldType(FieldType):
 
         fmt = lambda fmt_name: cell_plt.get_color(fmt_name, *connotations)
 
+        # timestamps in a column usually share dates, so the text of the date
+        # part is cached
+        date_text = self._get_date_text(value.date())
+
         if fmt_modifier == 'D':
-            val = [fmt('text')(value.strftime("%Y-%m-%d"))]
+            val = [fmt('text')(date_text)]
         elif fmt_modifier == 'DT' or fmt_modifier == 'Dt':
-            val = [fmt('text')(value.strftime("%Y-%m-%d"))]
+            val = [fmt('text')(date_text)]
             if not self._is_date(value):
                 time_fmt = fmt('warn') if fmt_modifier == 'DT' else fmt('text')
                 val.append(fmt('warn')(value.strftime(" %H:%M:%S.%f%z")))
         elif fmt_modifier == 'S':
-            val = [fmt('text')(value.strftime("%Y-%m-%d %H:%M:%S%z"))]
+            val = [fmt('text')(date_text + value.strftime(" %H:%M:%S%z"))]
         else:
-            val = [fmt('text')(value.strftime("%Y-%m-%d %H:%M:%S.%f%z"))]
+            val = [fmt('text')(date_text + value.strftime(" %H:%M:%S.%f%z"))]
 
         return val, self.ALIGN_LEFT
 
+    # lengths of the texts produced for different format modifiers, w/o tz info
+    _DATE_LEN = len("YYYY-MM-DD")
+    _TIME_PART_LEN = {
+        'Dt': len(" HH:MM:SS.ffffff"),
+        'DT': len(" HH:MM:SS.ffffff"),
+        'S': len(" HH:MM:SS"),
+        'MS': len(" HH:MM:SS.ffffff"),
+    }
+
+    def get_cell_text_len(self, value, fmt_modifier, traits) -> int:
+        """Calculate length of text representation of the value.
+
+        Layout of the text is fixed, so the length is calculated w/o
+        formatting the value.
+        """
+        fmt_modifier = fmt_modifier or 'DT'
+        self._verify_fmt_modifier(fmt_modifier)
+
+        if value is None:
+            return len(str(None))
+
+        assert isinstance(value, datetime)
+
+        if value.year < 1000:
+            # year is not padded with zeros; it is not worth optimization
+            return super().get_cell_text_len(value, fmt_modifier, traits)
+
+        if fmt_modifier == 'D' or (
+                fmt_modifier in ('Dt', 'DT') and self._is_date(value)):
+            return self._DATE_LEN
+
+        return (
+            self._DATE_LEN + self._TIME_PART_LEN[fmt_modifier]
+            + self._get_tz_text_len(value))
+
+    @staticmethod
+    def _get_tz_text_len(dt) -> int:
+        # length of the text produced for %z format code
+        offset = dt.utcoffset()
+        if offset is None:
+            return 0
+        if offset.microseconds:
+            return len("+HHMMSS.ffffff")
+        if offset.seconds % 60:
+            return len("+HHMMSS")
+        return len("+HHMM")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _get_date_text(date) -> str:
+        return date.strftime("%Y-%m-%d")
+
     @staticmethod
     def _is_date(dt) -> bool:
         # checks if datetime object contains only the 'date' part
@@ -111,16 +169,37 @@ class PPDecimalFieldType(FieldType):
 
         connotations = self.traits_to_connotations(traits)
 
-        if (not self.extra_digits_as_err) or value == round(value, self.precision):
-            str_val = f"{value:{self._grp}.{self.precision}f}"
-        else:
-            str_val = f"{value:{self._grp}.{self.precision+6}f}".rstrip('0')
+        str_val, is_err = self._format_number(value)
+        if is_err:
             connotations.append('conn_err')
 
         fmt = cell_plt.get_color('number', *connotations)
 
         return [fmt(str_val)], self.ALIGN_RIGHT
 
+    def get_cell_text_len(self, value, fmt_modifier, traits) -> int:
+        """Calculate length of text representation of the value."""
+        if not isinstance(value, Number):
+            return super().get_cell_text_len(value, fmt_modifier, traits)
+
+        if type(value) is int:
+            # count digits w/o formatting the value
+            n_digits = len(str(abs(value)))
+            text_len = n_digits + (value < 0)
+            if self._grp:
+                text_len += (n_digits - 1) // 3
+            if self.precision > 0:
+                text_len += 1 + self.precision
+            return text_len
+
+        return len(self._format_number(value)[0])
+
+    def _format_number(self, value) -> (str, bool):
+        # -> (text, is_err)
+        if (not self.extra_digits_as_err) or value == round(value, self.precision):
+            return f"{value:{self._grp}.{self.precision}f}", False
+        return f"{value:{self._grp}.{self.precision+6}f}".rstrip('0'), True
+
 
 # PPEnumFieldType - format enums
 
@@ -170,8 +249,8 @@ class PPEnumFieldType(FieldType):
             (len(str(x)) for x in self.enum_values if x is not None),
             default=1)
 
-        # {syntax_names_id: {fmt_modifier: {(enum_val, (connotations)): (text, align)}}}
-        self._cache = {}
+        # {palette: {fmt_modifier: {(enum_val, (connotations)): (text, align)}}}
+        self._cache = weakref.WeakKeyDictionary()
 
         self._cache_lengths = {
             fmt_modifier: {}
@@ -189,20 +268,18 @@ class PPEnumFieldType(FieldType):
     ) -> ([CHText.Chunk], int):
         """value -> desired text and alignment"""
 
-        cache_key = id(cell_plt)  # need to maintain separate caches
-                                  # enum_value -> CTHText for different palettes
-        # prepare and cache cell text for a enum value
+        # need to maintain separate caches enum_value -> CTHText for different
+        # palettes. Prepare and cache cell text for a enum value;
         # cache is prepared for all supported format modifiers
-        try:
-            by_fmt_cache = self._cache[cache_key]
-        except KeyError:
-            by_fmt_cache = self._cache[cache_key] = {
+        by_fmt_cache = self._cache.get(cell_plt)
+        if by_fmt_cache is None:
+            by_fmt_cache = {
                 fmt_modifier: {}
                 for fmt_modifier in self._FMT_MODIFIERS
             }
             # None and 'full' format modifiers will refer to the same cached vals
             by_fmt_cache[None] = by_fmt_cache['full']
-            self._cache[cache_key] = by_fmt_cache
+            self._cache[cell_plt] = by_fmt_cache
 
         by_value_cache = by_fmt_cache.get(fmt_modifier, None)
         if by_value_cache is None:
@@ -23,12 +23,30 @@ Classes provided by this module:
 # - ReprStructure   - RecordStructure + columns. Described by 'fmt'
 
 
+import os
+import re
 import sys
+import codecs
+import csv
+import array
+import decimal
+import datetime
+import json
+import json.decoder
+import json.scanner
+import keyword
+import functools
+import operator
+import weakref
+import threading
+import itertools
+import math
 from typing import Iterator
 from numbers import Number
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
 from ak import utils
+from ak import color
 from ak.color import CHText, Palette, CompoundPalette, PaletteUser, ConfColor
 
 
@@ -38,6 +56,10 @@ class CHTextResult:
     Single PPObj object can either produce a single CHText or generate multiple
     CHText objects (usually corresponding to single lines of the multi-line text).
     CHTextResult produced by PPObj may be used in both contexts.
+
+    The CHText is created on first use and kept in the object (together with its
+    rendered string), so printing the same result several times does not
+    regenerate the text.
     """
     __slots__ = ('_ch_text', )
 
@@ -194,6 +216,23 @@ class CHTextFixedListResult(CHTextResult):
 #########################
 # generic pretty-printing
 
+class _IndentsChunks(dict):
+    # {indent_len: chunk of spaces}, chunks are created on demand.
+    # Only short indents are kept (otherwise deep objects would consume
+    # quadratic memory)
+    _MAX_CACHED_LEN = 256
+
+    def __init__(self, cp):
+        super().__init__()
+        self._cp = cp
+
+    def __missing__(self, indent_len):
+        chunk = self._cp.text(" " * indent_len)
+        if indent_len <= self._MAX_CACHED_LEN:
+            self[indent_len] = chunk
+        return chunk
+
+
 class PPStdFormatter(PaletteUser):
     """Produces pretty-printable (colored) representation of json-like python objects."""
 
@@ -210,20 +249,40 @@ class PPStdFormatter(PaletteUser):
 
     PALETTE_CLASS = PPPalette
 
-    def __init__(self, *, style="json"):
+    def __init__(
+        self, *, style="json", max_items=None, max_depth=None, max_string_len=None,
+    ):
         """Create PPStdFormatter for formatting json-like objects.
 
         Arguments:
         - style: prossible values are "json" and "py". Affects only
             the way constants are printed ('true' vs 'True', etc.)
+        - max_items: optional max number of items of a list or dict to print.
+            Other items are not processed and are reported as '... N more items'
+            ('... 1 more item').
+            Items of a big dict are the first max_items keys (in the order of
+            the dict) sorted.
+        - max_depth: optional max nesting level of containers to print.
+            Deeper containers are printed as '[... N items]' or '{... N items}'
+        - max_string_len: optional max length of a string value to print.
         """
         consts = self._CONSTANTS_LITERALS.get(style)
         if consts is None:
             raise ValueError(
                 f"unexpected value '{style}' of 'style' argument. "
                 f"Valid values: {self._CONSTANTS_LITERALS.keys()}")
+        for arg_name, arg_value in [
+                ('max_items', max_items), ('max_depth', max_depth),
+                ('max_string_len', max_string_len)]:
+            if arg_value is not None and arg_value < 1:
+                raise ValueError(
+                    f"invalid value {arg_value} of '{arg_name}' argument. "
+                    f"Must be positive or None")
 
         self._consts = consts
+        self._max_items = max_items
+        self._max_depth = max_depth
+        self._max_string_len = max_string_len
 
     def __call__(
         self, obj_to_print, *,
@@ -250,154 +309,321 @@ class PPStdFormatter(PaletteUser):
         ppobj = _PrettyPrinterTextGen(self, obj_to_print)
         return CHTextPPobjResult(ppobj, palette)
 
+    def format_stream(
+        self, fp, *,
+        palette=None,
+        no_color=None,
+        compound_palette=None,
+        shade_name=None,
+        lookahead=10000,
+        chunk_size=65536,
+    ) -> CHTextResult:
+        """json text from file-like object -> pretty-printed colored text.
+
+        The file is not loaded into memory: it is read by chunks and parsed
+        incrementally while the result is being iterated. Layout of the result
+        is the same as produced by __call__ for json.load(fp) object, but
+        containers, which contain more than 'lookahead' json tokens, are
+        printed in a simplified way:
+        - they are always printed in multiple lines, one item per line
+        - keys of such dictionaries are printed in the order of the file
+
+        Arguments:
+        - fp: text or binary (utf-8) file-like object with json text
+        - palette, no_color, compound_palette, shade_name: same as in __call__
+        - lookahead: max number of json tokens buffered when deciding how
+            to print a container
+        - chunk_size: size of the chunks read from the file
+
+        The file is consumed by the first iteration of the result.
+        """
+        palette = self._mk_palette(palette, no_color, compound_palette, shade_name)
+        ppobj = _PrettyPrinterStreamTextGen(self, fp, lookahead, chunk_size)
+        return CHTextPPobjResult(ppobj, palette)
+
+    # marks end of items of a container being printed
+    _END_OF_ITEMS = object()
+
     def _gen_ch_lines(self, cp, obj_to_print) -> Iterator[CHText]:
         """obj_to_print -> CHText objects.
 
         Each CHText corresponds to one line of the result.
         """
-        line_chunks = []
-
-        for chunk in self._gen_ch_chunks_for_obj(cp, obj_to_print, offset=0):
-            if chunk is None:
-                # indicator of the new line
-                yield CHText.make(line_chunks)
-                line_chunks = []
-            else:
-                line_chunks.append(chunk)
+        line = yield from self._gen_value_ch_lines(
+            cp, self._mk_punct_chunks(cp), _IndentsChunks(cp), obj_to_print, [], 0, 0)
+        if line:
+            yield CHText.make(line)
 
-        if line_chunks:
-            yield CHText.make(line_chunks)
-
-    def _gen_ch_chunks_for_obj(
-        self, cp: PPPalette, obj_to_print, offset=0,
-    ) -> Iterator[CHText.Chunk]:
-        # generate parts for colored text result
+    @staticmethod
+    def _mk_punct_chunks(cp) -> dict:
+        # chunks are immutable, so chunks of punctuation are reused
+        return {p: cp.text(p) for p in ("{", "}", "[", "]", ",", ", ", ": ")}
 
-        if self._value_is_simple(obj_to_print):
-            yield self._simple_val_to_ch_chunk(cp, obj_to_print)
-        elif isinstance(obj_to_print, dict):
-            sorted_keys = sorted(
-                obj_to_print.keys(), key=self._mk_type_sort_value
-            )
-            if self._all_values_are_simple(obj_to_print):
-                # check if it is possible to print object in one line
-                chunks = [cp.text("{")]
-                is_first = True
-                for key in sorted_keys:
-                    if not is_first:
-                        chunks.append(cp.text(", "))
-                    else:
-                        is_first = False
-                    chunks.append(self._dict_key_to_sc_chunk(cp, key))
-                    chunks.append(cp.text(": "))
-                    chunks.append(self._simple_val_to_ch_chunk(
-                        cp, obj_to_print[key]))
-                chunks.append(cp.text("}"))
-                scr_len = CHText.calc_chunks_len(chunks)
-
-                oneline_fmt = offset + scr_len < 200  # not exactly correct, ok
-                if oneline_fmt:
-                    yield from chunks
-                    return
+    def _gen_value_ch_lines(
+        self, cp, punct, indents, value, line, offset, depth,
+    ) -> Iterator[CHText]:
+        """Generate CHText lines of the value, return the last (unfinished) line.
 
-            # print object in multiple lines
-            yield cp.text("{")
-            prefix = cp.text(" " * (offset + 2))
-            is_first = True
-            for key in sorted_keys:
-                if is_first:
-                    is_first = False
+        Arguments:
+        - punct, indents: chunks of punctuation and indents
+        - value: the value to print
+        - line: chunks of the current line (prefix of the value)
+        - offset: indent of the current line
+        - depth: number of containers the value is nested in
+
+        Nested containers are processed using explicit stack (not recursion),
+        so objects of any depth can be printed.
+        """
+        # containers printed in multiple lines:
+        # [[items_iterator, dict_or_None, offset, closing_bracket, is_first,
+        #   n_more_items, depth], ]
+        stack = []
+
+        while True:
+            # 1. print the value. Current line already contains the prefix
+            if self._value_is_simple(value):
+                line.append(self._simple_val_to_ch_chunk(cp, value))
+            elif isinstance(value, (dict, list)) and self._is_too_deep(depth):
+                line.append(
+                    self._mk_too_deep_ch_chunk(cp, isinstance(value, dict), len(value)))
+            elif isinstance(value, dict):
+                sorted_keys, n_more = self._get_shown_items(value)
+                chunks = self._make_oneline_dict_ch_chunks(
+                    cp, punct, value, sorted_keys, n_more, depth + 1)
+                if (chunks is not None
+                        and offset + CHText.calc_chunks_len(chunks) < 200):
+                    line.extend(chunks)  # (offset check is not exactly correct, ok)
                 else:
-                    yield cp.text(",")
-                yield None
-                yield prefix
-                yield self._dict_key_to_sc_chunk(cp, key)
-                yield cp.text(": ")
-                yield from self._gen_ch_chunks_for_obj(
-                    cp, obj_to_print[key], offset+2)
-            yield None
-            yield cp.text(" " * offset + "}")
-        elif isinstance(obj_to_print, list):
-            if self._all_values_are_simple(obj_to_print):
-                # check if it is possible to print values in one line
-                items_chunks = [
-                    self._simple_val_to_ch_chunk(cp, item)
-                    for item in obj_to_print
-                ]
-                scr_len = (
-                    CHText.calc_chunks_len(items_chunks) + 2 * len(items_chunks))
-                oneline_fmt = not items_chunks or offset + scr_len < 200
-                if oneline_fmt:
+                    line.append(punct["{"])
+                    stack.append(
+                        [iter(sorted_keys), value, offset, "}", True, n_more, depth])
+            elif isinstance(value, list):
+                items, n_more = self._get_shown_items(value)
+                items_chunks = self._make_simple_items_ch_chunks(cp, items, depth + 1)
+                if items_chunks is not None and n_more:
+                    items_chunks.append(self._mk_n_more_ch_chunk(cp, n_more))
+                if items_chunks is None:
+                    # print the list in multiple lines
+                    line.append(punct["["])
+                    stack.append([iter(items), None, offset, "]", True, n_more, depth])
+                elif not items_chunks or (
+                        offset + CHText.calc_chunks_len(items_chunks)
+                        + 2 * len(items_chunks) < 200):
                     # print the list in one line
-                    yield cp.text("[")
-                    is_first = True
-                    for item_chunk in items_chunks:
-                        if is_first:
-                            is_first = False
-                        else:
-                            yield cp.text(", ")
-                        yield item_chunk
-                    yield cp.text("]")
+                    line.append(punct["["])
+                    for i, item_chunk in enumerate(items_chunks):
+                        if i:
+                            line.append(punct[", "])
+                        line.append(item_chunk)
+                    line.append(punct["]"])
                 else:
                     # print the list in several lines (but each line may
                     # contain several values)
-                    yield cp.text("[")
-                    yield None
-                    prefix = cp.text(" " * (offset + 2))
+                    line.append(punct["["])
+                    yield CHText.make(line)
+                    line = []
+                    prefix = indents[offset + 2]
                     len_yielded = 0
                     is_first_in_line = True
-                    for i, item_chunk in enumerate(items_chunks):
-                        cur_chunk_len = len(item_chunk.text)
-                        need_new_line = len_yielded + cur_chunk_len > 150
-
-                        if need_new_line and not is_first_in_line:
-                            yield cp.text(",")
-                            yield None
+                    for item_chunk in items_chunks:
+                        cur_chunk_len = color.text_width(item_chunk.text)
+                        if len_yielded + cur_chunk_len > 150 and not is_first_in_line:
+                            line.append(punct[","])
+                            yield CHText.make(line)
+                            line = []
                             len_yielded = 0
                             is_first_in_line = True
 
                         if is_first_in_line:
-                            yield prefix
+                            line.append(prefix)
                             len_yielded = offset + 2
                         else:
-                            yield cp.text(", ")
+                            line.append(punct[", "])
                             len_yielded += 2
-                        yield item_chunk
+                        line.append(item_chunk)
                         len_yielded += cur_chunk_len
                         is_first_in_line = False
+                    yield CHText.make(line)
+                    line = [cp.text(" " * offset + "]")]
+            else:
+                line.append(cp.text(str(value)))
+
+            # 2. find the next value to print
+            while True:
+                if not stack:
+                    return line
+                frame = stack[-1]
+                (items_iter, dict_obj, frame_offset, closing_bracket, is_first,
+                 n_more, frame_depth) = frame
+                item = next(items_iter, self._END_OF_ITEMS)
+                if item is self._END_OF_ITEMS:
+                    stack.pop()
+                    if n_more:
+                        line.append(punct[","])
+                        yield CHText.make(line)
+                        line = [
+                            indents[frame_offset + 2],
+                            self._mk_n_more_ch_chunk(cp, n_more)]
+                    yield CHText.make(line)
+                    line = [cp.text(" " * frame_offset + closing_bracket)]
+                    continue
+                if is_first:
+                    frame[4] = False
+                else:
+                    line.append(punct[","])
+                yield CHText.make(line)
+                line = [indents[frame_offset + 2]]
+                if dict_obj is not None:
+                    line.append(self._dict_key_to_sc_chunk(cp, item))
+                    line.append(punct[": "])
+                    value = dict_obj[item]
+                else:
+                    value = item
+                offset = frame_offset + 2
+                depth = frame_depth + 1
+                break
+
+    def _gen_stream_ch_lines(
+        self, cp, json_reader, lookahead) -> Iterator[CHText]:
+        """_JsonEventsReader -> CHText objects.
 
-                        if i == len(items_chunks) - 1:
-                            # last element of the list
-                            yield None
-                            break
-                    # all items printed, new line started
-                    yield cp.text(" " * offset + "]")
-            # print object in multiple lines
+        Each CHText corresponds to one line of the result. Containers which
+        fit into lookahead buffer are printed by _gen_value_ch_lines; bigger
+        containers are printed in multiple lines, as they are read.
+        """
+        punct = self._mk_punct_chunks(cp)
+        indents = _IndentsChunks(cp)
+
+        line = []  # chunks of the current line
+        # containers printed as they are read:
+        # [[offset, closing_bracket, n_items_printed, depth], ]
+        stack = []
+        event, offset, depth = json_reader.read_event(), 0, 0
+
+        while True:
+            # 1. print the value which starts with the event
+            kind, value = event
+            if kind == "value":
+                line.append(self._simple_val_to_ch_chunk(cp, value))
+            elif self._is_too_deep(depth):
+                n_items = json_reader.skip_container_items(kind == "{")
+                line.append(self._mk_too_deep_ch_chunk(cp, kind == "{", n_items))
             else:
-                prefix = cp.text(" " * (offset + 2))
-                yield cp.text("[")
-                is_first = True
-                for item in obj_to_print:
-                    if is_first:
-                        is_first = False
-                    else:
-                        yield cp.text(",")
-                    yield None
-                    yield prefix
-                    yield from self._gen_ch_chunks_for_obj(cp, item, offset+2)
-                yield None
-                yield cp.text(" " * offset + "]")
-        else:
-            yield cp.text(str(obj_to_print))
+                value = json_reader.read_buffered_container(kind, lookahead)
+                if value is not _JsonEventsReader.TOO_BIG:
+                    line = yield from self._gen_value_ch_lines(
+                        cp, punct, indents, value, line, offset, depth)
+                else:
+                    line.append(punct[kind])
+                    stack.append([offset, "}" if kind == "{" else "]", 0, depth])
 
-    @classmethod
-    def _all_values_are_simple(cls, obj_to_print) -> bool:
-        # checks if all the values in container are 'simple'
-        if isinstance(obj_to_print, dict):
-            return all(cls._value_is_simple(value) for value in obj_to_print.values())
-        if isinstance(obj_to_print, (list, tuple)):
-            return all(cls._value_is_simple(value) for value in obj_to_print)
-        return True
+            # 2. find the next value to print
+            while True:
+                if not stack:
+                    json_reader.read_end()
+                    if line:
+                        yield CHText.make(line)
+                    return
+                frame = stack[-1]
+                frame_offset, closing_bracket, n_items, frame_depth = frame
+                event = json_reader.read_event()
+                kind, value = event
+                if kind == closing_bracket:
+                    stack.pop()
+                    yield CHText.make(line)
+                    line = [cp.text(" " * frame_offset + closing_bracket)]
+                    continue
+                if n_items:
+                    line.append(punct[","])
+                yield CHText.make(line)
+                line = [indents[frame_offset + 2]]
+                if self._max_items is not None and n_items >= self._max_items:
+                    n_more = json_reader.skip_container_items(
+                        closing_bracket == "}", event)
+                    line.append(self._mk_n_more_ch_chunk(cp, n_more))
+                    stack.pop()
+                    yield CHText.make(line)
+                    line = [cp.text(" " * frame_offset + closing_bracket)]
+                    continue
+                frame[2] = n_items + 1
+                if kind == "key":
+                    line.append(self._dict_key_to_sc_chunk(cp, value))
+                    line.append(punct[": "])
+                    event = json_reader.read_event()
+                offset = frame_offset + 2
+                depth = frame_depth + 1
+                break
+
+    def _make_oneline_dict_ch_chunks(
+        self, cp, punct, obj, sorted_keys, n_more, depth,
+    ) -> [CHText.Chunk]:
+        # -> chunks of one-line representation of the dictionary
+        # or None if some of the values are not simple
+        chunks = [punct["{"]]
+        for key in sorted_keys:
+            value_chunk = self._mk_item_ch_chunk(cp, obj[key], depth)
+            if value_chunk is None:
+                return None
+            if len(chunks) > 1:
+                chunks.append(punct[", "])
+            chunks.append(self._dict_key_to_sc_chunk(cp, key))
+            chunks.append(punct[": "])
+            chunks.append(value_chunk)
+        if n_more:
+            chunks.append(punct[", "])
+            chunks.append(self._mk_n_more_ch_chunk(cp, n_more))
+        chunks.append(punct["}"])
+        return chunks
+
+    def _make_simple_items_ch_chunks(self, cp, items, depth) -> [CHText.Chunk]:
+        # -> list of chunks, one chunk per item
+        # or None if some of the items are not simple
+        items_chunks = []
+        for item in items:
+            item_chunk = self._mk_item_ch_chunk(cp, item, depth)
+            if item_chunk is None:
+                return None
+            items_chunks.append(item_chunk)
+        return items_chunks
+
+    def _mk_item_ch_chunk(self, cp, value, depth) -> CHText.Chunk:
+        # -> chunk of the value if the value is printed in one chunk
+        # (simple values and too deep containers), otherwise None
+        if self._value_is_simple(value):
+            return self._simple_val_to_ch_chunk(cp, value)
+        if isinstance(value, (dict, list)) and self._is_too_deep(depth):
+            return self._mk_too_deep_ch_chunk(cp, isinstance(value, dict), len(value))
+        return None
+
+    def _get_shown_items(self, value) -> (list, int):
+        # list or dict -> (items or sorted keys to print, number of not printed items)
+        n_more = 0
+        if self._max_items is not None and len(value) > self._max_items:
+            n_more = len(value) - self._max_items
+        if isinstance(value, dict):
+            keys = itertools.islice(value, self._max_items) if n_more else value.keys()
+            return sorted(keys, key=self._mk_type_sort_value), n_more
+        return (value[:self._max_items] if n_more else value), n_more
+
+    def _is_too_deep(self, depth) -> bool:
+        # check if container with specified nesting level should not be printed
+        return self._max_depth is not None and depth >= self._max_depth
+
+    @staticmethod
+    def _mk_too_deep_ch_chunk(cp, is_dict, n_items) -> CHText.Chunk:
+        # chunk to print instead of a too deep container
+        items_text = PPStdFormatter._n_things(n_items, "item")
+        return cp.text(f"{{... {items_text}}}" if is_dict else f"[... {items_text}]")
+
+    @staticmethod
+    def _mk_n_more_ch_chunk(cp, n_more) -> CHText.Chunk:
+        # chunk to print instead of not printed items of a container
+        return cp.text(f"... {PPStdFormatter._n_things(n_more, 'more item')}")
+
+    @staticmethod
+    def _n_things(n, thing) -> str:
+        # 1, "item" -> "1 item"; 2, "item" -> "2 items"
+        return f"{n} {thing}" if n == 1 else f"{n} {thing}s"
 
     @classmethod
     def _value_is_simple(cls, value) -> bool:
@@ -410,6 +636,10 @@ class PPStdFormatter(PaletteUser):
     def _simple_val_to_ch_chunk(self, cp: PPPalette, value) -> CHText.Chunk:
         # simple value (number, string, built-in constant) -> CHText.Chunk
         if isinstance(value, str):
+            if self._max_string_len is not None and len(value) > self._max_string_len:
+                value = (
+                    f"{value[:self._max_string_len]}... "
+                    f"{self._n_things(len(value) - self._max_string_len, 'more char')}")
             return cp.text('"' + value + '"')
         elif self.is_keyword_value(value):
             return cp.keyword(self._consts[value])
@@ -466,6 +696,269 @@ class _PrettyPrinterTextGen:
         return self.pretty_printer._gen_ch_lines(cp, self.obj_to_print)
 
 
+class _PrettyPrinterStreamTextGen:
+    # PPObj-looking object which produces pretty-print results of json file
+    __slots__ = 'pretty_printer', 'fp', 'lookahead', 'chunk_size'
+    def __init__(self, pretty_printer, fp, lookahead, chunk_size):
+        self.pretty_printer = pretty_printer
+        self.fp = fp
+        self.lookahead = lookahead
+        self.chunk_size = chunk_size
+
+    def make_ch_text(self, cp):
+        return CHText("\n").join(self.gen_ch_lines(cp))
+
+    def gen_ch_lines(self, cp):
+        return self.pretty_printer._gen_stream_ch_lines(
+            cp, _JsonEventsReader(self.fp, self.chunk_size), self.lookahead)
+
+
+class _JsonEventsReader:
+    """Incremental json parser.
+
+    Reads json text from a file-like object by chunks and produces events:
+        ("{", None), ("}", None), ("[", None), ("]", None),
+        ("key", dict_key), ("value", simple_value)
+    """
+
+    # marks a container which does not fit into lookahead buffer
+    TOO_BIG = object()
+
+    _WS_RE = re.compile(r'[ \t\n\r]*')
+    _LITERALS = {
+        'true': True, 'false': False, 'null': None,
+        'NaN': float('nan'), 'Infinity': float('inf'), '-Infinity': float('-inf'),
+    }
+    _MAX_LITERAL_LEN = max(len(lit) for lit in _LITERALS)
+    # the number is complete if at least this number of chars follow it
+    # in the buffer: the number may be continued by '.', 'e', 'e-' + digits
+    _NUMBER_LOOKAHEAD = 3
+
+    # parser states - what is expected next
+    _EXPECT_VALUE = 0
+    _EXPECT_VALUE_OR_END = 1   # just after '['
+    _EXPECT_KEY = 2
+    _EXPECT_KEY_OR_END = 3     # just after '{'
+    _EXPECT_COMMA_OR_END = 4   # after a value
+
+    def __init__(self, fp, chunk_size):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = None  # is created if the file is binary
+        self._buf = ""
+        self._pos = 0  # position of the next char in the buffer
+        self._buf_offset = 0  # position of the buffer in the file
+        self._eof = False
+        self._unread_events = deque()
+        self._events_gen = self._gen_events()
+
+    def read_event(self) -> tuple:
+        """Return the next event."""
+        if self._unread_events:
+            return self._unread_events.popleft()
+        event = next(self._events_gen, None)
+        if event is None:
+            self._raise_error("Unexpected end of data")
+        return event
+
+    def read_end(self):
+        """Check that there is no more data after the top-level value."""
+        if self._unread_events or next(self._events_gen, None) is not None:
+            self._raise_error("Extra data")
+
+    def read_buffered_container(self, first_event_kind, lookahead):
+        """Read the whole container into memory if it is not too big.
+
+        Arguments:
+        - first_event_kind: '{' or '[' - kind of the event just read
+        - lookahead: max number of events of the container to buffer
+
+        If the container contains more events it is not loaded; TOO_BIG is
+        returned and all the events read are returned back into the stream.
+        """
+        events = []
+        depth = 1
+        while len(events) < lookahead:
+            event = self.read_event()
+            events.append(event)
+            kind = event[0]
+            if kind == "{" or kind == "[":
+                depth += 1
+            elif kind == "}" or kind == "]":
+                depth -= 1
+                if depth == 0:
+                    return self._events_to_obj(first_event_kind, events)
+        self._unread_events.extendleft(reversed(events))
+        return self.TOO_BIG
+
+    def skip_container_items(self, is_dict, event=None) -> int:
+        """Skip the rest of the container, -> number of skipped items.
+
+        Arguments:
+        - is_dict: True if the container is a dictionary
+        - event: optional event already read, the first one to skip
+        """
+        n_items = 0
+        depth = 0
+        while True:
+            kind = (event if event is not None else self.read_event())[0]
+            event = None
+            if kind == "{" or kind == "[":
+                if depth == 0 and not is_dict:
+                    n_items += 1
+                depth += 1
+            elif kind == "}" or kind == "]":
+                if depth == 0:
+                    return n_items
+                depth -= 1
+            elif depth == 0 and (kind == "key" or not is_dict):
+                n_items += 1
+
+    @staticmethod
+    def _events_to_obj(first_event_kind, events):
+        # events of a container (w/o the first one) -> container object
+        stack = []  # [(container, key in the parent container), ]
+        obj = {} if first_event_kind == "{" else []
+        key = None
+        for kind, value in events:
+            if kind == "key":
+                key = value
+                continue
+            if kind == "{" or kind == "[":
+                stack.append((obj, key))
+                obj = {} if kind == "{" else []
+                continue
+            if kind == "}" or kind == "]":
+                if not stack:
+                    return obj
+                value = obj
+                obj, key = stack.pop()
+            if isinstance(obj, dict):
+                obj[key] = value
+            else:
+                obj.append(value)
+        assert False, "events of an incomplete container"
+
+    def _gen_events(self):
+        # generate parsing events; stops after the top-level value
+        containers = []  # closing brackets of the containers being parsed
+        state = self._EXPECT_VALUE
+        while True:
+            char = self._peek_significant_char()
+            if state == self._EXPECT_COMMA_OR_END:
+                if not containers:
+                    if char:
+                        self._raise_error("Extra data")
+                    return
+                if char == ",":
+                    self._pos += 1
+                    state = (
+                        self._EXPECT_KEY if containers[-1] == "}"
+                        else self._EXPECT_VALUE)
+                elif char == containers[-1]:
+                    self._pos += 1
+                    containers.pop()
+                    yield (char, None)
+                else:
+                    self._raise_error(f"Expecting ',' delimiter or '{containers[-1]}'")
+            elif state == self._EXPECT_KEY or state == self._EXPECT_KEY_OR_END:
+                if char == "}" and state == self._EXPECT_KEY_OR_END:
+                    self._pos += 1
+                    containers.pop()
+                    state = self._EXPECT_COMMA_OR_END
+                    yield (char, None)
+                elif char == '"':
+                    key = self._read_string()
+                    if self._peek_significant_char() != ":":
+                        self._raise_error("Expecting ':' delimiter")
+                    self._pos += 1
+                    state = self._EXPECT_VALUE
+                    yield ("key", key)
+                else:
+                    self._raise_error(
+                        "Expecting property name enclosed in double quotes")
+            elif char == "]" and state == self._EXPECT_VALUE_OR_END:
+                self._pos += 1
+                containers.pop()
+                state = self._EXPECT_COMMA_OR_END
+                yield (char, None)
+            elif char == "{" or char == "[":
+                self._pos += 1
+                containers.append("}" if char == "{" else "]")
+                state = (
+                    self._EXPECT_KEY_OR_END if char == "{"
+                    else self._EXPECT_VALUE_OR_END)
+                yield (char, None)
+            else:
+                value = self._read_simple_value(char)
+                state = self._EXPECT_COMMA_OR_END
+                yield ("value", value)
+
+    def _peek_significant_char(self) -> str:
+        # skip whitespaces, -> next char or '' if end of file reached
+        while True:
+            self._pos = self._WS_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                return ""
+            self._read_more()
+
+    def _read_simple_value(self, char):
+        # read the string, number or literal starting at the current position
+        if char == '"':
+            return self._read_string()
+
+        while len(self._buf) - self._pos < self._MAX_LITERAL_LEN and not self._eof:
+            self._read_more()
+        for literal, value in self._LITERALS.items():
+            if self._buf.startswith(literal, self._pos):
+                self._pos += len(literal)
+                return value
+
+        while True:
+            match = json.scanner.NUMBER_RE.match(self._buf, self._pos)
+            if match is None:
+                self._raise_error("Expecting value")
+            if len(self._buf) - match.end() >= self._NUMBER_LOOKAHEAD or self._eof:
+                break
+            self._read_more()  # the number may continue in the next chunk
+        self._pos = match.end()
+        integer, frac, exp = match.groups()
+        if frac or exp:
+            return float(integer + (frac or '') + (exp or ''))
+        return int(integer)
+
+    def _read_string(self) -> str:
+        # read the string starting at the current position (at '"')
+        while True:
+            try:
+                value, self._pos = json.decoder.scanstring(self._buf, self._pos + 1)
+                return value
+            except json.JSONDecodeError as err:
+                if self._eof:
+                    self._raise_error(err.msg)
+            # the string may continue in the next chunk. Read at least as much
+            # as already buffered, so that long strings are not rescanned
+            # too many times
+            self._read_more(len(self._buf) - self._pos)
+
+    def _read_more(self, min_size=0):
+        # read next chunk of the file into the buffer
+        data = self._fp.read(max(self._chunk_size, min_size))
+        self._eof = not data
+        if isinstance(data, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")()
+            data = self._decoder.decode(data, final=self._eof)
+        self._buf_offset += self._pos
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+
+    def _raise_error(self, msg):
+        raise ValueError(f"{msg}: char {self._buf_offset + self._pos}")
+
+
 class PPObj(PaletteUser):
     """Base class for pretty-printable objects.
 
@@ -535,7 +1028,7 @@ class _MultiObjCHTextResult(CHTextResult):
     def __init__(
             self, *objs,
             palette=None, no_color=False, compound_palette=None, shade_name=None,
-            style="json", sep=' ',
+            style="json", sep=' ', max_items=None, max_depth=None, max_string_len=None,
     ):
         super().__init__()
         self.objs = objs
@@ -544,7 +1037,9 @@ class _MultiObjCHTextResult(CHTextResult):
         self.shade_name = shade_name
         self.style = style
 
-        self.dflt_formatter = PPStdFormatter(style=style)
+        self.dflt_formatter = PPStdFormatter(
+            style=style, max_items=max_items, max_depth=max_depth,
+            max_string_len=max_string_len)
         self.simple_obj_palette = self.dflt_formatter.make_palette(
             palette=palette,
             no_color=self.no_color,
@@ -569,7 +1064,9 @@ class _MultiObjCHTextResult(CHTextResult):
             if cur_line is None:
                 cur_line = item
             else:
-                cur_line += item
+                # not '+=': lines produced by the objects may be shared
+                # (f.e. border lines of a table), they must not be modified
+                cur_line = cur_line + item
         if cur_line is not None:
             yield cur_line
 
@@ -609,7 +1106,7 @@ class PPCommand:
     def __init__(
             self, *,
             palette=None, no_color=False, compound_palette=None, shade_name=None,
-            style="json",
+            style="json", max_items=None, max_depth=None, max_string_len=None,
     ):
         """Constructor of PPCommand.
 
@@ -621,16 +1118,21 @@ class PPCommand:
             arguments check PPObj.ch_text doc.
         - style: 'json' (default) or 'py'; affects the way some constants are printed;
             check doc of PPStdFormatter for more details.
+        - max_items, max_depth, max_string_len: optional limits of the size of
+            printed json-like structures; check doc of PPStdFormatter.
         """
         self._palette = palette
         self._no_color = no_color
         self._compound_palette = compound_palette
         self._shade_name = shade_name
         self._style = style
+        self._max_items = max_items
+        self._max_depth = max_depth
+        self._max_string_len = max_string_len
 
     def clone(self, *,
               palette=None, no_color=False, compound_palette=None, shade_name=None,
-              style=None):
+              style=None, max_items=None, max_depth=None, max_string_len=None):
         """Return clone of self with overridden settings."""
         return PPCommand(
                 palette=palette if palette is not None else self._palette,
@@ -640,6 +1142,11 @@ class PPCommand:
                     else self._compound_palette,
                 shade_name=shade_name if shade_name is not None else self._shade_name,
                 style=style if style is not None else self._style,
+                max_items=max_items if max_items is not None else self._max_items,
+                max_depth=max_depth if max_depth is not None else self._max_depth,
+                max_string_len=
+                    max_string_len if max_string_len is not None
+                    else self._max_string_len,
         )
 
     def __call__(self, *args, sep=' ', end='\n', file=None, flush=False):
@@ -673,7 +1180,10 @@ class PPCommand:
             compound_palette=self._compound_palette,
             shade_name=self._shade_name,
             style=self._style,
-            sep=sep)
+            sep=sep,
+            max_items=self._max_items,
+            max_depth=self._max_depth,
+            max_string_len=self._max_string_len)
 
 
 # Ready to use command which can be used to pretty-print json-like python objects
@@ -770,6 +1280,93 @@ class PPTrait:
 #########################
 # class FieldType
 
+@dataclass(frozen=True)
+class CacheStats:
+    """Statistics of usage of a cache (FieldType cells cache, etc.)"""
+    hits: int
+    misses: int
+    size: int  # number of cached items
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the items taken from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# statistics of the FieldType cells cache
+CellsCacheStats = CacheStats
+
+
+class _CellsCache:
+    # Size-bounded LRU cache of cells rendered by a FieldType.
+    #
+    # {palette: OrderedDict{(value_type, value, fmt_modifier, connotations, width):
+    #     [CHText.Chunk]}}
+    # Palettes are referenced weakly, the cached cells of a palette are
+    # discarded when the palette is deleted.
+
+    # values of these types may be equal but printed differently (0.0 and -0.0,
+    # Decimal('1.0') and Decimal('1.00'), same moment in different timezones),
+    # so repr of such values is used in the key
+    _REPR_KEY_TYPES = (float, decimal.Decimal, datetime.datetime, datetime.time)
+
+    __slots__ = 'max_size', 'hits', 'misses', '_by_palette', '_last_plt_ref', '_last_cells'
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._by_palette = weakref.WeakKeyDictionary()
+        # cells of the last used palette
+        self._last_plt_ref = None
+        self._last_cells = None
+
+    def get_stats(self) -> CellsCacheStats:
+        return CellsCacheStats(
+            self.hits, self.misses,
+            sum(len(cells) for cells in self._by_palette.values()))
+
+    def make_cell_ch_chunks(
+        self, field_type, value, fmt_modifier, width, cell_plt, traits,
+    ) -> [CHText.Chunk]:
+        # get cell from the cache or render and cache it
+        key = (
+            type(value),
+            repr(value) if isinstance(value, self._REPR_KEY_TYPES) else value,
+            fmt_modifier, tuple(field_type.traits_to_connotations(traits)), width)
+        if self._last_plt_ref is not None and self._last_plt_ref() is cell_plt:
+            cells = self._last_cells
+        else:
+            cells = self._by_palette.get(cell_plt)
+            if cells is None:
+                cells = self._by_palette[cell_plt] = OrderedDict()
+            self._last_plt_ref = weakref.ref(cell_plt)
+            self._last_cells = cells
+
+        try:
+            ch_chunks = cells.get(key)
+        except TypeError:
+            # value is not hashable, such cells are not cached
+            self.misses += 1
+            return field_type.render_cell_ch_chunks(
+                value, fmt_modifier, width, cell_plt, traits)
+
+        if ch_chunks is not None:
+            self.hits += 1
+            cells.move_to_end(key)
+        else:
+            self.misses += 1
+            ch_chunks = field_type.render_cell_ch_chunks(
+                value, fmt_modifier, width, cell_plt, traits)
+            cells[key] = ch_chunks
+            if len(cells) > self.max_size:
+                cells.popitem(last=False)
+
+        # chunks list is returned to the caller, which may modify it
+        return list(ch_chunks)
+
+
 class FieldType(PaletteUser):
     """Describe properties of a field (in a record).
 
@@ -787,6 +1384,13 @@ class FieldType(PaletteUser):
     - make_cell_ch_chunks: returns properly trancated or enlarged "desired text"(*)
         to fit specified length.
 
+    Optionally it may implement:
+    - get_max_cell_text_len: bulk version of get_cell_text_len; is used to detect
+        widths of columns of big tables.
+
+    Rendered cells may be cached (check enable_cells_cache). It makes sense for
+    the fields with few distinct values (statuses, flags, dates) in big tables.
+
     (*) "desired text" is a colored text representing the value. Actual text may
     be different if it is necessary to fit the text into a cell of a specified width.
     For performance reasons it is not a CHText object, but [CHText.Chunk].
@@ -825,11 +1429,43 @@ class FieldType(PaletteUser):
     _DFLT_MIN_WIDTH = 1
     _DFLT_MAX_WIDTH = 999
 
+    _cells_cache = None  # _CellsCache, check enable_cells_cache
+
     def __init__(self, min_width=None, max_width=None):
         self.min_width = self._DFLT_MIN_WIDTH if min_width is None else min_width
         self.max_width = self._DFLT_MAX_WIDTH if max_width is None else max_width
         assert self.min_width <= self.max_width
 
+    def enable_cells_cache(self, max_size=1024):
+        """Turn on caching of the rendered cells.
+
+        Cached cell is reused when a cell for the same value, fmt_modifier,
+        connotations and width is rendered with the same palette. Values are
+        the same if they are equal and have the same type (floats, decimals
+        and date/time values also must have the same repr). So the cache
+        must not be used if make_desired_cell_ch_chunks depends on something
+        else (f.e. on the traits which are not connotations).
+
+        Arguments:
+        - max_size: max number of cached cells (per palette). Least recently
+            used cells are discarded.
+
+        Returns self, so that it is possible to write:
+            status_field_type = PPEnumFieldType({...}).enable_cells_cache()
+        """
+        self._cells_cache = _CellsCache(max_size)
+        return self
+
+    def disable_cells_cache(self):
+        """Turn off caching of the rendered cells."""
+        self._cells_cache = None
+
+    def get_cells_cache_stats(self) -> CellsCacheStats:
+        """Get statistics of the cells cache (None if cache is not enabled)."""
+        if self._cells_cache is None:
+            return None
+        return self._cells_cache.get_stats()
+
     def get_cell_text_len(self, value, fmt_modifier, traits) -> int:
         """Calculate length of text representation of the value (for usual cell)
 
@@ -843,6 +1479,21 @@ class FieldType(PaletteUser):
         )
         return CHText.calc_chunks_len(ch_text_chunks)
 
+    def get_max_cell_text_len(self, values, fmt_modifier, limit) -> int:
+        """Calculate max length of text representations of the values.
+
+        Bulk version of get_cell_text_len for values w/o traits. Result is not
+        greater than limit: the method may stop processing the values as soon
+        as the limit is reached. Override in derived classes if lengths of
+        many values can be calculated more efficiently.
+        """
+        max_len = 0
+        for value in values:
+            max_len = max(max_len, self.get_cell_text_len(value, fmt_modifier, ()))
+            if max_len >= limit:
+                return limit
+        return max_len
+
     def make_desired_cell_ch_chunks(
         self, value, fmt_modifier, cell_plt, traits,
     ) -> ([CHText.Chunk], int):
@@ -873,7 +1524,18 @@ class FieldType(PaletteUser):
         self, value, fmt_modifier, width, cell_plt, traits,
     ) -> [CHText.Chunk]:
         """value -> [CHText.Chunk] having exactly specified width."""
+        if self._cells_cache is not None:
+            return self._cells_cache.make_cell_ch_chunks(
+                self, value, fmt_modifier, width, cell_plt, traits)
+        return self.render_cell_ch_chunks(value, fmt_modifier, width, cell_plt, traits)
 
+    def render_cell_ch_chunks(
+        self, value, fmt_modifier, width, cell_plt, traits,
+    ) -> [CHText.Chunk]:
+        """value -> [CHText.Chunk] having exactly specified width.
+
+        Same as make_cell_ch_chunks, but the cells cache is not used.
+        """
         text, align = self.make_desired_cell_ch_chunks(
             value, fmt_modifier, cell_plt, traits)
 
@@ -985,7 +1647,21 @@ class _DefaultFieldType(FieldType):
     def get_cell_text_len(self, value, fmt_modifier, traits):
         """Calculate length of text representation of the value."""
         # caluculate text length w/o constructing CHText object for the cell
-        return len(str(value))
+        return color.text_width(str(value))
+
+    def get_max_cell_text_len(self, values, fmt_modifier, limit):
+        """Calculate max length of text representations of the values."""
+        if not len(values):
+            return 0
+        dtype = getattr(values, 'dtype', None)
+        if dtype is not None and dtype.kind in 'iu':
+            # numpy array of ints (slice of a column, check PPTable.from_columns)
+            return min(limit, max(len(str(values.max())), len(str(values.min()))))
+        if set(map(type, values)) == {int}:
+            # the longest text representation of int has either the min or
+            # the max value
+            return min(limit, max(len(str(max(values))), len(str(min(values)))))
+        return min(limit, max(map(color.text_width, map(str, values))))
 
 
 class _DefaultTitleFieldType(_DefaultFieldType):
@@ -1071,9 +1747,9 @@ class RecordField:
     Keeps information about the type of the field and it's location in the record.
     """
 
-    __slots__ = 'name', 'field_type', 'value_path'
+    __slots__ = 'name', 'field_type', 'value_path', 'value_getter'
 
-    _V_PATH_ATTR, _V_PATH_KEY, _V_PATH_CONST = range(3)
+    _V_PATH_ATTR, _V_PATH_KEY, _V_PATH_CONST, _V_PATH_COLUMN = range(4)
 
     def __init__(self, name, field_type, value_path):
         """RecordField constructor.
@@ -1089,19 +1765,103 @@ class RecordField:
             f"a class object: {field_type}")
         self.field_type = field_type
         self.value_path = self._prepare_value_path(value_path, name)
+        # callable which fetches the value from a record
+        self.value_getter = self._compile_value_path(self.value_path)
+
+    @classmethod
+    def for_column(cls, name, field_type, column):
+        """Create RecordField for columnar data.
+
+        Records are indexes in the column (a list, array.array or any
+        other sequence) and the value of the field is column[record].
+        """
+        field = cls(name, field_type, 0)
+        field.value_path = [(cls._V_PATH_COLUMN, column)]
+        field.value_getter = cls._compile_value_path(field.value_path)
+        return field
 
     def fetch_value(self, record):
         """get value from a record according to the rules specified by value_path."""
-        val = record
-        for v_path_type, key in self.value_path:
-            if v_path_type == self._V_PATH_ATTR:
-                val = getattr(val, key)
-            elif v_path_type == self._V_PATH_KEY:
-                val = val[key]
+        return self.value_getter(record)
+
+    def fetch_values(self, records):
+        """Get values of the field from a list of records.
+
+        Returns a sequence of values. If the field is a column (check for_column)
+        and the records are a range of indexes, the result is a slice of the column.
+        """
+        if (isinstance(records, range) and records.step == 1
+                and len(self.value_path) == 1
+                and self.value_path[0][0] == self._V_PATH_COLUMN):
+            return self.value_path[0][1][records.start:records.stop]
+        return list(map(self.value_getter, records))
+
+    @classmethod
+    def make_values_getter(cls, fields):
+        """Make callable which fetches values of several fields from a record.
+
+        The returned callable takes a record and returns a tuple of the values
+        of the fields.
+        """
+        if not fields:
+            return lambda _record: ()
+        if len(fields) == 1:
+            getter = fields[0].value_getter
+            return lambda record: (getter(record), )
+        consts = {}
+        exprs = [
+            cls._get_value_path_expr(field.value_path, consts, f"f{i}_")
+            for i, field in enumerate(fields)]
+        # the text contains only validated identifiers and names of the entries
+        # of consts dict (check _get_value_path_expr), so eval is safe
+        return eval(  # pylint: disable=eval-used
+            f"lambda rec: ({', '.join(exprs)}, )", consts)
+
+    @classmethod
+    def _compile_value_path(cls, value_path):
+        # prepared value_path -> callable which fetches the value from a record
+        if len(value_path) == 1:
+            v_path_type, key = value_path[0]
+            if v_path_type == cls._V_PATH_KEY:
+                return operator.itemgetter(key)
+            if v_path_type == cls._V_PATH_ATTR:
+                return operator.attrgetter(key)
+            if v_path_type == cls._V_PATH_COLUMN:
+                return key.__getitem__
+            return lambda _record: key
+        if all(v_path_type == cls._V_PATH_ATTR for v_path_type, _ in value_path):
+            return operator.attrgetter('.'.join(key for _, key in value_path))
+        consts = {}
+        expr = cls._get_value_path_expr(value_path, consts)
+        # the text contains only validated identifiers and names of the entries
+        # of consts dict (check _get_value_path_expr), so eval is safe
+        return eval(f"lambda rec: {expr}", consts)  # pylint: disable=eval-used
+
+    @classmethod
+    def _get_value_path_expr(cls, value_path, consts, prefix="k"):
+        # prepared value_path -> text of python expression which fetches the
+        # value from 'rec' variable.
+        # Keys are not put into the text, they are added to consts dict instead.
+        # [(_V_PATH_KEY, 0), (_V_PATH_KEY, 'user'), (_V_PATH_ATTR, 'address')]
+        #   -> "rec[k0][k1].address"
+        expr = "rec"
+        for i, (v_path_type, key) in enumerate(value_path):
+            if (v_path_type == cls._V_PATH_ATTR
+                    and key.isidentifier() and not keyword.iskeyword(key)):
+                expr = f"{expr}.{key}"
+                continue
+            const_name = f"{prefix}{i}"
+            consts[const_name] = key
+            if v_path_type == cls._V_PATH_ATTR:
+                expr = f"getattr({expr}, {const_name})"
+            elif v_path_type == cls._V_PATH_KEY:
+                expr = f"{expr}[{const_name}]"
+            elif v_path_type == cls._V_PATH_COLUMN:
+                expr = f"{const_name}[{expr}]"
             else:
-                assert v_path_type == self._V_PATH_CONST
-                val = key
-        return val
+                assert v_path_type == cls._V_PATH_CONST
+                expr = const_name
+        return expr
 
     @classmethod
     def _prepare_value_path(cls, value_path, field_name):
@@ -1201,7 +1961,10 @@ class RecordWithTraits:
     RecordWithTraits objects may be 'composite': if the record argument of the constructor
     is itself a RecordWithTraits then the result just adds some new traits to the existing.
     """
-    __slots__ = 'record', '_enclosed', 'record_traits', 'fields_traits', 'cols_traits'
+    __slots__ = (
+        'record', '_enclosed', 'record_traits', 'fields_traits', 'cols_traits',
+        '_traits_by_column',
+    )
     def __init__(self, record, record_traits=None, fields_traits=None, cols_traits=None):
         """RecordWithTraits constructor.
 
@@ -1216,6 +1979,9 @@ class RecordWithTraits:
         context is interpreted as a connotation name.
 
         Possible names of connotations are the names of ConfColor's in FieldType.FieldPalette.
+
+        Traits of the record should not be modified after the record is printed
+        for the first time: traits of each column are calculated only once.
         """
         if isinstance(record, RecordWithTraits):
             self.record = record.record
@@ -1236,6 +2002,7 @@ class RecordWithTraits:
                 col_name: self._parse_traits_arg(col_traits)
                 for col_name, col_traits in self.cols_traits.items()
             }
+        self._traits_by_column = None  # {(field_name, column_name): traits}
 
     @staticmethod
     def _parse_traits_arg(traits) -> [PPTrait]:
@@ -1245,7 +2012,7 @@ class RecordWithTraits:
             return tuple()
         if isinstance(traits, str):
             # in this case 'traits' is a name of a single connotation
-            return [PPTrait(traits)]
+            return [RecordWithTraits._mk_connotations_trait((traits, ))]
         if isinstance(traits, PPTrait):
             return [traits]
 
@@ -1257,7 +2024,8 @@ class RecordWithTraits:
                 accumulated_connotations.append(arg)
             elif isinstance(arg, PPTrait):
                 if accumulated_connotations:
-                    result.append(PPTrait(*accumulated_connotations))
+                    result.append(RecordWithTraits._mk_connotations_trait(
+                        tuple(accumulated_connotations)))
                     accumulated_connotations = []
                 result.append(arg)
             elif arg is not None:
@@ -1265,10 +2033,34 @@ class RecordWithTraits:
                     f"Unexpected trait argument '{arg}'. Type is '{type(arg)}'; "
                     f"expected 'str' or 'PPTrait'")
         if accumulated_connotations:
-            result.append(PPTrait(*accumulated_connotations))
+            result.append(RecordWithTraits._mk_connotations_trait(
+                tuple(accumulated_connotations)))
 
         return result
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _mk_connotations_trait(connotations) -> PPTrait:
+        # connotations names -> PPTrait. The traits specified by names are
+        # shared by records, so traits of different records are the same objects
+        # and the results of processing of the traits can be cached
+        return PPTrait(*connotations)
+
+    def get_traits(self, field_name, column_name) -> tuple:
+        """Get traits applicable for a column.
+
+        Same as gen_traits, but the result is calculated only once.
+        """
+        traits_by_column = self._traits_by_column
+        if traits_by_column is None:
+            traits_by_column = self._traits_by_column = {}
+        key = (field_name, column_name)
+        traits = traits_by_column.get(key)
+        if traits is None:
+            traits = traits_by_column[key] = tuple(
+                self.gen_traits(field_name, column_name))
+        return traits
+
     def gen_traits(self, field_name, column_name):
         """Generate traits applicable for a column."""
         if self.record_traits is not None:
@@ -1306,6 +2098,9 @@ class ReprColumn:
         'title_lines', 'min_width', 'max_width', 'width',
     )
 
+    # number of records processed at once when detecting width of the column
+    _WIDTH_DETECTION_BLOCK = 4096
+
     def __init__(
         self, field, fmt_modifier=None, break_by=False,
         min_width=None, max_width=None,
@@ -1355,15 +2150,18 @@ class ReprColumn:
 
     def clone(self):
         """Clone self. (except for 'width' attribute)"""
-        return ReprColumn(
-            self.field,
-            self.fmt_modifier,
-            self.break_by,
-            self.min_width,
-            self.max_width,
-            self.shade_name,
-            title=self.title_lines,
-        )
+        # attributes are already verified, so the constructor is not called
+        result = ReprColumn.__new__(ReprColumn)
+        result.field = self.field
+        result.name = self.name
+        result.fmt_modifier = self.fmt_modifier
+        result.break_by = self.break_by
+        result.shade_name = self.shade_name
+        result.title_lines = list(self.title_lines)
+        result.min_width = self.min_width
+        result.max_width = self.max_width
+        result.width = None
+        return result
 
     def get_title_width(self):
         """Get width of the column's title.
@@ -1371,7 +2169,7 @@ class ReprColumn:
         As of now columns do not have own titles, so the title of the corresponding
         field is used.
         """
-        return max(len(str(l)) for l in self.title_lines)
+        return max(color.text_width(str(l)) for l in self.title_lines)
 
     def get_cell_text_len(self, record):
         """Get desired cell length for this column when displaying given record.
@@ -1379,7 +2177,7 @@ class ReprColumn:
         (Actual cell may be shorter or longer).
         """
         if isinstance(record, RecordWithTraits):
-            traits = tuple(record.gen_traits(self.field.name, self.name))
+            traits = record.get_traits(self.field.name, self.name)
             record = record.record
         else:
             traits = tuple()
@@ -1390,13 +2188,47 @@ class ReprColumn:
 
         return self.field.field_type.get_cell_text_len(value, self.fmt_modifier, traits)
 
+    def get_max_cell_text_len(self, records, limit, values=None) -> int:
+        """Get max desired cell length for this column for a list of records.
+
+        Values of the column are processed in blocks, and the processing stops
+        as soon as the limit is reached. Optional values are the values of
+        the column already fetched from the records.
+        """
+        ftype = self.field.field_type
+        max_len = 0
+        for start in range(0, len(records), self._WIDTH_DETECTION_BLOCK):
+            block = records[start:start + self._WIDTH_DETECTION_BLOCK]
+            if not isinstance(block, range) and any(
+                    issubclass(t, RecordWithTraits) for t in set(map(type, block))):
+                # slow path: traits may affect the text of the cells
+                block_max_len = max(self.get_cell_text_len(rec) for rec in block)
+            else:
+                block_values = (
+                    self.field.fetch_values(block) if values is None
+                    else values[start:start + self._WIDTH_DETECTION_BLOCK])
+                if any(issubclass(t, FieldValueType)
+                       for t in set(map(type, block_values))):
+                    block_max_len = max(
+                        value.get_cell_text_len(self.fmt_modifier, ())
+                        if isinstance(value, FieldValueType)
+                        else ftype.get_cell_text_len(value, self.fmt_modifier, ())
+                        for value in block_values)
+                else:
+                    block_max_len = ftype.get_max_cell_text_len(
+                        block_values, self.fmt_modifier, limit)
+            max_len = max(max_len, block_max_len)
+            if max_len >= limit:
+                return limit
+        return max_len
+
     def make_cell_ch_chunks(self, record, cell_plt) -> [CHText.Chunk]:
         """Fetch value from record and make colored text for a cell.
 
         Length of created text is exactly self.width.
         """
         if isinstance(record, RecordWithTraits):
-            traits = tuple(record.gen_traits(self.field.name, self.name))
+            traits = record.get_traits(self.field.name, self.name)
             record = record.record
         else:
             traits = tuple()
@@ -1486,6 +2318,12 @@ class _ColumnsParsedFmt:
         self.fmt = fmt or ""  # the original 'fmt' string
         self.columns = self._parse_cols_fmt(fmt)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def parse(fmt) -> '_ColumnsParsedFmt':
+        """Cached constructor. The parsed fmt objects are never modified."""
+        return _ColumnsParsedFmt(fmt)
+
     def verify_not_enhanced(self):
         """Raises exception if fmt contains any columns with value_path."""
         if self.columns in ["", "*"]:
@@ -1612,6 +2450,47 @@ class _ColumnsParsedFmt:
         return path_by_field_name
 
 
+class _TemplatesCache:
+    # Size-bounded LRU cache of ReprStructure objects created by ReprStructure.make
+    #
+    # {key: ReprStructure}. Cached objects are not modified, clones of them
+    # are returned by ReprStructure.make
+    __slots__ = 'max_size', 'hits', 'misses', '_templates', '_lock'
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, len(self._templates))
+
+    def get(self, key):
+        # -> cached ReprStructure or None
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._templates.move_to_end(key)
+            return template
+
+    def put(self, key, template):
+        with self._lock:
+            self._templates[key] = template
+            if len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+
 class ReprStructure:
     """Record structure and columns of a record's representation.
 
@@ -1647,6 +2526,9 @@ class ReprStructure:
     _DFLT_TITLE_FIELD_TYPE = _DefaultTitleFieldType()
     _DFLT_REPR_STYLE = RecordReprStyle()
 
+    # ReprStructure objects made from the same arguments
+    _TEMPLATES_CACHE = _TemplatesCache(max_size=256)
+
     def __init__(self, record_structure, columns, borders, style=None):
         self.record_structure: RecordStructure = record_structure
         self.columns: [ReprColumn] = columns
@@ -1688,8 +2570,71 @@ class ReprStructure:
 
         All the arguments are optional, the method fetches information about record
         structure and report columns from whatever is provided.
+
+        Created objects are cached: if the method is called again with the same
+        arguments (fields types and RecordField objects are compared by identity),
+        a clone of the cached object is returned.
         """
         style = style or cls._DFLT_REPR_STYLE
+        key = cls._mk_template_key(
+            fmt, fields, fields_types, columns_titles, sample_record, style)
+        if key is not None:
+            template = cls._TEMPLATES_CACHE.get(key)
+            if template is not None:
+                return template.clone()
+
+        result = cls._make(
+            fmt, fields, fields_types, columns_titles, sample_record, style)
+        if key is not None:
+            cls._TEMPLATES_CACHE.put(key, result.clone())
+        return result
+
+    @classmethod
+    def get_templates_cache_stats(cls) -> CacheStats:
+        """Get statistics of usage of the cache of objects created by 'make'."""
+        return cls._TEMPLATES_CACHE.get_stats()
+
+    @classmethod
+    def clear_templates_cache(cls):
+        """Clear the cache of objects created by 'make' and its statistics."""
+        cls._TEMPLATES_CACHE.clear()
+
+    @classmethod
+    def _mk_template_key(
+        cls, fmt, fields, fields_types, columns_titles, sample_record, style,
+    ):
+        # -> key of ReprStructure in the templates cache or None if the
+        # object made from these arguments can't be cached
+        if fields is not None or sample_record is None:
+            sample_key = None  # sample record is not used
+        elif hasattr(sample_record, '_fields'):
+            sample_key = ('_fields', tuple(sample_record._fields))
+        elif isinstance(sample_record, (list, tuple)):
+            sample_key = ('len', len(sample_record))
+        else:
+            sample_key = ('obj', )  # structure can't be fetched from such sample
+        key = (
+            fmt.fmt if isinstance(fmt, _ColumnsParsedFmt) else (fmt or ""),
+            None if fields is None else tuple(fields),
+            frozenset(fields_types.items()) if fields_types else None,
+            frozenset(
+                (name, tuple(title) if isinstance(title, list) else title)
+                for name, title in columns_titles.items()
+            ) if columns_titles else None,
+            sample_key,
+            style,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @classmethod
+    def _make(
+        cls, fmt, fields, fields_types, columns_titles, sample_record, style,
+    ):
+        # implementation of 'make', creates new ReprStructure object
         parsed_fmt = cls._parse_fmt(fmt)
         fields_types_dict = {} if fields_types is None else fields_types
         columns_titles_dict = {} if columns_titles is None else columns_titles
@@ -1810,14 +2755,25 @@ class ReprStructure:
 
         return cls(record_structure, repr_columns, borders, style)
 
+    def make_values_getter(self):
+        """Make callable which fetches values of all the columns from a record.
+
+        The callable returns a tuple of values, one value per column.
+        """
+        return RecordField.make_values_getter([col.field for col in self.columns])
+
     def col_widths_finalized(self) -> bool:
         """Check if actual widths of columns are already known."""
         return all(col.width is not None for col in self.columns)
 
     def detect_actual_columns_widths(
             self, body_records, *,
-            _account_columns_names=True):
-        """Calculate actual widths of columns using the actual records."""
+            _account_columns_names=True, columns_values=None):
+        """Calculate actual widths of columns using the actual records.
+
+        Optional columns_values is {column: values} - already fetched values
+        of some of the columns.
+        """
         if _account_columns_names:
             for col in self.columns:
                 title_width = col.get_title_width()
@@ -1826,15 +2782,17 @@ class ReprStructure:
             for col in self.columns:
                 col.width = col.min_width
 
-        for rec in body_records:
-            for col in self.columns:
-                if col.width < col.max_width:
-                    col.width = max(
-                        col.width,
-                        min(col.max_width, col.get_cell_text_len(rec))
-                    )
-            if all(col.width == col.max_width for col in self.columns):
-                break
+        # process records column by column: values of a column are
+        # processed in bulk, which is much faster for big tables.
+        if not isinstance(body_records, (list, tuple, range)):
+            body_records = list(body_records)
+
+        columns_values = columns_values or {}
+        for col in self.columns:
+            if col.width < col.max_width:
+                col.width = max(
+                    col.width, col.get_max_cell_text_len(
+                        body_records, col.max_width, columns_values.get(col)))
 
     def get_borders_positions(self):
         """Returns {col_start_pos: text_of_left_border}."""
@@ -1981,7 +2939,7 @@ class ReprStructure:
         if fmt is None:
             fmt = ""
         assert isinstance(fmt, str), f"{type(fmt)}: {fmt}"
-        return _ColumnsParsedFmt(fmt)
+        return _ColumnsParsedFmt.parse(fmt)
 
     @staticmethod
     def _make_unique_columns_names(names):
@@ -2313,13 +3271,17 @@ class PPRecordFmt(PaletteUser):
         # 1. analize position of own columns
         own_cols_positions = {} # {column_name: (start_pos, end_pos)}
         own_cols_fields_types = {}
-        cur_col_start_pos = 0
+        own_borders = self.repr_structure.borders
+        own_borders_lens = {}  # {end_pos: length of the border preceding end_pos}
+        first_col_start_pos = len(own_borders[0])
+        cur_col_start_pos = first_col_start_pos
         all_fields_names = {
             f.name for f in self.repr_structure.record_structure.fields}
-        for c in self.repr_structure.columns:
+        for c, right_border in zip(self.repr_structure.columns, own_borders[1:]):
             width = c.width if c.width is not None else c.min_width
-            next_col_start_pos = cur_col_start_pos + width + 1 # 1 is for delimiter
+            next_col_start_pos = cur_col_start_pos + width + len(right_border)
             own_cols_positions[c.name] = (cur_col_start_pos, next_col_start_pos)
+            own_borders_lens[next_col_start_pos] = len(right_border)
             cur_col_start_pos = next_col_start_pos
             own_cols_fields_types[c.name] = c.field.field_type
 
@@ -2352,7 +3314,7 @@ class PPRecordFmt(PaletteUser):
                 if src_col_name is None:
                     # special case, very first summary column not corresponding to
                     # any src column
-                    start_pos = 0
+                    start_pos = first_col_start_pos
                     end_pos = None
                 else:
                     if src_col_name in all_fields_names:
@@ -2386,7 +3348,7 @@ class PPRecordFmt(PaletteUser):
         # start and end positions of all the columns are ready.
         # But there may be gaps between them. Let's insert dummy filler columns
         full_summ_colums_data = []
-        last_col_end_pos = 0
+        last_col_end_pos = first_col_start_pos
         for col_data in summ_columns_data:
             if col_data[1] != last_col_end_pos:
                 # gap between columns detected
@@ -2416,7 +3378,7 @@ class PPRecordFmt(PaletteUser):
             if field_type is None:
                 field_type = ReprStructure._DFLT_FIELD_TYPE
 
-            width = end_pos - start_pos - 1
+            width = end_pos - start_pos - own_borders_lens.get(end_pos, 1)
             field = RecordField(name, field_type, value_path)
             column = ReprColumn(field, min_width=width, max_width=width)
             fields.append(field)
@@ -2466,6 +3428,86 @@ class TableStyle:
     show_summary_line: bool = True
 
 
+class _Aggregate:
+    # Accumulator of an aggregate function of a column (check 'aggregates'
+    # argument of PPTable constructor). Values are added in bulk; None values
+    # are ignored.
+
+    FUNCS = ('sum', 'min', 'max', 'count', 'avg', 'distinct')
+
+    __slots__ = 'func', 'column_name', 'n_values', 'value'
+
+    def __init__(self, func, column_name):
+        self.func = func
+        self.column_name = column_name  # used in error messages only
+        self.n_values = 0
+        # sum, min or max of the values; set of the values for 'distinct'
+        self.value = set() if func == 'distinct' else None
+
+    def add_values(self, values):
+        """Process a sequence of values of the column."""
+        try:
+            if self.func == 'distinct':
+                self.value.update(values)
+                self.value.discard(None)
+                return
+            if self.func != 'count':
+                # None values are not searched for in advance: usually there
+                # are no such values, and operations with None values fail anyway
+                try:
+                    self._add_not_none_values(values)
+                    return
+                except TypeError:
+                    pass
+            if None in values:
+                values = [v for v in values if v is not None]
+            self._add_not_none_values(values)
+        except TypeError as err:
+            raise ValueError(
+                f"Can't calculate '{self.func}' aggregate of column "
+                f"'{self.column_name}': {err}") from err
+
+    def _add_not_none_values(self, values):
+        if not len(values):
+            return
+        func = self.func
+        if func in ('sum', 'avg'):
+            total = sum(values)
+            self.value = total if self.value is None else self.value + total
+        elif func == 'min':
+            value = min(values)
+            self.value = value if self.value is None else min(self.value, value)
+        elif func == 'max':
+            value = max(values)
+            self.value = value if self.value is None else max(self.value, value)
+        self.n_values += len(values)
+
+    @classmethod
+    def calc(cls, func, column_name, values):
+        """Calculate value of the aggregate function of the values."""
+        accumulator = cls(func, column_name)
+        accumulator.add_values(values)
+        return accumulator.result()
+
+    def result(self):
+        """Value of the aggregate function of the processed values."""
+        if self.func == 'count':
+            return self.n_values
+        if self.func == 'distinct':
+            return len(self.value)
+        if self.func == 'avg':
+            return self._round(self.value / self.n_values) if self.n_values else None
+        return self.value
+
+    @staticmethod
+    def _round(value):
+        # round average value: 2 digits after the decimal point, but at least
+        # 2 significant digits for small values
+        if not value or not math.isfinite(value):
+            return value
+        return round(value, max(2, 1 - math.floor(math.log10(abs(value)))))
+
+
 class PPTable(PPObj):
     """2-D table.
 
@@ -2499,35 +3541,122 @@ class PPTable(PPObj):
         def __init__(
             self,
             table_lines=None, break_line=None, skipped_recs_line=None,
-            n_skipped_lines=0,
+            n_skipped_lines=0, n_all_lines=0, last_break_by_values=None,
+            summary_values=None, group_summary_lines=None,
         ):
             self.table_lines = table_lines
             self.break_line = break_line
             self.skipped_recs_line = skipped_recs_line
             self.n_skipped_lines = n_skipped_lines
-
-        def clone(self):
-            # self.table_lines contains records and service lines.
-            # The service lines must be one of self.break_line
-            # or self.skipped_recs_line
-            new_break_line = PPTable._ServiceLine()
-            new_skipped_resc_line = PPTable._ServiceLine()
-            choose_line = lambda line: (
-                new_break_line if line is self.break_line
-                else (new_skipped_resc_line if line is self.skipped_recs_line
-                else line))
-            new_table_lines = [choose_line(line) for line in self.table_lines]
-            return PPTable._TableVisibileLines(
-                new_table_lines, new_break_line, new_skipped_resc_line,
-                self.n_skipped_lines,
-            )
+            # number of lines (including not visible) and 'break_by' values of the
+            # last record; used to append records
+            self.n_all_lines = n_all_lines
+            self.last_break_by_values = last_break_by_values
+            # {column_name: value} - aggregates of all the records
+            self.summary_values = summary_values
+            # {stop: _SummaryLine} - lines with aggregates of the groups of
+            # records (including not visible), by position of the group end
+            self.group_summary_lines = group_summary_lines or {}
 
     class _ServiceLine:
-        # contents of a 'service' line of a printed table - line, which
+        # marker of a 'service' line of a printed table - line, which
         # doesn't correspond to any record (f.e. empty 'break by' line)
-        __slots__ = ('ch_text', )
-        def __init__(self, ch_text=None):
-            self.ch_text = ch_text
+        __slots__ = ()
+
+    class _SummaryLine(_ServiceLine):
+        # line with aggregates of a group of records
+        __slots__ = 'start', 'stop', 'values'
+        def __init__(self, start, stop, values=None):
+            # positions of the records of the group
+            self.start = start
+            self.stop = stop
+            self.values = {} if values is None else values  # {column_name: value}
+
+    class _StreamAggregates:
+        # Aggregates of the records of streaming table. Records are buffered
+        # and processed by the accumulators in batches, column-at-a-time.
+        _BATCH_SIZE = 10000
+
+        def __init__(self, aggregated_columns, with_groups):
+            self.columns = aggregated_columns  # [(column, function_name), ]
+            self.total = [
+                _Aggregate(func, col.name) for col, func in aggregated_columns]
+            self.group = (
+                [_Aggregate(func, col.name) for col, func in aggregated_columns]
+                if with_groups else None)
+            self.pending_records = []
+
+        def add(self, record):
+            self.pending_records.append(record)
+            if len(self.pending_records) >= self._BATCH_SIZE:
+                self._flush()
+
+        def finish_group(self) -> dict:
+            # -> {column_name: value} - aggregates of the records of the group
+            self._flush()
+            values = {
+                col.name: accumulator.result()
+                for (col, _func), accumulator in zip(self.columns, self.group)}
+            self.group = [_Aggregate(func, col.name) for col, func in self.columns]
+            return values
+
+        def get_summary_values(self) -> dict:
+            # -> {column_name: value} - aggregates of all the records
+            self._flush()
+            return {
+                col.name: accumulator.result()
+                for (col, _func), accumulator in zip(self.columns, self.total)}
+
+        def _flush(self):
+            if not self.pending_records:
+                return
+            records = PPTable._get_plain_records(self.pending_records)
+            for i, (col, _func) in enumerate(self.columns):
+                values = col.field.fetch_values(records)
+                self.total[i].add_values(values)
+                if self.group is not None:
+                    self.group[i].add_values(values)
+            self.pending_records = []
+
+    class _RenderPlan:
+        # objects used to print the table with a palette; they are created
+        # once for each palette (check PPTable._get_render_plan)
+        __slots__ = (
+            'normal_line_fmt', 'break_line_text', 'border_line', 'skipped_recs_line',
+            'summary_fmt', 'summary_label')
+        def __init__(
+            self, normal_line_fmt, break_line_text, border_line, summary_fmt,
+            summary_label,
+        ):
+            self.normal_line_fmt = normal_line_fmt
+            self.break_line_text = break_line_text
+            self.border_line = border_line
+            # PPRecordFmt for lines with aggregates (None if there are no aggregates)
+            self.summary_fmt = summary_fmt
+            # {column_name: label} - label of the lines with aggregates
+            self.summary_label = summary_label
+            # (n_skipped, CHText) - the line which replaces not visible records
+            self.skipped_recs_line = None
+
+    class _RecordsView:
+        # Sequence of records of a table view (check PPTable.sorted_by, etc.).
+        # Contains positions of the records in the original sequence, the
+        # records themselves are not copied.
+        __slots__ = 'base', 'indexes'
+        def __init__(self, base, indexes):
+            self.base = base  # original sequence of records
+            self.indexes = indexes  # array('I') of positions in base
+
+        def __len__(self):
+            return len(self.indexes)
+
+        def __getitem__(self, index):
+            if isinstance(index, slice):
+                return [self.base[i] for i in self.indexes[index]]
+            return self.base[self.indexes[index]]
+
+        def __iter__(self):
+            return map(self.base.__getitem__, self.indexes)
 
     def __init__(
             self, records, *,
@@ -2542,6 +3671,9 @@ class PPTable(PPObj):
             columns_titles=None,
             traits=None,
             style=None,
+            stream_sample=None,
+            aggregates=None,
+            group_aggregates=False,
     ):
         """Constructor of PPTable object - this object prints table.
 
@@ -2573,6 +3705,31 @@ class PPTable(PPObj):
         - traits: optional list of PPTraits to apply to all records
         - style: optional PPTable.Style object which affects table look: characters
             to be used as borders, whether to print summary, etc.
+        - stream_sample: (optional) turns on streaming mode (*). Number of the first
+            records to be used to detect widths of columns.
+        - aggregates: (optional) {column_name: function_name}. Values of the
+            aggregate functions of the columns are printed in the line following
+            the records. Supported functions: 'sum', 'min', 'max', 'count', 'avg'
+            and 'distinct' (number of distinct values). None values are ignored;
+            'avg' values are rounded. Names of the functions are printed in the
+            first column which has no aggregate; the column is widened to fit
+            them if necessary.
+        - group_aggregates: if True, aggregates are also printed after each group
+            of records (groups are separated by 'break_by' columns)
+
+        (*) By default PPTable keeps all the records (generator is converted to
+        list) because all the records are examined to calculate widths of columns
+        before the first line is printed. In streaming mode widths of columns are
+        calculated using only 'stream_sample' first records (or only titles and
+        declared min widths if stream_sample is 0), and the rest of the records
+        are fetched from the iterator while the table lines are generated. Only
+        the sample and (if limits are specified) the last visible records are kept
+        in memory. Values which do not fit into detected widths are truncated.
+        Streaming table can be printed only once. Use it for very large results,
+        such as sql cursors or log scans:
+
+            for line in PPTable(cursor, fields=..., stream_sample=100).ch_text():
+                print(line)
 
         Combinations of arguments used in common scenarios:
 
@@ -2603,18 +3760,27 @@ class PPTable(PPObj):
         """
         self.records = records
 
-        try:
-            self.records[0]
-        except IndexError:
-            pass
-        except TypeError:
-            # the records object is a generator. PPTable needs to iterate records
-            # more than once (the first time to calculate columns widths).
-            # So it is necessary to store all the records locally.
-            self.records = list(self.records)
+        # iterator of not fetched yet records (used in streaming mode only)
+        self._stream_iter = None
+        self._streaming = stream_sample is not None
+        if self._streaming:
+            # only the sample of records is kept in self.records
+            self._stream_iter = iter(records)
+            self.records = list(itertools.islice(self._stream_iter, stream_sample))
+        else:
+            try:
+                self.records[0]
+            except IndexError:
+                pass
+            except TypeError:
+                # the records object is a generator. PPTable needs to iterate records
+                # more than once (the first time to calculate columns widths).
+                # So it is necessary to store all the records locally.
+                self.records = list(self.records)
 
         # each PPObj should have 'r' attribute, which contains 'original' object.
-        # In case of table the original object is the list of records:
+        # In case of table the original object is the list of records
+        # (in streaming mode - only the sample records):
         self.r = self.records
 
         if fmt_obj is not None:
@@ -2634,14 +3800,72 @@ class PPTable(PPObj):
 
         self._ppt_fmt.set_limits(limits)
 
+        self._aggregates = dict(aggregates or {})
+        self._group_aggregates = group_aggregates
+        all_names = {
+            f.name for f in self._ppt_fmt.repr_structure.record_structure.fields}
+        all_names.update(col.name for col in self._ppt_fmt.repr_structure.columns)
+        for col_name, func in self._aggregates.items():
+            if col_name not in all_names:
+                raise ValueError(
+                    f"aggregate of unknown column '{col_name}' specified")
+            if func not in _Aggregate.FUNCS:
+                raise ValueError(
+                    f"unknown aggregate function '{func}' of column '{col_name}'. "
+                    f"Supported functions: {', '.join(_Aggregate.FUNCS)}")
+
         if skip_columns is not None:
             self._ppt_fmt.remove_columns(skip_columns)
 
         self.header = header
-        self.footer = (
-            footer if footer is not None else f"Total {len(self.records)} records")
+        # default footer is updated when records are appended
+        self._dflt_footer = footer is None
+        if footer is None and not self._streaming:
+            footer = f"Total {len(self.records)} records"
+        # in streaming mode default footer is created when all the records
+        # are fetched
+        self.footer = footer
 
         self._visible_table_lines = None  # _TableVisibileLines
+        # {tbl_plt: _RenderPlan}. The plans reference the palettes, so the
+        # palettes live as long as the plans: until the plans are reset (check
+        # _reset_render_plans) or as long as the table
+        self._render_plans = {}
+        # table which prints all the records of self ignoring the limits
+        # (check _get_unlimited_table)
+        self._unlimited_table = None
+        # position of the first record added by the last 'append' call
+        self._appended_start = None
+        # self.records is a list created by the table (check 'append')
+        self._own_records = self.records is not records
+
+    @classmethod
+    def from_columns(cls, columns, *, fields_types=None, **kwargs):
+        """Create PPTable from columnar data.
+
+        Arguments:
+        - columns: {column_name: sequence of values}. The sequences (lists,
+            array.array objects, numpy arrays, etc.) must have the same length.
+        - fields_types: (optional) dictionary {field_name: FieldType}.
+        - kwargs: other arguments of PPTable constructor (except for 'fields'
+            and 'stream_sample')
+
+        Rows are not materialized: records of the table are indexes in the columns
+        and values are fetched from the columns by index. Widths of columns are
+        detected using slices of the columns.
+        """
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(
+                f"columns have different lengths: "
+                f"{ {name: len(column) for name, column in columns.items()} }")
+        n_rows = lengths.pop() if lengths else 0
+        fields_types = fields_types or {}
+        fields = [
+            RecordField.for_column(
+                name, fields_types.get(name, ReprStructure._DFLT_FIELD_TYPE), column)
+            for name, column in columns.items()]
+        return cls(range(n_rows), fields=fields, **kwargs)
 
     def set_fmt(self, fmt):
         """Specify fmt - a string which describes format of the table.
@@ -2654,6 +3878,8 @@ class PPTable(PPObj):
         new_fmt_obj._set_parsed_fmt(parsed_fmt, self._ppt_fmt)
         self._ppt_fmt = new_fmt_obj
         self._visible_table_lines = None  # reset cached data
+        self._reset_render_plans()
+        self._unlimited_table = None
         return self
 
     def _get_fmt(self):
@@ -2673,6 +3899,132 @@ class PPTable(PPObj):
             equal to name of any column are accepted but ignored).
         """
         self._ppt_fmt.remove_columns(columns_names)
+        self._reset_render_plans()
+        self._unlimited_table = None
+
+    def sorted_by(self, column_name, *, reverse=False) -> 'PPTable':
+        """Make a view of the table with records sorted by values of a column.
+
+        Records with None values are placed after other records. Check 'where'
+        method doc for more details about views.
+        """
+        values = self._fetch_column_values(column_name)
+        if None in values:
+            positions = sorted(
+                (i for i, value in enumerate(values) if value is not None),
+                key=values.__getitem__, reverse=reverse)
+            positions.extend(i for i, value in enumerate(values) if value is None)
+        else:
+            positions = sorted(
+                range(len(values)), key=values.__getitem__, reverse=reverse)
+        return self._make_view(positions)
+
+    def where(self, predicate) -> 'PPTable':
+        """Make a view of the table which contains only some of the records.
+
+        Arguments:
+        - predicate: callable, which takes a record object (w/o traits) and
+            returns True if the record should be in the view. For tables made
+            by from_columns the predicate takes {column_name: value} dictionary.
+
+        The view is a PPTable with the same format (and 'break_by' columns,
+        limits, traits, etc.) as this table. Records of the view are not copied:
+        the view contains only positions of the records in the original
+        sequence, so views of big tables can be created (and views of views
+        can be combined) cheaply. If the widths of the columns of this table
+        were calculated using all the records, the view uses the same widths.
+        """
+        records = self.records
+        base_records = records.base if isinstance(records, self._RecordsView) else records
+        columns = [
+            (field.name, field.value_path[0][1])
+            for field in self._ppt_fmt.repr_structure.record_structure.fields
+            if field.value_path[0][0] == RecordField._V_PATH_COLUMN]
+        if isinstance(base_records, range) and columns:
+            # table of columnar data, records are indexes in the columns
+            records = (
+                {name: column[i] for name, column in columns} for i in records)
+        else:
+            records = self._get_plain_records(records)
+        return self._make_view(
+            itertools.compress(itertools.count(), map(predicate, records)))
+
+    def grouped(self, column_name) -> 'PPTable':
+        """Make a view of the table with records grouped by values of a column.
+
+        Groups follow in the order of their first records, the column gets
+        'break_by' property, so the groups are separated by empty lines. Check
+        'where' method doc for more details about views.
+        """
+        groups = {}
+        for i, value in enumerate(self._fetch_column_values(column_name)):
+            groups.setdefault(value, []).append(i)
+        view = self._make_view(itertools.chain.from_iterable(groups.values()))
+        for col in view._ppt_fmt.repr_structure.columns:
+            if col.name == column_name:
+                col.break_by = True
+        return view
+
+    def _fetch_column_values(self, column_name) -> list:
+        # -> values of the column for all the records of the table
+        if self._streaming:
+            raise ValueError("views of streaming PPTable are not supported")
+        for col in self._ppt_fmt.repr_structure.columns:
+            if col.name == column_name:
+                break
+        else:
+            raise ValueError(
+                f"table has no column '{column_name}'. Available columns: "
+                f"{', '.join(col.name for col in self._ppt_fmt.repr_structure.columns)}")
+        return self._fetch_values(col, self.records)
+
+    @staticmethod
+    def _fetch_values(column, records):
+        # -> values of the column for the records
+        return column.field.fetch_values(PPTable._get_plain_records(records))
+
+    @staticmethod
+    def _get_plain_records(records):
+        # -> records w/o traits (RecordWithTraits objects are replaced with
+        # the enclosed records)
+        if isinstance(records, range) or not any(
+                issubclass(t, RecordWithTraits) for t in set(map(type, records))):
+            return records
+        return [
+            rec.record if isinstance(rec, RecordWithTraits) else rec
+            for rec in records]
+
+    def _make_view(self, positions) -> 'PPTable':
+        # positions of records in self.records -> view of the table
+        if self._streaming:
+            raise ValueError("views of streaming PPTable are not supported")
+        records = self.records
+        if isinstance(records, self._RecordsView):
+            # view of a view refers to the original records
+            indexes = array.array('I', map(records.indexes.__getitem__, positions))
+            records = records.base
+        else:
+            indexes = array.array('I', positions)
+
+        view = PPTable(
+            self._RecordsView(records, indexes),
+            header=self.header,
+            footer=None if self._dflt_footer else self.footer,
+            fmt_obj=self._ppt_fmt,
+            traits=self.traits,
+            aggregates=self._aggregates,
+            group_aggregates=self._group_aggregates)
+
+        if (self._ppt_fmt.repr_structure.col_widths_finalized()
+                and not self._ppt_fmt.any_lines_skipped):
+            # widths of the columns were detected using all the records (or
+            # inherited from the table this view is made of), records of the
+            # view fit into these widths
+            for view_col, col in zip(
+                    view._ppt_fmt.repr_structure.columns,
+                    self._ppt_fmt.repr_structure.columns):
+                view_col.width = col.width
+        return view
 
     def make_record_formatter(
         self, *,
@@ -2700,38 +4052,484 @@ class PPTable(PPObj):
     def gen_ch_lines(self, tbl_plt: Palette) -> Iterator[CHText]:
         """Generate CHText objects - lines of the printed table"""
 
-        style = self._ppt_fmt.style
+        if self._streaming:
+            yield from self._gen_stream_ch_lines(tbl_plt)
+            return
 
         self._init_visible_lines_data()
-        assert self._visible_table_lines is not None
-
-        # self._visible_table_lines contains list or visible records and
-        # 'service' lines. But service lines are not quite ready yet.
-        # Service lines contain ready CHText, which can be created only
-        # using the color palette. Single table can be printed multiple
-        # times concurrently, so this method should have it's own copy
-        # of the data.
-        cur_scheme = self._visible_table_lines.clone()
-
-        # there is no need to specify style when constructing PPRecordFmt
-        # because the record-related style information is present in
-        # the repr_structure
-        normal_line_fmt = self.make_record_formatter(palette=tbl_plt)
-
-        # contents of service lines can be created now
-        cur_scheme.break_line.ch_text = normal_line_fmt.line(tbl_plt.text(""))
-        cur_scheme.skipped_recs_line.ch_text = normal_line_fmt.line(
+        vis_lines = self._visible_table_lines
+        assert vis_lines is not None
+
+        plan = self._get_render_plan(tbl_plt)
+        normal_line_fmt = plan.normal_line_fmt
+        border_line = plan.border_line
+
+        yield from self._gen_head_ch_lines(tbl_plt, normal_line_fmt, border_line)
+
+        # 5. table contents - actual records and service lines. Texts of the
+        # service lines depend on the palette, so they are taken from the plan
+        for tl in vis_lines.table_lines:
+            if isinstance(tl, self._ServiceLine):
+                if tl is vis_lines.break_line:
+                    yield plan.break_line_text
+                elif isinstance(tl, self._SummaryLine):
+                    yield self._make_summary_line(plan, tl.values)
+                else:
+                    yield self._get_skipped_recs_line(
+                        tbl_plt, plan, vis_lines.n_skipped_lines)
+            else:
+                yield normal_line_fmt(tl)
+
+        yield from self._gen_tail_ch_lines(
+            tbl_plt, normal_line_fmt, border_line, self.footer,
+            self._make_summary_line(plan, vis_lines.summary_values))
+
+    def render_window(
+        self, start, stop, *,
+        palette=None, no_color=None, compound_palette=None, shade_name=None,
+    ) -> [CHText]:
+        """Make lines of the table body for records[start:stop] only.
+
+        To be used by pagers which display a part of a big table. Limits of
+        the table are ignored, any record may be displayed. Widths of the
+        columns are calculated using all the records when the method is called
+        for the first time, so next calls take time proportional to the size
+        of the window. (These widths are not used when the table itself is
+        printed: only visible records are accounted for in this case.)
+
+        Arguments:
+        - start, stop: positions of the records, same meaning as in slices
+        - palette, no_color, compound_palette, shade_name: arguments which identify
+            color palette to be used. Check PPObj.ch_text doc for detailed
+            description of these arguments.
+
+        Returns list of CHText - lines of the records and 'break_by' lines
+        between these records (line preceding the first record is not included).
+        If aggregates of the groups are printed, the line with aggregates of
+        a group follows the last record of the group.
+        """
+        tbl_plt = self._mk_palette(palette, no_color, compound_palette, shade_name)
+        return self._get_unlimited_table()._render_records_lines(start, stop, tbl_plt)
+
+    def append(self, records) -> bool:
+        """Append records to the table.
+
+        To be used by "tail -f"-style monitors. Data prepared for printing is
+        updated using only the new records: widths of columns may increase (but
+        never decrease) if new values do not fit. Lines of the new records can be
+        made with render_appended method.
+
+        Returns True if the table should be re-printed as a whole: widths of
+        the columns have changed or (if the table has limits) some of the lines
+        printed before are not visible any more.
+
+        The records are copied on the first call, so the list of the records
+        the table was created with is not modified.
+        """
+        if self._streaming:
+            raise ValueError("records can't be appended to streaming PPTable")
+        if not self._own_records:
+            self.records = list(self.records)
+            self.r = self.records
+            self._own_records = True
+
+        new_records = list(records)
+        self._appended_start = len(self.records)
+        self._unlimited_table = None
+        self.records.extend(new_records)
+        if self._dflt_footer:
+            self.footer = f"Total {len(self.records)} records"
+
+        vis_lines = self._visible_table_lines
+        if vis_lines is None:
+            # table was not printed yet, lines will be prepared on demand
+            return False
+        if self._get_aggregated_columns():
+            # aggregates of all the records have changed. Lines and widths of
+            # the columns will be re-calculated
+            self._visible_table_lines = None
+            for col in self._ppt_fmt.repr_structure.columns:
+                col.width = None
+            self._reset_render_plans()
+            return True
+        if not isinstance(vis_lines.table_lines, list):
+            vis_lines.table_lines = list(vis_lines.table_lines)
+
+        # prepare new table lines
+        get_break_by_values = RecordField.make_values_getter([
+            col.field for col in self._ppt_fmt.repr_structure.columns if col.break_by])
+        new_lines = []
+        prev_break_by_values = vis_lines.last_break_by_values
+        for rec in new_records:
+            cur_break_by_values = get_break_by_values(rec)
+            if (prev_break_by_values is not None
+                    and prev_break_by_values != cur_break_by_values):
+                new_lines.append(vis_lines.break_line)
+            new_lines.append(rec)
+            prev_break_by_values = cur_break_by_values
+        vis_lines.last_break_by_values = prev_break_by_values
+        vis_lines.n_all_lines += len(new_lines)
+
+        # check if records limits hide some of the lines
+        n_first = self._ppt_fmt.limit_flines
+        n_last = self._ppt_fmt.limit_llines
+        layout_changed = False
+        if (n_first is not None
+            and n_last is not None
+            and vis_lines.n_all_lines > n_first + n_last + 1
+           ):
+            layout_changed = True
+            if vis_lines.n_skipped_lines:
+                # the first lines are already known
+                first_lines = vis_lines.table_lines[:n_first]
+                last_lines = vis_lines.table_lines[n_first + 1:] + new_lines
+            else:
+                # all the lines were visible, some of the new lines may be
+                # among the first lines
+                all_lines = vis_lines.table_lines + new_lines
+                first_lines = all_lines[:n_first]
+                last_lines = all_lines[n_first:]
+            last_lines = last_lines[-n_last:] if n_last else []
+            # widths of the columns are checked using all the visible lines
+            new_lines = first_lines + last_lines
+            vis_lines.n_skipped_lines = len(self.records) - sum(
+                1 if not isinstance(tl, self._ServiceLine) else 0
+                for tlines in (first_lines, last_lines)
+                for tl in tlines)
+            vis_lines.table_lines = (
+                first_lines + [vis_lines.skipped_recs_line] + last_lines)
+            self._ppt_fmt.any_lines_skipped = True
+        else:
+            vis_lines.table_lines.extend(new_lines)
+
+        # update widths of the columns
+        new_visible_records = [
+            tl for tl in new_lines if not isinstance(tl, self._ServiceLine)]
+        widths_changed = False
+        for col in self._ppt_fmt.repr_structure.columns:
+            if col.width < col.max_width:
+                width = col.get_max_cell_text_len(new_visible_records, col.max_width)
+                if width > col.width:
+                    col.width = width
+                    widths_changed = True
+        if widths_changed:
+            # border lines, etc. must be re-created
+            self._reset_render_plans()
+
+        return widths_changed or layout_changed
+
+    def render_appended(
+        self, *,
+        palette=None, no_color=None, compound_palette=None, shade_name=None,
+    ) -> [CHText]:
+        """Make lines of the records added by the last 'append' call.
+
+        Unlike render_window, the 'break_by' line preceding the first new record
+        is included. Check PPObj.ch_text doc for description of the arguments.
+        """
+        if self._appended_start is None:
+            return []
+        tbl_plt = self._mk_palette(palette, no_color, compound_palette, shade_name)
+        return self._render_records_lines(
+            self._appended_start, None, tbl_plt, with_leading_break=True)
+
+    def _render_records_lines(
+        self, start, stop, tbl_plt, with_leading_break=False,
+    ) -> [CHText]:
+        # make lines of table body for records[start:stop]
+        if self._streaming:
+            raise ValueError("render_window is not supported in streaming mode")
+
+        self._init_visible_lines_data()
+        plan = self._get_render_plan(tbl_plt)
+        normal_line_fmt = plan.normal_line_fmt
+        break_line_text = plan.break_line_text
+        # lines with aggregates of the groups follow the last records of the groups
+        group_summary_lines = self._visible_table_lines.group_summary_lines
+
+        get_break_by_values = RecordField.make_values_getter([
+            col.field for col in self._ppt_fmt.repr_structure.columns if col.break_by])
+        lines = []
+        prev_break_by_values = None
+        start = range(len(self.records))[start:stop].start
+        if with_leading_break and start > 0:
+            prev_break_by_values = get_break_by_values(self.records[start - 1])
+        for i, rec in enumerate(self.records[start:stop], start + 1):
+            cur_break_by_values = get_break_by_values(rec)
+            if (prev_break_by_values is not None
+                    and prev_break_by_values != cur_break_by_values):
+                lines.append(break_line_text)
+            lines.append(normal_line_fmt(rec))
+            prev_break_by_values = cur_break_by_values
+            if i in group_summary_lines:
+                lines.append(
+                    self._make_summary_line(plan, group_summary_lines[i].values))
+        return lines
+
+    _EXPORT_FORMATS = ('csv', 'tsv', 'jsonl', 'markdown')
+    _EXPORT_BATCH_SIZE = 10000
+
+    def export(self, fmt, stream, *, batch_size=None):
+        """Write values of the table columns into stream in a plain data format.
+
+        Values are written as is (w/o colors, padding or truncation), widths of
+        the columns are not calculated, limits of the table are ignored.
+        Records are processed in batches, so in streaming mode (check
+        'stream_sample' constructor argument) tables of any size can be
+        exported; the records are fetched from the iterator and the streaming
+        table can't be exported or printed after that.
+
+        Arguments:
+        - fmt: one of
+            - 'csv': comma-separated values, the first line contains columns names
+            - 'tsv': tab-separated values, the first line contains columns names
+            - 'jsonl': JSON Lines, each record is a json object
+                {column_name: value}; values which are not supported by json
+                are converted to str
+            - 'markdown': markdown table
+        - stream: text stream to write to (opened with newline='' for csv and tsv)
+        - batch_size: (optional) number of records written in one batch
+        """
+        if fmt not in self._EXPORT_FORMATS:
+            raise ValueError(
+                f"unsupported export format '{fmt}'. "
+                f"Supported formats: {', '.join(self._EXPORT_FORMATS)}")
+        batch_size = batch_size or self._EXPORT_BATCH_SIZE
+
+        if self._streaming:
+            if self._stream_iter is None:
+                raise ValueError(
+                    "streaming PPTable can be exported only once: "
+                    "records iterator is consumed already")
+            records_iter = itertools.chain(self.records, self._stream_iter)
+            self._stream_iter = None
+        else:
+            records_iter = iter(self.records)
+
+        repr_structure = self._ppt_fmt.repr_structure
+        names = [col.name for col in repr_structure.columns]
+        get_values = repr_structure.make_values_getter()
+
+        def gen_batches():
+            # generate lists of rows; a row is a tuple of plain values
+            while True:
+                batch = list(itertools.islice(records_iter, batch_size))
+                if not batch:
+                    return
+                rows = [
+                    get_values(
+                        rec.record if isinstance(rec, RecordWithTraits) else rec)
+                    for rec in batch]
+                if any(issubclass(t, FieldValueType)
+                       for t in set(map(type, itertools.chain.from_iterable(rows)))):
+                    rows = [tuple(map(self._get_plain_value, row)) for row in rows]
+                yield rows
+
+        if fmt in ('csv', 'tsv'):
+            writer = csv.writer(stream, dialect='excel' if fmt == 'csv' else 'excel-tab')
+            writer.writerow(names)
+            for rows in gen_batches():
+                writer.writerows(rows)
+        elif fmt == 'jsonl':
+            for rows in gen_batches():
+                stream.write("".join(
+                    json.dumps(dict(zip(names, row)), default=str) + "\n"
+                    for row in rows))
+        else:
+            md_cell = lambda value: (
+                "" if value is None
+                else str(value).replace("|", "\\|").replace("\n", " "))
+            stream.write("| " + " | ".join(map(md_cell, names)) + " |\n")
+            stream.write("|" + "---|" * len(names) + "\n")
+            for rows in gen_batches():
+                stream.write("".join(
+                    "| " + " | ".join(map(md_cell, row)) + " |\n" for row in rows))
+
+    _PARALLEL_BLOCK_SIZE = 10000
+
+    def write_parallel(
+        self, filename, *, workers=None, block_size=None,
+        palette=None, no_color=None, compound_palette=None, shade_name=None,
+    ):
+        """Write the table into a file, render records in several processes.
+
+        Intended for very big tables. Widths of columns are calculated in the
+        current process, then the records are split into blocks which are
+        rendered by a pool of worker processes; header and footer are rendered
+        by the current process. All the records are written, limits of the
+        table are ignored.
+
+        Worker processes get the table (and the palette) by forking the current
+        process. If 'fork' start method is not available on the platform, the
+        table is rendered in the current process.
+
+        Arguments:
+        - filename: name of the file to write the table to
+        - workers: number of worker processes (number of CPUs by default)
+        - block_size: (optional) number of records rendered by a worker at once
+        - palette, no_color, compound_palette, shade_name: arguments which identify
+            color palette to be used. Check PPObj.ch_text doc for detailed
+            description of these arguments.
+        """
+        if self._streaming:
+            raise ValueError("write_parallel is not supported in streaming mode")
+        tbl_plt = self._mk_palette(palette, no_color, compound_palette, shade_name)
+        table = self._get_unlimited_table()
+        table._init_visible_lines_data()
+        plan = table._get_render_plan(tbl_plt)
+        normal_line_fmt = plan.normal_line_fmt
+        border_line = plan.border_line
+
+        block_size = block_size or self._PARALLEL_BLOCK_SIZE
+        n_records = len(table.records)
+        blocks = [
+            (start, min(start + block_size, n_records))
+            for start in range(0, n_records, block_size)]
+
+        with open(filename, "w") as f:
+            for line in table._gen_head_ch_lines(tbl_plt, normal_line_fmt, border_line):
+                f.write(f"{line}\n")
+
+            for text in table._gen_rendered_blocks(blocks, tbl_plt, workers):
+                f.write(text)
+
+            for line in table._gen_tail_ch_lines(
+                    tbl_plt, normal_line_fmt, border_line, table.footer,
+                    table._make_summary_line(
+                        plan, table._visible_table_lines.summary_values)):
+                f.write(f"{line}\n")
+
+    def _gen_rendered_blocks(self, blocks, tbl_plt, workers) -> Iterator[str]:
+        # render blocks of records [(start, stop), ] -> generate texts of the blocks
+        import multiprocessing  # pylint: disable=import-outside-toplevel
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if (workers < 2 or len(blocks) < 2
+                or 'fork' not in multiprocessing.get_all_start_methods()):
+            for start, stop in blocks:
+                yield self._render_block_text(start, stop, tbl_plt)
+            return
+
+        # workers are forked, they inherit the table from this process, so only
+        # the positions of the blocks are sent to them
+        job_id = id(self)
+        _PARALLEL_WRITE_JOBS[job_id] = (self, tbl_plt)
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                yield from pool.imap(
+                    _render_table_block,
+                    [(job_id, start, stop) for start, stop in blocks])
+        finally:
+            del _PARALLEL_WRITE_JOBS[job_id]
+
+    def _render_block_text(self, start, stop, tbl_plt) -> str:
+        # text of the table lines for records[start:stop]
+        return "".join(
+            f"{line}\n"
+            for line in self._render_records_lines(
+                start, stop, tbl_plt, with_leading_break=True))
+
+    @staticmethod
+    def _get_plain_value(value):
+        # value of a field -> value to be exported
+        if isinstance(value, FieldValueType):
+            ch_chunks, _ = value.make_desired_cell_ch_chunks(
+                None, value.PALETTE_CLASS(no_color=True), ())
+            return CHText.make(ch_chunks).plain_text()
+        return value
+
+    def _reset_render_plans(self):
+        # discard the plans: format of the table or widths of the columns
+        # have changed
+        self._render_plans = {}
+
+    def _get_render_plan(self, tbl_plt) -> _RenderPlan:
+        # -> objects used to print the table with the palette.
+        # The plan is created once for each palette and is reused while the
+        # format of the table is not changed
+        plan = self._render_plans.get(tbl_plt)
+        if plan is None:
+            # make_record_formatter also calculates actual widths of the columns
+            normal_line_fmt = self.make_record_formatter(palette=tbl_plt)
+            summary_label = self._get_summary_label()
+            plan = self._RenderPlan(
+                normal_line_fmt,
+                normal_line_fmt.line(tbl_plt.text("")),
+                self._make_border_line(tbl_plt),
+                self._make_summary_fmt(normal_line_fmt, tbl_plt),
+                {summary_label[0].name: summary_label[1]} if summary_label else {})
+            self._render_plans[tbl_plt] = plan
+        return plan
+
+    def _make_summary_fmt(self, normal_line_fmt, tbl_plt):
+        # -> PPRecordFmt for lines with aggregates or None if there are no aggregates
+        aggregated_columns = self._get_aggregated_columns()
+        if not aggregated_columns:
+            return None
+        summary_columns = {
+            col.name: (f"{col.name}|", self._get_summary_field_type(col, func))
+            for col, func in aggregated_columns}
+        summary_label = self._get_summary_label()
+        if summary_label:
+            label_col = summary_label[0]
+            summary_columns[label_col.name] = (
+                f"{label_col.name}|", ReprStructure._DFLT_FIELD_TYPE)
+        summary_fmt = normal_line_fmt.make_summary_fmt(**summary_columns)
+        summary_fmt.set_palette(tbl_plt)
+        return summary_fmt
+
+    def _get_summary_label(self):
+        # -> (column, label) - label of the lines with aggregates is printed in
+        # the first visible column which has no aggregate. The label is the
+        # name(s) of the aggregate function(s). None if there is no such column
+        aggregated_columns = self._get_aggregated_columns()
+        if not aggregated_columns:
+            return None
+        for col in self._ppt_fmt.repr_structure.columns:
+            if col.name not in self._aggregates:
+                funcs = dict.fromkeys(func for _col, func in aggregated_columns)
+                return col, "/".join(funcs)
+        return None
+
+    @staticmethod
+    def _make_summary_line(plan, summary_values):
+        # -> line with aggregates (of all the records or of a group) or None
+        if summary_values is None or plan.summary_fmt is None:
+            return None
+        if plan.summary_label:
+            summary_values = {**summary_values, **plan.summary_label}
+        return plan.summary_fmt(summary_values)
+
+    def _get_skipped_recs_line(self, tbl_plt, plan, n_skipped) -> CHText:
+        # -> the line which replaces not visible records
+        # (number of skipped records changes when records are appended)
+        if plan.skipped_recs_line is None or plan.skipped_recs_line[0] != n_skipped:
+            plan.skipped_recs_line = (n_skipped, self._make_skipped_recs_line(
+                tbl_plt, plan.normal_line_fmt, n_skipped))
+        return plan.skipped_recs_line[1]
+
+    def _make_border_line(self, tbl_plt):
+        # -> horizontal border line or None if the style says there is no such line
+        if self._ppt_fmt.style.show_horiz_borders:
+            return self._make_separator_line(tbl_plt)
+        return None
+
+    @staticmethod
+    def _make_skipped_recs_line(tbl_plt, normal_line_fmt, n_skipped) -> CHText:
+        # make the line which replaces not visible records
+        return normal_line_fmt.line(
             [
                 tbl_plt.warn("... "),
-                tbl_plt.text(f"{cur_scheme.n_skipped_lines} records skipped"),
+                tbl_plt.text(f"{n_skipped} records skipped"),
             ]
         )
 
-        # 1. make first border line
-        border_line = None
-        if style.show_horiz_borders:
-            border_line = self._make_separator_line(tbl_plt)
+    def _gen_head_ch_lines(self, tbl_plt, normal_line_fmt, border_line):
+        # generate lines of the table which precede the records
+        style = self._ppt_fmt.style
 
+        # 1. make first border line
         if border_line is not None:
             yield border_line
 
@@ -2747,21 +4545,125 @@ class PPTable(PPObj):
         if (self.header or style.show_column_titles) and border_line is not None:
             yield border_line
 
-        # 5. table contents - actual records and service lines
-        for tl in cur_scheme.table_lines:
-            if isinstance(tl, self._ServiceLine):
-                yield tl.ch_text
-            else:
-                yield normal_line_fmt(tl)
+    def _gen_tail_ch_lines(
+        self, tbl_plt, normal_line_fmt, border_line, footer, summary_line=None,
+    ):
+        # generate lines of the table which follow the records
+        style = self._ppt_fmt.style
 
-        # 6. final border line
+        # 6. line with aggregates of all the records
+        if summary_line is not None:
+            if border_line is not None:
+                yield border_line
+            yield summary_line
+
+        # 7. final border line
         if border_line is not None:
             yield border_line
 
-        # 7. summary line
-        if style.show_summary_line and self.footer:
+        # 8. summary line
+        if style.show_summary_line and footer:
             yield normal_line_fmt.line(
-                tbl_plt.text(self.footer), show_outer_border=False)
+                tbl_plt.text(footer), show_outer_border=False)
+
+    def _gen_stream_ch_lines(self, tbl_plt: Palette) -> Iterator[CHText]:
+        # Implementation of gen_ch_lines in streaming mode: records are fetched from
+        # the iterator while the lines are generated. Only the records which may be
+        # printed at the end of the table are buffered.
+        if self._stream_iter is None:
+            raise ValueError(
+                "streaming PPTable can be printed only once: "
+                "records iterator is consumed already")
+        records_iter = itertools.chain(self.records, self._stream_iter)
+        self._stream_iter = None
+
+        plan = self._get_render_plan(tbl_plt)
+        normal_line_fmt = plan.normal_line_fmt
+        break_line_text = plan.break_line_text
+        border_line = plan.border_line
+
+        yield from self._gen_head_ch_lines(tbl_plt, normal_line_fmt, border_line)
+
+        n_first = self._ppt_fmt.limit_flines
+        n_last = self._ppt_fmt.limit_llines
+        is_limited = n_first is not None and n_last is not None
+        # lines following the n_first visible lines. It's not known yet if these
+        # lines are visible, so they are buffered; one extra line is buffered
+        # because the table shows it instead of the 'records skipped' line
+        tail_lines = deque(maxlen=n_last + 1) if is_limited else None
+
+        break_by_fields = [
+            col.field for col in self._ppt_fmt.repr_structure.columns if col.break_by]
+        get_break_by_values = RecordField.make_values_getter(break_by_fields)
+        aggregated_columns = self._get_aggregated_columns()
+        aggregates = self._StreamAggregates(
+            aggregated_columns, self._group_aggregates and bool(break_by_fields),
+        ) if aggregated_columns else None
+        with_group_lines = aggregates is not None and aggregates.group is not None
+        n_records = 0
+
+        def gen_table_lines():
+            # generate records and service lines of the table
+            nonlocal n_records
+            prev_break_by_values = None
+            several_groups = False
+            for rec in records_iter:
+                n_records += 1
+                cur_break_by_values = get_break_by_values(rec)
+                if (prev_break_by_values is not None
+                        and prev_break_by_values != cur_break_by_values):
+                    several_groups = True
+                    if with_group_lines:
+                        yield self._SummaryLine(None, None, aggregates.finish_group())
+                    yield self._ServiceLine()
+                prev_break_by_values = cur_break_by_values
+                if aggregates is not None:
+                    aggregates.add(rec)
+                yield rec
+            if with_group_lines and several_groups:
+                # aggregates of the last group
+                yield self._SummaryLine(None, None, aggregates.finish_group())
+
+        def render_line(tl):
+            # record or service line -> CHText
+            if isinstance(tl, self._SummaryLine):
+                return self._make_summary_line(plan, tl.values)
+            if isinstance(tl, self._ServiceLine):
+                return break_line_text
+            return normal_line_fmt(tl)
+
+        n_lines = 0
+        n_printed_records = 0
+        for tl in gen_table_lines():
+            n_lines += 1
+            if tail_lines is None or n_lines <= n_first:
+                if not isinstance(tl, self._ServiceLine):
+                    n_printed_records += 1
+                yield render_line(tl)
+            else:
+                tail_lines.append(tl)
+
+        if tail_lines:
+            tail_lines = list(tail_lines)
+            if n_lines > n_first + n_last + 1:
+                tail_lines = tail_lines[-n_last:] if n_last else []
+                n_skipped = n_records - n_printed_records - sum(
+                    1 for tl in tail_lines if not isinstance(tl, self._ServiceLine))
+                yield self._make_skipped_recs_line(tbl_plt, normal_line_fmt, n_skipped)
+            for tl in tail_lines:
+                if not isinstance(tl, self._ServiceLine):
+                    n_printed_records += 1
+                yield render_line(tl)
+
+        self._ppt_fmt.any_lines_skipped = n_printed_records < n_records
+
+        footer = self.footer
+        if footer is None:
+            footer = f"Total {n_records} records"
+        yield from self._gen_tail_ch_lines(
+            tbl_plt, normal_line_fmt, border_line, footer,
+            self._make_summary_line(
+                plan, aggregates.get_summary_values() if aggregates else None))
 
     def _init_visible_lines_data(self):
         # init information about visible columns.
@@ -2779,16 +4681,35 @@ class PPTable(PPObj):
         break_line = self._ServiceLine()
         skipped_recs_line = self._ServiceLine()
         break_by_fields = [col.field for col in columns if col.break_by]
+        get_break_by_values = RecordField.make_values_getter(break_by_fields)
         prev_break_by_values = None
-        for rec in self.records:
-            cur_break_by_values = [
-                field.fetch_value(rec) for field in break_by_fields]
-            if (prev_break_by_values is not None and
-                prev_break_by_values != cur_break_by_values
-            ):
-                table_lines.append(break_line)
-            table_lines.append(rec)
-            prev_break_by_values = cur_break_by_values
+        group_lines = None  # [_SummaryLine, ] - lines with aggregates of groups
+        if self._group_aggregates and break_by_fields and self._get_aggregated_columns():
+            group_lines = []
+        if not break_by_fields and isinstance(self.records, (range, self._RecordsView)):
+            # table of columnar data (check from_columns) or a view of a table,
+            # there is no need to materialize the list of the records
+            table_lines = self.records
+        else:
+            group_start = 0
+            for i, rec in enumerate(self.records):
+                cur_break_by_values = get_break_by_values(rec)
+                if (prev_break_by_values is not None and
+                    prev_break_by_values != cur_break_by_values
+                ):
+                    if group_lines is not None:
+                        group_lines.append(self._SummaryLine(group_start, i))
+                        table_lines.append(group_lines[-1])
+                        group_start = i
+                    table_lines.append(break_line)
+                table_lines.append(rec)
+                prev_break_by_values = cur_break_by_values
+            if group_lines:
+                # aggregates of the last group
+                group_lines.append(self._SummaryLine(group_start, len(self.records)))
+                table_lines.append(group_lines[-1])
+        n_all_lines = len(table_lines)
+        summary_values, columns_values = self._calc_aggregates(group_lines or [])
 
         # check if some records should be hidden because of record numbers limits
         n_first = self._ppt_fmt.limit_flines
@@ -2797,8 +4718,8 @@ class PPTable(PPObj):
             and n_last is not None
             and len(table_lines) > n_first + n_last + 1
            ):
-            first_lines = table_lines[:n_first] if n_first else []
-            last_lines = table_lines[-n_last:] if n_last else []
+            first_lines = list(table_lines[:n_first]) if n_first else []
+            last_lines = list(table_lines[-n_last:]) if n_last else []
             # calculate number of not visible records.
             n_skipped = len(self.records) - sum(
                 1 if not isinstance(tl, self._ServiceLine) else 0
@@ -2811,21 +4732,114 @@ class PPTable(PPObj):
         self._ppt_fmt.any_lines_skipped = n_skipped > 0
 
         self._visible_table_lines = self._TableVisibileLines(
-            table_lines, break_line, skipped_recs_line, n_skipped)
+            table_lines, break_line, skipped_recs_line, n_skipped,
+            n_all_lines, prev_break_by_values, summary_values,
+            {tl.stop: tl for tl in group_lines or []})
 
-    def get_table_width(self) -> int:
-        """Calculate the total width of the table on the screen"""
+        # calculate actual widths of table columns (col.width). If all the
+        # records are visible, the values fetched to calculate aggregates
+        # are reused
+        self._ppt_fmt.detect_actual_columns_widths(
+            table_lines if isinstance(table_lines, (range, self._RecordsView)) else [
+                rec for rec in table_lines if not isinstance(rec, self._ServiceLine)],
+            _account_columns_names=True,
+            columns_values=None if n_skipped else columns_values)
+
+        if summary_values is not None:
+            # values of the aggregates should fit into the columns too
+            summaries = [summary_values]
+            if group_lines:
+                summaries.extend(
+                    tl.values for tl in table_lines if isinstance(tl, self._SummaryLine))
+            for col, func in self._get_aggregated_columns():
+                if col.width < col.max_width:
+                    col.width = max(
+                        col.width,
+                        self._get_summary_field_type(col, func).get_max_cell_text_len(
+                            [values[col.name] for values in summaries],
+                            None, col.max_width))
+            self._fit_width_to_summary_label()
+
+    def _fit_width_to_summary_label(self):
+        # increase width of the column which contains the label of the lines
+        # with aggregates, so that the label fits
+        summary_label = self._get_summary_label()
+        if summary_label:
+            label_col, label = summary_label
+            label_col.width = max(
+                label_col.width, min(label_col.max_width, len(label)))
+
+    def _get_unlimited_table(self) -> 'PPTable':
+        # -> table which prints all the records of self, limits are ignored.
+        # Used when the records are printed regardless of the limits (check
+        # render_window and write_parallel). If some of the records are hidden
+        # by the limits, it's a table with the same records and own copy of
+        # the format, so widths of the columns of self are not affected
         self._init_visible_lines_data()
+        if not self._ppt_fmt.any_lines_skipped:
+            return self
+        if self._unlimited_table is None:
+            self._unlimited_table = PPTable(
+                self.records,
+                fmt_obj=self._ppt_fmt,
+                limits=(None, None),
+                traits=self.traits,
+                aggregates=self._aggregates,
+                group_aggregates=self._group_aggregates)
+        # header and footer may be changed after the table was created
+        self._unlimited_table.header = self.header
+        self._unlimited_table.footer = self.footer
+        return self._unlimited_table
+
+    def _get_aggregated_columns(self) -> list:
+        # -> [(column, aggregate_function_name), ] for visible columns which
+        # have aggregates (check 'aggregates' constructor argument)
+        return [
+            (col, self._aggregates[col.name])
+            for col in self._ppt_fmt.repr_structure.columns
+            if col.name in self._aggregates]
 
+    @staticmethod
+    def _get_summary_field_type(column, func) -> FieldType:
+        # -> FieldType of the value of the aggregate of the column
+        if func in ('count', 'distinct'):
+            return ReprStructure._DFLT_FIELD_TYPE
+        return column.field.field_type
+
+    def _calc_aggregates(self, group_lines):
+        # Calculate aggregates of all the records and of the groups of records.
+        # Returns ({column_name: value}, {column: values}) - aggregates (None
+        # if there are no aggregates) and fetched values of the columns, which
+        # are reused for widths detection. Aggregates of the groups are saved
+        # in group_lines.
+        # Like in case of widths detection, values are processed column-at-a-time
+        aggregated_columns = self._get_aggregated_columns()
+        if not aggregated_columns:
+            return None, None
+        summary_values = {}
+        columns_values = {}
+        records = self._get_plain_records(self.records)
+        for col, func in aggregated_columns:
+            values = col.field.fetch_values(records)
+            columns_values[col] = values
+            summary_values[col.name] = _Aggregate.calc(func, col.name, values)
+            for group_line in group_lines:
+                group_line.values[col.name] = _Aggregate.calc(
+                    func, col.name, values[group_line.start:group_line.stop])
+        return summary_values, columns_values
+
+    def get_table_width(self) -> int:
+        """Calculate the total width of the table on the screen"""
         repr_structure = self._ppt_fmt.repr_structure
 
-        # calculate actual widths of table columns (col.width)
-        self._ppt_fmt.detect_actual_columns_widths(
-            (
-                rec for rec in self._visible_table_lines.table_lines
-                if not isinstance(rec, self._ServiceLine)
-            ),
-            _account_columns_names=True)
+        if self._streaming:
+            # only the sample records are available
+            self._ppt_fmt.detect_actual_columns_widths(
+                self.records, _account_columns_names=True)
+            self._fit_width_to_summary_label()
+        else:
+            # widths of columns are calculated together with visible lines data
+            self._init_visible_lines_data()
 
         return (
             sum(col.width for col in repr_structure.columns)
@@ -2860,6 +4874,19 @@ class PPTable(PPObj):
         return cp.border("".join(line_chunks))
 
 
+# {job_id: (table, tbl_plt)} - tables being rendered by PPTable.write_parallel.
+# Worker processes inherit this dictionary when they are forked.
+_PARALLEL_WRITE_JOBS = {}
+
+
+def _render_table_block(args):
+    # part of the PPTable.write_parallel; executed in worker process
+    # (job_id, start, stop) -> text of the table lines for records[start:stop]
+    job_id, start, stop = args
+    table, tbl_plt = _PARALLEL_WRITE_JOBS[job_id]
+    return table._render_block_text(start, stop, tbl_plt)
+
+
 class _PPTableParsedFmt:
     # parser of fmt - string representing PPTable format
 
@@ -2875,11 +4902,17 @@ class _PPTableParsedFmt:
         # fmt is "visible_columns ; visible_records ; table_width"
         fmt_s_cols, fmt_s_lines, _fmt_s_twidths = self._fmt_str_split(fmt)
 
-        self.cols_parsed_fmt = _ColumnsParsedFmt(fmt_s_cols)
+        self.cols_parsed_fmt = _ColumnsParsedFmt.parse(fmt_s_cols)
 
         self.vis_lines = self._parse_vis_lines_fmt(fmt_s_lines)
         self.table_width = None  # not implememnted
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def parse(fmt) -> '_PPTableParsedFmt':
+        """Cached constructor. The parsed fmt objects are never modified."""
+        return _PPTableParsedFmt(fmt)
+
     @staticmethod
     def _fmt_str_split(fmt_str):
         # constructor helper: split 'fmt' string into 3 sections
@@ -3002,12 +5035,15 @@ class PPTableFormat:
             self.repr_structure.clone(), self.style,
             self.limit_flines, self.limit_llines)
 
-    def detect_actual_columns_widths(self, records, *, _account_columns_names=False):
+    def detect_actual_columns_widths(
+        self, records, *, _account_columns_names=False, columns_values=None,
+    ):
         """Calculate actual columns widths based of provided records."""
         if not self.repr_structure.col_widths_finalized():
             self.repr_structure.detect_actual_columns_widths(
                     records,
-                    _account_columns_names=_account_columns_names)
+                    _account_columns_names=_account_columns_names,
+                    columns_values=columns_values)
 
     def remove_columns(self, columns_names):
         """Remove columns from table."""
@@ -3035,7 +5071,7 @@ class PPTableFormat:
         if fmt is None:
             fmt = ""
         assert isinstance(fmt, str), f"{type(fmt)}: {fmt}"
-        return _PPTableParsedFmt(fmt)
+        return _PPTableParsedFmt.parse(fmt)
 
     def _set_parsed_fmt(self, parsed_fmt, other=None):
         # Set new format.
@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+"""Remove color escape sequences from a file (for example colored log file)."""
+
+import argparse
+from ak.color import strip_colors_file
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Copy file removing color escape sequences from it")
+    parser.add_argument("src", help="file with color sequences")
+    parser.add_argument("dst", help="name of the result file")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="number of worker processes (default: process file in a single process)")
+    parser.add_argument(
+        "--block-size", type=int, default=16,
+        help="size of blocks the file is processed by, MB (default: 16)")
+    args = parser.parse_args()
+
+    strip_colors_file(
+        args.src, args.dst,
+        block_size=args.block_size * 1024 * 1024, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,6 @@ setup(
     author_email="akorshkov@gmail.com",
     description="Some python modules I use in my projects",
     packages=['ak'],
-    scripts=['bin/colors_demo.py'],
+    scripts=['bin/colors_demo.py', 'bin/strip_colors.py'],
     python_requires=">=3.6",
 )
@@ -0,0 +1,131 @@
+"""Benchmarks of ak.color module.
+
+Usage:
+    python -m tests.bench_color [-k FILTER] [--save FILE] [--compare FILE]
+
+Check tests/bench_tools.py for description of the options and results.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from ak.color import (
+    CHText, ColorFmt, ColorsConfig, Palette, ConfColor, set_display_width_mode)
+from tests import bench_tools
+
+
+class _BenchPalette(Palette):
+    SYNTAX_DEFAULTS = {
+        'B_NORM': "GREEN",
+        'B_CONN_ERR': "underline=CURL(RED)",
+        'B_CONN_DEL': "crossed",
+    }
+
+    norm = ConfColor('B_NORM')
+    conn_err = ConfColor('B_CONN_ERR')
+    conn_del = ConfColor('B_CONN_DEL')
+
+
+_RED = ColorFmt("RED")
+_GREEN = ColorFmt("GREEN", bold=True)
+_PLAIN = ColorFmt.get_plaintext_fmt()
+
+# typical line of a table: short chunks of different colors
+_LINE_CHUNKS = [
+    fmt(text)
+    for _ in range(10)
+    for fmt, text in ((_RED, "|"), (_PLAIN, " "), (_GREEN, "some value"), (_PLAIN, " "))
+]
+_LINE = CHText(*_LINE_CHUNKS)
+
+# chunks which can be merged: adjacent chunks of the same color
+_MERGEABLE_CHUNKS = [
+    fmt(text)
+    for _ in range(20)
+    for fmt, text in ((_RED, "ab"), (_RED, "cd"), (_PLAIN, "ef"), (_PLAIN, "gh"))
+]
+
+_LARGE_COLORED_STR = "\n".join(str(_LINE) for _ in range(10000))
+
+# same line, but with wide characters
+_WIDE_LINE_CHUNKS = [
+    fmt(text)
+    for _ in range(10)
+    for fmt, text in ((_RED, "|"), (_PLAIN, " "), (_GREEN, "値 日本語"), (_PLAIN, " "))
+]
+set_display_width_mode(True)
+_WIDE_LINE = CHText(*_WIDE_LINE_CHUNKS)
+set_display_width_mode(False)
+
+
+def _mk_threaded_get_color_bench(n_threads, n_calls=1000):
+    # make benchmark of Palette.get_color called concurrently from several threads
+    colors_conf = ColorsConfig()
+    connotations = [(), ('conn_err', ), ('conn_del', 'conn_err')]
+
+    def worker(_thread_id):
+        plt = _BenchPalette(colors_conf=colors_conf)
+        for i in range(n_calls):
+            plt.get_color('norm', *connotations[i % 3])("text")
+
+    def bench():
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            list(pool.map(worker, range(n_threads)))
+
+    return bench
+
+
+def _bench_iadd():
+    t = CHText()
+    for chunk in _LINE_CHUNKS:
+        t += chunk
+
+
+def _in_display_width_mode(func):
+    # make benchmark which calls func in display-width mode
+    def bench():
+        set_display_width_mode(True)
+        try:
+            return func()
+        finally:
+            set_display_width_mode(False)
+    return bench
+
+
+def _bench_get_color_connotations():
+    plt = _BenchPalette()
+    plt.get_color('norm', 'conn_err')
+    plt.get_color('norm', 'conn_del', 'conn_err')
+
+
+BENCHMARKS = [
+    ("CHText construction", lambda: CHText(*_LINE_CHUNKS)),
+    ("CHText.make", lambda: CHText.make(_LINE_CHUNKS)),
+    ("CHText +=", _bench_iadd),
+    ("CHText join", lambda: _PLAIN(" ").join(_LINE_CHUNKS)),
+    ("CHText slicing", lambda: _LINE[5:75]),
+    ("CHText fixed_len", lambda: _LINE.fixed_len(100)),
+    ("CHText __format__", lambda: f"{_LINE:^200}"),
+    ("CHText str (fresh object)", lambda: str(CHText.make(_LINE_CHUNKS))),
+    ("CHText.make, display-width mode, ASCII",
+     _in_display_width_mode(lambda: CHText.make(_LINE_CHUNKS))),
+    ("CHText.make, display-width mode, CJK",
+     _in_display_width_mode(lambda: CHText.make(_WIDE_LINE_CHUNKS))),
+    ("CHText slicing, display-width mode, ASCII",
+     _in_display_width_mode(lambda: _LINE[5:75])),
+    ("CHText slicing, display-width mode, CJK",
+     _in_display_width_mode(lambda: _WIDE_LINE[5:75])),
+    ("CHText._merge_chunks", lambda: CHText._merge_chunks(_MERGEABLE_CHUNKS)),
+    ("ColorFmt.__call__", lambda: _GREEN("some text")),
+    ("Palette.get_color with connotations", _bench_get_color_connotations),
+    ("Palette.get_color, 4 threads", _mk_threaded_get_color_bench(4)),
+    ("CHText.strip_colors, large text", lambda: CHText.strip_colors(_LARGE_COLORED_STR)),
+]
+
+
+def main():
+    return bench_tools.main(BENCHMARKS, description="Benchmarks of ak.color module")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Benchmarks of ak.ppobj module.
+
+Usage:
+    python -m tests.bench_ppobj [-k FILTER] [--save FILE] [--compare FILE]
+
+Check tests/bench_tools.py for description of the options and results.
+"""
+
+import io
+import sys
+import json
+
+from ak.ppobj import PPTable, PPStdFormatter, RecordWithTraits
+
+from tests import bench_tools
+
+
+_N_ROWS = 1_000_000
+
+# big table: int, str and float columns
+_BIG_RECORDS = [(i, f"name_{i % 1000}", i / 7) for i in range(_N_ROWS)]
+_BIG_FIELDS = ['id', 'name', 'value']
+
+
+# same data in columns
+_BIG_COLUMNS = {
+    name: [rec[i] for rec in _BIG_RECORDS] for i, name in enumerate(_BIG_FIELDS)}
+
+
+# typical API response (json is about 1MB; the time is proportional to the size)
+_API_RESPONSE = {
+    'items': [
+        {
+            'id': i,
+            'name': f"item {i}",
+            'active': i % 3 == 0,
+            'tags': ["a", "b", "c"],
+            'owner': {'id': i % 100, 'name': f"user {i % 100}", 'roles': ["admin"]},
+            'history': [{'ts': 1700000000 + j, 'state': "ok"} for j in range(3)],
+        }
+        for i in range(3000)
+    ],
+    'total': 3000,
+}
+
+# 10k-deep nesting
+_DEEP_OBJ = []
+for _i in range(10000):
+    _DEEP_OBJ = [_DEEP_OBJ] if _i % 2 else {'k': [_DEEP_OBJ, _i]}
+
+_PP = PPStdFormatter()
+
+# huge list printed with limits; the time should not depend on the list size
+_HUGE_LIST = [{'id': i, 'name': f"item {i}"} for i in range(500_000)]
+_PP_LIMITED = PPStdFormatter(max_items=100)
+
+
+def _bench_pp(obj):
+    # make benchmark of generation of pretty-printed lines of the object
+    def bench():
+        for _line in _PP(obj, no_color=True):
+            pass
+    return bench
+
+
+_API_RESPONSE_JSON = json.dumps(_API_RESPONSE)
+
+
+def _bench_pp_limited():
+    for _line in _PP_LIMITED(_HUGE_LIST, no_color=True):
+        pass
+
+
+def _bench_pp_stream():
+    for _line in _PP.format_stream(io.StringIO(_API_RESPONSE_JSON), no_color=True):
+        pass
+
+
+_SMALL_RECORDS = _BIG_RECORDS[:5]
+
+# 10k records; every other record has traits
+_N_TRAITS_ROWS = 10000
+_PLAIN_RECORDS = _BIG_RECORDS[:_N_TRAITS_ROWS]
+_RECORDS_WITH_TRAITS = [
+    RecordWithTraits(
+        rec,
+        record_traits="conn_deleted" if i % 2 else None,
+        fields_traits={'value': "conn_err"} if i % 4 == 1 else None)
+    for i, rec in enumerate(_PLAIN_RECORDS)]
+
+
+def _mk_render_table_bench(records, traits=None):
+    # make benchmark of rendering of all lines of a table
+    def bench():
+        table = PPTable(records, fields=_BIG_FIELDS, limits=(None, None), traits=traits)
+        for _line in table.ch_text():
+            pass
+    return bench
+
+
+# interactive re-slicing of a big table: only a part of the records is printed
+_BIG_TABLE = PPTable(_BIG_RECORDS, fields=_BIG_FIELDS, limits=(30, 20))
+
+
+def _bench_sort_filter_view():
+    str(_BIG_TABLE.where(lambda rec: rec[0] % 3).sorted_by('name'))
+
+
+def _bench_sort_filter_new_table():
+    # the same result without views, for comparison
+    records = sorted(
+        (rec for rec in _BIG_RECORDS if rec[0] % 3), key=lambda rec: rec[1])
+    str(PPTable(records, fields=_BIG_FIELDS, limits=(30, 20)))
+
+
+def _bench_aggregates():
+    str(PPTable(
+        _BIG_RECORDS, fields=_BIG_FIELDS, limits=(30, 20),
+        aggregates={'id': 'count', 'name': 'distinct', 'value': 'sum'}))
+
+
+def _bench_caller_totals():
+    # the same totals calculated by the caller, for comparison
+    str(PPTable(_BIG_RECORDS, fields=_BIG_FIELDS, limits=(30, 20)))
+    return (
+        sum(1 for rec in _BIG_RECORDS if rec[0] is not None),
+        len({rec[1] for rec in _BIG_RECORDS}),
+        sum(rec[2] for rec in _BIG_RECORDS))
+
+
+def _bench_small_table():
+    # reports build many small tables with the same fmt
+    PPTable(_SMALL_RECORDS, fields=_BIG_FIELDS, fmt="id:5, name, value:3-10")
+
+
+def _mk_structure():
+    # -> ReprStructure of a new table with the big records
+    return PPTable(_BIG_RECORDS, fields=_BIG_FIELDS).fmt.repr_structure
+
+
+def _bench_bulk_widths():
+    _mk_structure().detect_actual_columns_widths(_BIG_RECORDS)
+
+
+def _bench_per_record_widths():
+    # the same calculation performed record by record, for comparison
+    rs = _mk_structure()
+    for col in rs.columns:
+        col.width = col.min_width
+    for record in _BIG_RECORDS:
+        for col in rs.columns:
+            col.width = max(col.width, col.get_cell_text_len(record))
+
+
+def _bench_bulk_widths_limited():
+    # values are wide; the detection stops after the first block
+    rs = _mk_structure()
+    for col in rs.columns:
+        col.max_width = 5
+    rs.detect_actual_columns_widths(_BIG_RECORDS)
+
+
+def _bench_columnar_table_widths():
+    PPTable.from_columns(_BIG_COLUMNS).get_table_width()
+
+
+BENCHMARKS = [
+    ("columns widths 1M rows, column-at-a-time", _bench_bulk_widths),
+    ("columns widths 1M rows, record-by-record", _bench_per_record_widths),
+    ("columns widths 1M rows, max_width reached", _bench_bulk_widths_limited),
+    ("columns widths 1M rows, table from columns", _bench_columnar_table_widths),
+    ("small table construction, same fmt", _bench_small_table),
+    ("render 10k rows", _mk_render_table_bench(_PLAIN_RECORDS)),
+    ("render 10k rows with traits", _mk_render_table_bench(_RECORDS_WITH_TRAITS)),
+    ("render 10k rows, table traits",
+     _mk_render_table_bench(_PLAIN_RECORDS, traits=["conn_note"])),
+    ("filter and sort 1M rows table, view", _bench_sort_filter_view),
+    ("filter and sort 1M rows table, new table", _bench_sort_filter_new_table),
+    ("aggregates of 1M rows table", _bench_aggregates),
+    ("aggregates of 1M rows table, calculated by caller", _bench_caller_totals),
+    ("pp API response", _bench_pp(_API_RESPONSE)),
+    ("pp 10k-deep nesting", _bench_pp(_DEEP_OBJ)),
+    ("pp API response, streamed from json text", _bench_pp_stream),
+    ("pp 500k-items list, max_items=100", _bench_pp_limited),
+]
+
+
+def main():
+    return bench_tools.main(BENCHMARKS, description="Benchmarks of ak.ppobj module")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
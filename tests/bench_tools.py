@@ -0,0 +1,172 @@
+"""Tools for benchmarks of ak modules (tests/bench_*.py).
+
+Each benchmark is a callable w/o arguments which performs the operation to be
+measured. The benchmark is executed many times; the results contain:
+- ops_per_sec: number of calls per second
+- peak_bytes: peak memory allocated during a single call (measured with tracemalloc)
+- retained_bytes: memory allocated by a single call and not released after it
+
+Results can be saved into json file and later used as a baseline to find
+regressions:
+
+    python -m tests.bench_color --save baseline.json
+    ... modify the code ...
+    python -m tests.bench_color --compare baseline.json
+"""
+
+import json
+import time
+import argparse
+import tracemalloc
+from dataclasses import dataclass, asdict
+
+
+@dataclass
+class BenchResult:
+    """Results of a single benchmark."""
+    name: str
+    ops_per_sec: float
+    peak_bytes: float
+    retained_bytes: float
+
+
+def measure(name, func, *, min_time=0.2, repeat=3) -> BenchResult:
+    """Run the benchmark function and return measured results.
+
+    Arguments:
+    - name: name of the benchmark
+    - func: callable w/o arguments - the operation to be measured
+    - min_time: minimal duration (in seconds) of a single series of calls
+    - repeat: number of series; the best series is reported
+    """
+    # find out number of calls in a single series
+    n_calls = 1
+    while True:
+        duration = _time_calls(func, n_calls)
+        if duration >= min_time:
+            break
+        if duration <= 0:
+            n_calls *= 10
+        else:
+            n_calls = max(n_calls + 1, int(n_calls * min_time * 1.2 / duration))
+
+    best_duration = duration
+    for _ in range(repeat - 1):
+        best_duration = min(best_duration, _time_calls(func, n_calls))
+
+    # memory allocations. Number of calls is limited because tracemalloc
+    # slows down the execution significantly
+    n_mem_calls = min(n_calls, 1000)
+    peak_total = 0
+    retained_total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(n_mem_calls):
+            size_before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            size_after, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - size_before
+            retained_total += size_after - size_before
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=name,
+        ops_per_sec=n_calls / best_duration,
+        peak_bytes=peak_total / n_mem_calls,
+        retained_bytes=retained_total / n_mem_calls,
+    )
+
+
+def _time_calls(func, n_calls):
+    # -> duration of n_calls calls of the function
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        func()
+    return time.perf_counter() - start
+
+
+def save_baseline(results, filename):
+    """Save list of BenchResult objects into json file."""
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({r.name: asdict(r) for r in results}, f, indent=1)
+
+
+def load_baseline(filename) -> dict:
+    """Load results saved by save_baseline. -> {name: BenchResult}"""
+    with open(filename, encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: BenchResult(**item) for name, item in data.items()}
+
+
+def format_results(results, baseline=None, threshold=0.2) -> [str]:
+    """Make lines of the report.
+
+    If the baseline is specified, the changes relative to the baseline are
+    reported. Slowdowns greater than threshold are marked as regressions.
+    """
+    lines = []
+    name_width = max([len(r.name) for r in results] + [10])
+    lines.append(
+        f"{'benchmark':{name_width}} {'ops/sec':>14} {'peak B':>10} {'retained B':>10}")
+    for r in results:
+        line = (
+            f"{r.name:{name_width}} {_fmt_ops(r.ops_per_sec):>14} "
+            f"{r.peak_bytes:10,.0f} {r.retained_bytes:10,.0f}")
+        base = (baseline or {}).get(r.name)
+        if base is not None and base.ops_per_sec > 0:
+            change = r.ops_per_sec / base.ops_per_sec - 1.0
+            line += f" {change:+8.1%}"
+            if change < -threshold:
+                line += " REGRESSION"
+        lines.append(line)
+    return lines
+
+
+def _fmt_ops(ops_per_sec):
+    # slow benchmarks (big tables) need fractional part
+    if ops_per_sec < 100:
+        return f"{ops_per_sec:.3f}"
+    return f"{ops_per_sec:,.0f}"
+
+
+def main(benchmarks, description=None, argv=None) -> int:
+    """Run the benchmarks with command line options.
+
+    Arguments:
+    - benchmarks: list of (name, callable) pairs
+    - description: description of the benchmarks for the help message
+    - argv: command line arguments (sys.argv[1:] by default)
+
+    Returns process exit code: 1 if regressions were detected, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "-k", "--filter", help="run only benchmarks which names contain this string")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2,
+        help="minimal duration of a series of calls, seconds (default 0.2)")
+    parser.add_argument("--save", metavar="FILE", help="save results into json file")
+    parser.add_argument(
+        "--compare", metavar="FILE", help="compare results with saved baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="slowdown which is reported as regression (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    results = []
+    for name, func in benchmarks:
+        if args.filter and args.filter not in name:
+            continue
+        results.append(measure(name, func, min_time=args.min_time))
+
+    lines = format_results(results, baseline, args.threshold)
+    print("\n".join(lines))
+
+    if args.save:
+        save_baseline(results, args.save)
+
+    return 1 if any(line.endswith("REGRESSION") for line in lines) else 0
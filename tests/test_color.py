@@ -1,6 +1,11 @@
 """Test ColorFmt and ColorTest"""
 
+import os
+import sys
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 import ak.color
 from ak.color import (
@@ -504,6 +509,145 @@ class TestCHTextProperties(unittest.TestCase):
         stripped_colored_str = CHText.strip_colors(colored_str)
         self.assertEqual(plain_str, stripped_colored_str)
 
+    def test_render_cache(self):
+        """Test rendered string is cached and the cache is reset on modification."""
+        t = self._mk_chtext('GREEN', 'Green') + " text"
+
+        CHText.reset_render_cache_stats()
+        s = str(t)
+        self.assertEqual(s, str(t))
+        self.assertEqual(f"{s}   ", f"{t:13}")
+        self.assertEqual({'hits': 2, 'misses': 1}, CHText.get_render_cache_stats())
+
+        # modification of the object resets cached values
+        plain = t.plain_text()
+        t += self._mk_chtext('RED', 'Red')
+        self.assertEqual(plain + "Red", t.plain_text())
+        self.assertEqual(s + str(ColorFmt('RED')('Red')), str(t))
+
+        t += " more"
+        self.assertEqual(plain + "Red more", t.plain_text())
+
+        CHText.reset_render_cache_stats()
+        self.assertEqual({'hits': 0, 'misses': 0}, CHText.get_render_cache_stats())
+
+    def test_from_ansi(self):
+        """Test construction of CHText from a string with color sequences."""
+        color_text = (
+            self._mk_chtext('GREEN', 'Green') + " plain "
+            + self._mk_chtext('RED', 'Red') + self._mk_chtext('RED', 'Red'))
+
+        restored = CHText.from_ansi(str(color_text))
+        self.assertEqual(color_text, restored)
+        self.assertEqual(len(color_text), len(restored))
+        self.assertEqual(str(color_text), str(restored))
+
+        # restored text can be formatted and truncated as usual
+        self.assertEqual("Green pl", restored.fixed_len(8).plain_text())
+        self.assertEqual(
+            f"{color_text:_^30}", f"{restored:_^30}")
+
+        # plain text and empty text
+        self.assertEqual("plain", CHText.from_ansi("plain"))
+        self.assertEqual(CHText(), CHText.from_ansi(""))
+
+        # not standard sequences: opening sequences are accumulated,
+        # short reset sequence is recognized
+        t = CHText.from_ansi("\033[1m\033[32mbold green\033[m text")
+        self.assertEqual(2, len(t.chunks))
+        self.assertEqual("\033[1m\033[32m", t.chunks[0].c_prefix)
+        self.assertEqual("bold green", t.chunks[0].text)
+        self.assertEqual(" text", t.chunks[1])
+
+    def test_iter_from_ansi(self):
+        """Test line-by-line construction of CHText objects."""
+        green = ColorFmt('GREEN')
+        lines = [
+            str(green("first")) + " line\n",
+            # color sequence is not closed in this line
+            "\033[31mred on two\r\n",
+            "lines\033[0m and plain text",
+        ]
+
+        result = list(CHText.iter_from_ansi(lines))
+        self.assertEqual(3, len(result))
+        self.assertEqual(CHText(green("first"), " line"), result[0])
+        self.assertEqual(ColorFmt('RED')("red on two"), result[1])
+        self.assertEqual(
+            CHText(ColorFmt('RED')("lines"), " and plain text"), result[2])
+
+
+class TestDisplayWidthMode(unittest.TestCase):
+    """Test CHText in display-width mode."""
+
+    def setUp(self):
+        ak.color.set_display_width_mode(True)
+
+    def tearDown(self):
+        ak.color.set_display_width_mode(False)
+
+    def test_text_width(self):
+        """Test width of texts with wide and zero-width characters."""
+        self.assertTrue(ak.color.get_display_width_mode())
+        text_width = ak.color.text_width
+        self.assertEqual(5, text_width("hello"))
+        self.assertEqual(6, text_width("日本語"))
+        self.assertEqual(4, text_width("ab日"))
+        self.assertEqual(1, text_width("e\u0301"))  # e + combining acute accent
+        self.assertEqual(2, text_width("\U0001F600"))  # emoji
+        self.assertEqual(3, text_width("\U000E0001abc"))  # tag character
+
+        ak.color.set_display_width_mode(False)
+        self.assertFalse(ak.color.get_display_width_mode())
+        self.assertEqual(3, ak.color.text_width("日本語"))
+
+    def test_chtext_len(self):
+        """Length and formatting of CHText with wide characters."""
+        red = ColorFmt("RED")
+        t = red("日本") + "ab"
+        self.assertEqual(6, len(t))
+        self.assertEqual(4, len(red("日本")))
+        self.assertEqual(6, len(CHText.make([red("日本"), ColorFmt("BLUE")("ab")])))
+
+        self.assertEqual(f"{t:8}", str(t) + "  ")
+        self.assertEqual(f"{t:>7}", " " + str(t))
+
+    def test_slicing(self):
+        """Slicing uses positions on screen."""
+        red = ColorFmt("RED")
+        blue = ColorFmt("BLUE")
+        t = red("日本") + blue("語x")
+        self.assertEqual(red("日"), t[:2])
+        self.assertEqual(red("日本") + blue("語"), t[:6])
+        self.assertEqual(blue("語x"), t[4:])
+        self.assertEqual(blue("x"), t[-1:])
+        self.assertEqual(red("本"), t[2])
+        # wide character which does not fit entirely is not included
+        self.assertEqual(red("日"), t[:3])
+
+    def test_fixed_len(self):
+        """fixed_len produces text of exact width."""
+        red = ColorFmt("RED")
+        t = CHText(red("日本語"))
+        for width in range(8):
+            self.assertEqual(width, len(t.fixed_len(width)), f"{width=}")
+            self.assertEqual(
+                width, ak.color.text_width(t.fixed_len(width).plain_text()),
+                f"{width=}")
+            self.assertEqual(width, len(red("日本語").fixed_len(width)), f"{width=}")
+        self.assertEqual("日 ", t.fixed_len(3).plain_text())
+
+    def test_resize_chunks_list(self):
+        """Resize list of chunks containing wide characters."""
+        red = ColorFmt("RED")
+        chunks = [red("ab"), ColorFmt("BLUE")("日本")]
+        for width in range(9):
+            resized = CHText.resize_chunks_list(chunks, width)
+            self.assertEqual(width, CHText.calc_chunks_len(resized), f"{width=}")
+            self.assertEqual(
+                width, ak.color.text_width("".join(c.text for c in resized)),
+                f"{width=}")
+
 
 class TestCHTextChunkProperties(unittest.TestCase):
     """Test CHText.Chunk.
@@ -703,6 +847,72 @@ class TestColorFmtBytes(unittest.TestCase):
             green_printer_b("string_text")
 
 
+class TestStripColorsFile(unittest.TestCase):
+    """Test removing color sequences from files."""
+
+    def _mk_colored_lines(self, n_lines):
+        # -> (colored lines, plain lines)
+        red = ColorFmt("RED")
+        fancy = ColorFmt((1, 2, 3), bg_color="g4", underline=("CURL", "RED"))
+        colored, plain = [], []
+        for i in range(n_lines):
+            t = red(f"line {i}:") + " " + fancy("x" * (i % 7)) + " end"
+            colored.append(str(t))
+            plain.append(t.plain_text())
+        return colored, plain
+
+    def test_strip_colors_bytes(self):
+        """Test stripping of bytes."""
+        colored, plain = self._mk_colored_lines(20)
+        self.assertEqual(
+            ak.color.strip_colors_bytes("\n".join(colored).encode()),
+            "\n".join(plain).encode())
+
+    def test_strip_colors_file(self):
+        """Test stripping the file processing it by small blocks."""
+        colored, plain = self._mk_colored_lines(500)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = os.path.join(tmp_dir, "colored.log")
+            dst = os.path.join(tmp_dir, "plain.log")
+
+            for trailing_newline in ("\n", ""):
+                with open(src, "w") as f:
+                    f.write("\n".join(colored) + trailing_newline)
+                expected = "\n".join(plain) + trailing_newline
+
+                for block_size, workers in [
+                    (1024 * 1024, None), (1, None), (100, None), (100, 3),
+                ]:
+                    ak.color.strip_colors_file(
+                        src, dst, block_size=block_size, workers=workers)
+                    with open(dst) as f:
+                        self.assertEqual(
+                            expected, f.read(), f"{block_size=}, {workers=}")
+
+    def test_strip_colors_empty_file(self):
+        """Empty file is processed correctly."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = os.path.join(tmp_dir, "colored.log")
+            dst = os.path.join(tmp_dir, "plain.log")
+            open(src, "w").close()
+            ak.color.strip_colors_file(src, dst)
+            with open(dst, "rb") as f:
+                self.assertEqual(b"", f.read())
+
+    def test_strip_colors_same_file(self):
+        """Source file can't be stripped in place."""
+        colored, _plain = self._mk_colored_lines(5)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = os.path.join(tmp_dir, "colored.log")
+            with open(src, "w") as f:
+                f.write("\n".join(colored))
+            with self.assertRaises(ValueError):
+                ak.color.strip_colors_file(src, os.path.join(tmp_dir, ".", "colored.log"))
+            # the file is not damaged
+            with open(src) as f:
+                self.assertEqual("\n".join(colored), f.read())
+
+
 #########################
 # Test Palette and ColorsConfig functionality
 
@@ -1146,6 +1356,71 @@ class TestColorsConfigAndGlobalPalette(_BaseColorFmtTestCase):
         self.assertIn('<NOT RESOLVED>', lines_by_synt_id['SYNT_3'])
         self.assertIn('<NOT RESOLVED>', lines_by_synt_id['SYNT_4'])
 
+    def test_config_snapshot(self):
+        """Test ColorsConfig can be saved and restored w/o parsing."""
+        colors_conf = self.TstColorsConfig({
+            "NAME": "TABLE.BORDER:155",
+            "TEXT": "(4,1,1):blink",
+            "SHADE": "TEXT:g4/g5:no_blink,underline=CURL(1,1,5)",
+            "BROKEN": "SYNT_X",
+        })
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "colors.json")
+            colors_conf.dump_snapshot(filename)
+            restored_conf = self.TstColorsConfig.load_snapshot(filename)
+
+        self.assertEqual(colors_conf.syntax_map.keys(), restored_conf.syntax_map.keys())
+        self.assertEqual(colors_conf.make_report(), restored_conf.make_report())
+        sample_text = "test"
+        for synt_id in colors_conf.syntax_map:
+            self.assertEqual(
+                str(colors_conf.get_color(synt_id)(sample_text)),
+                str(restored_conf.get_color(synt_id)(sample_text)),
+                f"{synt_id=}")
+        shade = restored_conf.syntax_map["SHADE"]
+        self.assertEqual(shade.modifiers["underline"], ("CURL", (1, 1, 5)))
+        self.assertIsNone(restored_conf.syntax_map["BROKEN"].color_fmt)
+
+        # palette created with restored config works as usual
+        plt = restored_conf.get_palette()
+        self.assertEqual(
+            str(plt.get_color("SHADE")(sample_text)),
+            str(colors_conf.get_color("SHADE")(sample_text)))
+
+    def test_config_snapshot_no_parsing(self):
+        """Resolved items of the snapshot are restored w/o parsing."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "colors.json")
+            self.TstColorsConfig({"NAME": "BLUE:bold"}).dump_snapshot(filename)
+
+            orig_parse = ak.color._ColorConfColorDescr._parse_init_str
+            with mock.patch.object(
+                ak.color._ColorConfColorDescr, '_parse_init_str',
+                side_effect=orig_parse,
+            ) as parse_mock:
+                restored_conf = self.TstColorsConfig.load_snapshot(filename)
+
+        # only the not resolved "TEXT": "" item had to be parsed
+        self.assertIsNone(restored_conf.syntax_map["TEXT"].color_fmt)
+        self.assertEqual(
+            [c.args for c in parse_mock.call_args_list], [("", )])
+        self.assertEqual(
+            str(restored_conf.get_color("NAME")("x")),
+            str(ColorFmt("BLUE", bold=True)("x")))
+
+    def test_init_str_parsing_memoized(self):
+        """Same color description strings are not parsed twice."""
+        parse = ak.color._ColorConfColorDescr._parse_init_str
+        self.TstColorsConfig({"NAME": "YELLOW/g3:crossed,no_bold"})
+        hits_before = parse.cache_info().hits
+        conf = self.TstColorsConfig({"NAME": "YELLOW/g3:crossed,no_bold"})
+        self.assertGreater(parse.cache_info().hits, hits_before)
+        # modifiers of the syntax are not shared with parsing cache
+        conf.syntax_map["NAME"].modifiers["bold"] = True
+        self.assertEqual(
+            parse("YELLOW/g3:crossed,no_bold")[3], {"crossed": True, "bold": False})
+
     def test_register_palette_user(self):
         """Data from palette user makes it possible to resolve color rules"""
         class MyMinorColorsConfig(ColorsConfig):
@@ -1797,3 +2072,108 @@ class TestPaletteConnotations(_BaseColorFmtTestCase):
             'another_not_existing', p.conn_err, 'yet_one_more_bad')
 
         self._verify_formatters_similar(alt_err_fmt0, alt_err_fmt1)
+
+
+class TestPalettesThreadSafety(unittest.TestCase):
+    """Test palettes and configs can be used from several threads."""
+
+    class MyPalette(Palette):
+        SYNTAX_DEFAULTS = {
+            'T_NORM': "GREEN",
+            'T_ALT': "YELLOW:underline",
+            'T_CONN_ERR': "underline=CURL(RED)",
+            'T_CONN_DEL': "crossed",
+        }
+
+        norm = ConfColor('T_NORM')
+        alt = ConfColor('T_ALT')
+        conn_err = ConfColor('T_CONN_ERR')
+        conn_del = ConfColor('T_CONN_DEL')
+
+    def setUp(self):
+        self._orig_switch_interval = sys.getswitchinterval()
+        # switch threads as often as possible to provoke races
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self._orig_switch_interval)
+
+    def test_concurrent_rendering(self):
+        """Many threads lazily fill the caches of the same palette objects."""
+        n_threads = 8
+        n_iterations = 200
+        syntaxes = ['norm', 'alt']
+        connotations = [(), ('conn_err', ), ('conn_del', ), ('conn_del', 'conn_err'),
+                        ('conn_err', 'unknown_conn')]
+
+        colors_conf = ColorsConfig()
+
+        def render(thread_id):
+            results = []
+            for i in range(n_iterations):
+                plt = self.MyPalette(colors_conf=colors_conf)
+                synt_id = syntaxes[(i + thread_id) % len(syntaxes)]
+                conns = connotations[(i + thread_id) % len(connotations)]
+                fmt = plt.get_color(synt_id, *conns)
+                results.append((plt, synt_id, conns, fmt, str(fmt("text"))))
+            return results
+
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            all_results = [
+                r for results in pool.map(render, range(n_threads)) for r in results]
+
+        palettes = {id(r[0]) for r in all_results}
+        self.assertEqual(1, len(palettes), "only one palette object must be created")
+
+        # same requests must produce same formatters
+        expected = {}
+        for _, synt_id, conns, fmt, text in all_results:
+            expected_fmt, expected_text = expected.setdefault(
+                (synt_id, conns), (fmt, text))
+            self.assertIs(expected_fmt, fmt, f"{synt_id=}, {conns=}")
+            self.assertEqual(expected_text, text, f"{synt_id=}, {conns=}")
+
+        plt = self.MyPalette(colors_conf=colors_conf)
+        self.assertEqual(
+            expected[('alt', ('conn_err', ))][1],
+            str(ColorFmt("YELLOW", underline=("CURL", "RED"))("text")))
+        # the formatter with unknown connotation is the same as w/o it
+        self.assertIs(
+            plt.get_color('norm', 'conn_err', 'unknown_conn'),
+            plt.get_color('norm', 'conn_err'))
+
+    def test_concurrent_palettes_creation(self):
+        """Different palette classes are created and registered concurrently."""
+        n_threads = 8
+
+        palette_classes = []
+        for i in range(n_threads):
+            class _TstPalette(Palette):
+                SYNTAX_DEFAULTS = {f'T_SYNT_{i}': "BLUE"}
+                synt = ConfColor(f'T_SYNT_{i}')
+            palette_classes.append(_TstPalette)
+
+        colors_conf = ColorsConfig()
+
+        def mk_palettes(thread_id):
+            return [
+                palette_classes[(thread_id + j) % n_threads](colors_conf=colors_conf)
+                for j in range(n_threads)]
+
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            results = list(pool.map(mk_palettes, range(n_threads)))
+
+        for palettes in results:
+            for plt in palettes:
+                self.assertEqual(
+                    str(plt.synt("x")), str(ColorFmt("BLUE")("x")))
+
+        # (registration of new syntaxes resets the cache of the config, so
+        # palettes created above may be not the cached ones)
+        for palette_class in palette_classes:
+            self.assertIs(
+                palette_class(colors_conf=colors_conf),
+                palette_class(colors_conf=colors_conf))
+
+        for i in range(n_threads):
+            self.assertIn(f'T_SYNT_{i}', colors_conf.syntax_map)
@@ -2,13 +2,14 @@
 
 import unittest
 
-from datetime import datetime
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
 
 from ak.color import ColorFmt
 from ak.ppobj import FieldType, PPTable, RecordWithTraits
 from ak.pp_fields_types import (
     date_time_field_type, title_field_type,
-    PPDecimalFieldType, PPEnumFieldType, MatrixFieldValueType,
+    PPDateTimeFieldType, PPDecimalFieldType, PPEnumFieldType, MatrixFieldValueType,
 )
 from .test_ppobj import verify_table_format
 
@@ -107,6 +108,26 @@ class TestPPDateTimeFieldType(unittest.TestCase):
             # "conn_note" connotation adds double green underline
         )
 
+    def test_cell_text_len(self):
+        """Length of text is calculated w/o formatting the value."""
+        tz_values = [
+            None, timezone.utc, timezone(timedelta(hours=-3)),
+            timezone(timedelta(seconds=3601)),
+            timezone(timedelta(hours=1, microseconds=5)),
+        ]
+        values = [None, datetime(5, 1, 1), datetime(25, 1, 1, 3, 4, 5)] + [
+            datetime(2025, 8, 1, *time_part, tzinfo=tz)
+            for time_part in [(), (14, 44, 38), (0, 0, 0, 1)]
+            for tz in tz_values
+        ]
+        for fmt_modifier in [None, 'D', 'Dt', 'DT', 'S', 'MS']:
+            for value in values:
+                self.assertEqual(
+                    FieldType.get_cell_text_len(
+                        date_time_field_type, value, fmt_modifier, ()),
+                    date_time_field_type.get_cell_text_len(value, fmt_modifier, ()),
+                    f"{value!r}, {fmt_modifier}")
+
 
 class TestPPDecimalFieldType(unittest.TestCase):
     """Test TestPPDecimalFieldType."""
@@ -207,6 +228,25 @@ class TestPPDecimalFieldType(unittest.TestCase):
             f"the precision is not sufficient to print all digits:"
             f"\n Value:{expected_text}\n{color_text}")
 
+    def test_cell_text_len(self):
+        """Length of text is calculated w/o making colored text."""
+        values = [
+            None, "text", 0, 1, -1, 999, 1000, -1000, 123456789, -12345678,
+            10**30, 0.0, -0.001, 9.999, 1234.567, -1234.5, True, Decimal("12.345"),
+        ]
+        field_types = [
+            PPDecimalFieldType(precision, grouping=grouping, extra_digits_as_err=err)
+            for precision in (0, 2)
+            for grouping in (False, True)
+            for err in (False, True)
+        ]
+        for field_type in field_types:
+            for value in values:
+                self.assertEqual(
+                    FieldType.get_cell_text_len(field_type, value, None, ()),
+                    field_type.get_cell_text_len(value, None, ()),
+                    f"{value!r}, {field_type.precision}, {field_type._grp}")
+
 
 class TestPPEnumFieldType(unittest.TestCase):
     """Test FieldType for enum-looking values."""
@@ -438,6 +478,67 @@ class TestPPEnumFieldType(unittest.TestCase):
             l,
         )
 
+    def test_cells_cache(self):
+        """Test cells cache of the field type."""
+        statuses = {10: "Ok status", 999: ("Error status", "error")}
+        records = [
+            (1, 10), (2, 999), (3, 10), (4, 10),
+            RecordWithTraits((5, 10), None, {'status': 'conn_note'}),
+            RecordWithTraits((6, 10), None, {'status': 'conn_note'}),
+            (7, 1), (8, True),  # 1 == True, but these cells are different
+        ]
+
+        def mk_table(field_type):
+            return PPTable(
+                records, fields=['id', 'status'], fields_types={'status': field_type})
+
+        expected_lines = [str(l) for l in mk_table(PPEnumFieldType(statuses)).ch_text()]
+
+        cached_type = PPEnumFieldType(statuses).enable_cells_cache()
+        table = mk_table(cached_type)
+        self.assertEqual(expected_lines, [str(l) for l in table.ch_text()])
+        stats = cached_type.get_cells_cache_stats()
+        self.assertEqual(3, stats.hits)  # records 3, 4 and 6
+        self.assertEqual(5, stats.misses)
+        self.assertEqual(5, stats.size)
+
+        # cells are reused when the table is printed again
+        self.assertEqual(expected_lines, [str(l) for l in table.ch_text()])
+        stats = cached_type.get_cells_cache_stats()
+        self.assertEqual(11, stats.hits)
+        self.assertEqual(11/16, stats.hit_rate)
+
+        # cache size is limited
+        small_cache_type = PPEnumFieldType(statuses).enable_cells_cache(max_size=2)
+        table = mk_table(small_cache_type)
+        self.assertEqual(expected_lines, [str(l) for l in table.ch_text()])
+        self.assertEqual(2, small_cache_type.get_cells_cache_stats().size)
+
+        small_cache_type.disable_cells_cache()
+        self.assertIsNone(small_cache_type.get_cells_cache_stats())
+
+    def test_cells_cache_equal_values(self):
+        """Equal values, which are printed differently, have different cells."""
+        utc_time = datetime(2025, 8, 1, 12, 0, tzinfo=timezone.utc)
+        cases = [
+            (FieldType, [0.0, -0.0, 0.0]),
+            (FieldType, [Decimal('1.00'), Decimal('1.0'), Decimal('1')]),
+            (PPDateTimeFieldType, [
+                utc_time,
+                utc_time.astimezone(timezone(timedelta(hours=3))),
+                utc_time.astimezone(timezone(timedelta(hours=-5)))]),
+        ]
+        for field_type_cls, values in cases:
+            def mk_table(field_type):
+                return PPTable(
+                    [(value, ) for value in values], fields=['value'],
+                    fmt="value:30", fields_types={'value': field_type})
+            with self.subTest(values=values):
+                self.assertEqual(
+                    [str(l) for l in mk_table(field_type_cls()).ch_text()],
+                    [str(l) for l in mk_table(
+                        field_type_cls().enable_cells_cache()).ch_text()])
+
 
 class TestMatrixFieldType(unittest.TestCase):
     """Test MatrixFieldValueType"""
@@ -1,17 +1,23 @@
 """Test pretty-printing."""
 
+import os
+import sys
 import unittest
 import io
+import array
+import tempfile
+import csv
 import json
 from collections import namedtuple
 
+import ak.color
 from ak.color import CHText, ConfColor, ColorFmt, Palette, CompoundPalette
-from ak.ppobj import PPTrait, CHTextResult, PPStdFormatter, pp
+from ak.ppobj import PPTrait, CHTextResult, PPStdFormatter, pp, _DefaultFieldType
 from ak.ppobj import (
     PPObj,
     FieldType, FieldValueType, RecordField,
     PPRecordFmt, PPTable, TableBlock,
-    RecordWithTraits,
+    RecordWithTraits, ReprColumn, ReprStructure,
 )
 
 
@@ -211,6 +217,110 @@ class TestPrettyPrinter(unittest.TestCase):
         self.assertEqual(converted_result, by_line_print_result)
         self.assertEqual(converted_result, pp_result)
 
+    def test_deeply_nested_object(self):
+        """Nesting depth is not limited by recursion limit."""
+        depth = 3 * sys.getrecursionlimit()
+        obj = []
+        for i in range(depth):
+            obj = [obj] if i % 2 else {"k": [obj, i]}
+
+        lines = list(iter(PPStdFormatter()(obj, no_color=True)))
+        self.assertEqual("[", lines[0].plain_text())
+        self.assertEqual("]", lines[-1].plain_text())
+        plain_lines = [line.plain_text() for line in lines]
+        self.assertGreater(
+            max(len(line) - len(line.lstrip()) for line in plain_lines), depth)
+        self.assertIn("[],", [line.strip() for line in plain_lines])
+
+    def test_size_limits(self):
+        """Test max_items, max_depth and max_string_len limits."""
+        obj = {
+            "a": list(range(1000)),
+            "b": {"c": {"d": [1]}, "e": []},
+            "s": "x" * 100,
+            "z": [{"k": i} for i in range(5)],
+        }
+        formatter = PPStdFormatter(max_items=3, max_depth=2, max_string_len=10)
+        self.assertEqual(
+            [
+                '{',
+                '  "a": [0, 1, 2, ... 997 more items],',
+                '  "b": {"c": {... 1 item}, "e": []},',
+                '  "s": "xxxxxxxxxx... 90 more chars",',
+                '  ... 1 more item',
+                '}',
+            ],
+            [line.plain_text() for line in formatter(obj, no_color=True)])
+
+        self.assertEqual(
+            '["ab... 1 more char", [... 1 item]]',
+            PPStdFormatter(max_string_len=2, max_depth=1)(
+                ["abc", [1]], no_color=True).plain_text())
+
+        # elided items of containers printed in multiple lines
+        formatter = PPStdFormatter(max_items=2)
+        self.assertEqual(
+            ['[', '  [1, 2, ... 1 more item],', '  {"a": 1},', '  ... 1 more item', ']'],
+            [line.plain_text() for line in formatter(
+                [[1, 2, 3], {"a": 1}, "x"], no_color=True)])
+
+        # same limits are applied when json text is printed
+        result = formatter.format_stream(
+            io.StringIO('[[1, 2, 3], {"a": 1}, "x"]'), no_color=True, lookahead=1)
+        self.assertEqual(
+            ['[', '  [', '    1,', '    2,', '    ... 1 more item', '  ],',
+             '  {', '    "a": 1', '  },', '  ... 1 more item', ']'],
+            [line.plain_text() for line in result])
+
+        with self.assertRaises(ValueError):
+            PPStdFormatter(max_items=0)
+
+    def test_format_stream(self):
+        """Test pretty-printing of json text read from a file."""
+        obj = {
+            "b": [1, 2.5, "x", None, True, [], {}],
+            "a": {"z": list(range(100)), "y": [{"k": "v"}, {"k": "\u00e9"}]},
+        }
+        json_text = json.dumps(obj)
+        formatter = PPStdFormatter()
+        expected = formatter(obj, no_color=True).plain_text()
+
+        # small chunks: tokens are split between chunks
+        for chunk_size in (1, 7, 65536):
+            with self.subTest(chunk_size=chunk_size):
+                result = formatter.format_stream(
+                    io.StringIO(json_text), no_color=True, chunk_size=chunk_size)
+                self.assertEqual(expected, result.plain_text())
+
+        result = formatter.format_stream(
+            io.BytesIO(json_text.encode()), no_color=True, chunk_size=1)
+        self.assertEqual(expected, result.plain_text())
+
+        # chunk boundary inside a float: after '.', 'e' and 'e-'
+        for number_text in ("12345.5", "12345e7", "12345e-7", "12345.5E+7"):
+            json_text = f'["abcdefghijk", {number_text}]'
+            obj = json.loads(json_text)
+            for chunk_size in range(16, len(json_text) + 1):
+                with self.subTest(number_text=number_text, chunk_size=chunk_size):
+                    result = formatter.format_stream(
+                        io.StringIO(json_text), no_color=True, chunk_size=chunk_size)
+                    self.assertEqual(
+                        formatter(obj, no_color=True).plain_text(),
+                        result.plain_text())
+
+        # containers which do not fit into lookahead buffer are printed
+        # in multiple lines, keys are not sorted
+        result = formatter.format_stream(
+            io.StringIO('{"b": [1, 2], "a": {"c": [3]}}'), no_color=True, lookahead=3)
+        self.assertEqual(
+            ['{', '  "b": [1, 2],', '  "a": {', '    "c": [3]', '  }', '}'],
+            [line.plain_text() for line in result])
+
+        for bad_json in ['', '[1,', '{"a" 1}', '[1] 2', '[1,]', '"abc']:
+            with self.subTest(bad_json=bad_json):
+                with self.assertRaises(ValueError):
+                    formatter.format_stream(io.StringIO(bad_json)).plain_text()
+
 
 class TestCHTextResult(unittest.TestCase):
     """Test behavior of CHTextResult object.
@@ -251,6 +361,18 @@ class TestCHTextResult(unittest.TestCase):
         self.assertNotEqual(plain_text, print_result)
         self.assertIn("null", plain_text)
 
+    def test_rendered_text_cached(self):
+        """Text of the CHTextResult is generated only once."""
+        table = PPTable([(1, "one"), (2, "two")], fields=["id", "name"])
+        ch_text_result = table.ch_text()
+
+        colored_str = str(ch_text_result)
+        CHText.reset_render_cache_stats()
+        self.assertEqual(colored_str, str(ch_text_result))
+        self.assertEqual(colored_str, f"{ch_text_result}")
+        self.assertEqual(colored_str, str(ch_text_result.get_ch_text()))
+        self.assertEqual(0, CHText.get_render_cache_stats()['misses'])
+
     def test_iterating(self):
         """It should also be possible to iterate the result line by line.
 
@@ -587,6 +709,22 @@ class TestPPTrait(unittest.TestCase):
 
         self.assertEqual([], Trait2.find_all([t11, t1]))
 
+    def test_record_traits(self):
+        """Test traits of RecordWithTraits are shared and resolved once."""
+        r1 = RecordWithTraits((1, 2), 'conn_err', {'val': ['conn_del', 'conn_err']})
+        r2 = RecordWithTraits((3, 4), 'conn_err', {'val': ['conn_del', 'conn_err']})
+
+        # traits specified by connotation names are the same objects
+        self.assertEqual(r1.record_traits, r2.record_traits)
+        self.assertIs(r1.record_traits[0], r2.record_traits[0])
+        self.assertIs(r1.fields_traits['val'][0], r2.fields_traits['val'][0])
+
+        traits = r1.get_traits('val', 'val')
+        self.assertEqual(list(r1.gen_traits('val', 'val')), list(traits))
+        self.assertEqual(2, len(traits))
+        self.assertIs(traits, r1.get_traits('val', 'val'))
+        self.assertEqual(1, len(r1.get_traits('id', 'id')))
+
 
 #########################
 # Test PPTable
@@ -1101,6 +1239,59 @@ class TestPPTable(unittest.TestCase):
             cols_widths=[0, len("Arnold")],
         )
 
+    def test_display_width_mode(self):
+        """Columns with wide characters are aligned in display-width mode."""
+        records = [
+            (1, "日本語"),
+            (2, "abc"),
+            (3, "很长很长很长的名字"),
+        ]
+        ak.color.set_display_width_mode(True)
+        try:
+            table = PPTable(records, fields=['id', 'name'], fmt="id, name:10")
+            lines = [
+                ak.color.text_width(line)
+                for line in table.ch_text().plain_text().split("\n")
+                if line[0] in "|+"]
+        finally:
+            ak.color.set_display_width_mode(False)
+
+        self.assertEqual(1, len(set(lines)), f"lines of different widths: {lines}")
+
+    def test_bulk_width_detection(self):
+        """Column-at-a-time width detection gives same results as per-record one."""
+
+        class LongValue(FieldValueType):
+            def make_desired_cell_ch_chunks(self, fmt_modifier, cell_plt, traits):
+                return [cell_plt.text("x" * 20)], FieldType.ALIGN_LEFT
+
+        samples = [
+            [(1, ), (-12345, ), (99, )],
+            [(1, ), (True, ), ("some text", ), (None, )],
+            [(1.5, ), (-0.25, ), (1e20, )],
+            [(1, ), (LongValue(), )],
+            [(1, ), RecordWithTraits((22, ), fields_traits={'val': 'conn_err'})],
+            [(i, ) for i in range(10000)],
+        ]
+        fields = [
+            RecordField('val', FieldType(), 0),
+            RecordField('val', _DefaultFieldType(), 0),
+        ]
+        for records in samples:
+            for field in fields:
+                col = ReprColumn(field)
+                expected = max(col.get_cell_text_len(rec) for rec in records)
+                self.assertEqual(
+                    expected, col.get_max_cell_text_len(records, 999), records)
+                self.assertEqual(
+                    min(expected, 3), col.get_max_cell_text_len(records, 3), records)
+
+                table = PPTable(records, fields=[field], footer="")
+                table.get_table_width()
+                self.assertEqual(
+                    max(expected, len('val')),
+                    table.fmt.repr_structure.columns[0].width)
+
     def test_construct_with_explicit_fields(self):
         """Test creation of PPTable with manually created fields."""
         # prepare the table for experiments
@@ -1301,6 +1492,325 @@ class TestPPTable(unittest.TestCase):
             n_body_lines=9,  # 5 visible records + 4 'break by' lines
         )
 
+    def test_render_plan_cache(self):
+        """Objects used to print the table are reused for the same palette."""
+        records = [(i, f"user {i:02}", 10 if i < 4 else 20) for i in range(1, 8)]
+        table = PPTable(
+            records, fields=['id', 'name', 'status'],
+            fmt="name, status!, id", limits=(2, 1))
+
+        lines = list(table.ch_text(no_color=True))
+        lines_1 = list(table.ch_text(no_color=True))
+        self.assertEqual([str(l) for l in lines], [str(l) for l in lines_1])
+        self.assertIs(lines[0], lines_1[0])  # border line is reused
+
+        # other palette - other plan
+        colored_lines = list(table.ch_text())
+        self.assertIsNot(lines[0], colored_lines[0])
+        self.assertEqual(lines[0].plain_text(), colored_lines[0].plain_text())
+
+        # shared lines are not modified when printed together with other objects
+        output = io.StringIO()
+        pp(table, table, file=output)
+        self.assertEqual([str(l) for l in lines], [str(l) for l in table.ch_text(no_color=True)])
+
+        # format of the table changed - the plan is re-created
+        table.remove_columns(['id'])
+        lines_2 = list(table.ch_text(no_color=True))
+        self.assertEqual(len(lines[0]) - 3, len(lines_2[0]))
+        table.set_fmt("name, status, id;*")
+        lines_3 = list(table.ch_text(no_color=True))
+        self.assertEqual(len(lines[0]), len(lines_3[0]))
+        self.assertEqual(len(records) + 5, len(lines_3))  # no 'break by' lines
+
+    def test_render_window(self):
+        """Test rendering of a part of the table."""
+        records = [(i, f"user {i:02}", 10 if i < 4 else 20) for i in range(1, 8)]
+        table = PPTable(
+            records, fields=['id', 'name', 'status'],
+            fmt="name, status!, id", limits=(2, 1))
+
+        # limits are ignored by render_window, all the lines are rendered
+        all_lines = [str(l) for l in table.render_window(0, None, no_color=True)]
+        self.assertEqual(8, len(all_lines))  # 7 records + 1 'break by' line
+        self.assertEqual("|user 01|    10| 1|", all_lines[0])
+        self.assertNotIn("user", all_lines[3])  # 'break by' line
+        self.assertEqual("|user 07|    20| 7|", all_lines[-1])
+
+        window = [str(l) for l in table.render_window(2, 5, no_color=True)]
+        self.assertEqual(all_lines[2:6], window)
+
+        # 'break by' line preceding the first record is not included
+        window = [str(l) for l in table.render_window(3, 5, no_color=True)]
+        self.assertEqual(all_lines[4:6], window)
+
+        self.assertEqual(
+            all_lines[-2:],
+            [str(l) for l in table.render_window(-2, None, no_color=True)])
+        self.assertEqual([], table.render_window(10, 20))
+
+        # table lines are the same as produced by normal printing
+        table.fmt = "name, status!, id"  # no limits
+        colored_lines = [str(l) for l in table.ch_text()]
+        self.assertEqual(
+            colored_lines[3:5], [str(l) for l in table.render_window(0, 2)])
+
+        # widths of the columns fit the records hidden by the limits
+        table = PPTable(
+            [(1, "a"), (2, "b"), (3, "a very long name in the middle"), (4, "c")],
+            fields=["id", "name"], limits=(1, 1))
+        table_text = str(table)
+        self.assertEqual(
+            "| 3|a very long name in the middle|",
+            str(table.render_window(2, 3, no_color=True)[0]))
+        # widths of the table itself are not changed
+        self.assertEqual(table_text, str(table))
+
+    def test_table_views(self):
+        """Test sorted, filtered and grouped views of a table."""
+        records = [
+            (1, "bob", 20), (2, "alice", None), (3, "ann", 10), (4, "john", 20)]
+        table = PPTable(records, fields=['id', 'name', 'status'], fmt="id, name, status")
+
+        def body(tbl):
+            return [str(l) for l in tbl.ch_text(no_color=True)][3:-2]
+
+        view = table.sorted_by('status')
+        self.assertEqual([3, 1, 4, 2], [rec[0] for rec in view.records])
+        self.assertIs(records, view.records.base)  # records are not copied
+        self.assertEqual("Total 4 records", view.footer)
+        self.assertEqual([4, 1], [rec[0] for rec in view.where(
+            lambda rec: rec[2] == 20).sorted_by('id', reverse=True).records])
+
+        # widths of the columns of a printed table are reused
+        body(table)
+        narrow_view = table.where(lambda rec: rec[0] == 1)
+        self.assertIs(records, narrow_view.records.base)
+        self.assertEqual(["| 1|bob  |    20|"], body(narrow_view))
+
+        grouped = table.where(lambda rec: rec[0] != 2).grouped('status')
+        self.assertIs(records, grouped.records.base)
+        self.assertEqual(
+            ["| 1|bob  |    20|", "| 4|john |    20|", "|               |",
+             "| 3|ann  |    10|"],
+            body(grouped))
+        # format of the original table is not changed
+        self.assertNotIn("|               |", body(table))
+
+        with self.assertRaises(ValueError):
+            table.sorted_by('unknown')
+
+        # predicate takes records w/o traits
+        table = PPTable(
+            [RecordWithTraits(rec, 'conn_err') for rec in records],
+            fields=['id', 'name', 'status'])
+        self.assertEqual(
+            [1, 4], [rec.record[0] for rec in table.where(
+                lambda rec: rec[2] == 20).records])
+
+        # ... and {column_name: value} dictionaries in case of columnar data
+        table = PPTable.from_columns(
+            {'id': [1, 2, 3, 4], 'name': ["bob", "alice", "ann", "john"]})
+        view = table.where(lambda row: row['name'].startswith("a")).sorted_by('id')
+        self.assertEqual([1, 2], list(view.records))  # indexes in the columns
+        self.assertIn("|alice|", str(view.ch_text(no_color=True)))
+
+    def test_aggregates(self):
+        """Test aggregates of the columns printed after the records."""
+        records = [
+            (1, "a", 10), (2, "a", None), (3, "b", 5), (4, "b", 7), (5, "c", 1)]
+
+        table = PPTable(
+            records, fields=['id', 'grp', 'amount'], fmt="id, grp!, amount",
+            aggregates={'id': 'count', 'amount': 'sum'}, group_aggregates=True)
+        lines = [str(l) for l in table.ch_text(no_color=True)]
+        # names of the functions are printed in the first column w/o aggregate,
+        # the column is widened to fit them
+        self.assertEqual(
+            ["| 1|a        |    10|",
+             "| 2|a        |  None|",
+             "| 2|count/sum|    10|",  # aggregates of group 'a'
+             "|                   |",  # 'break by' line
+             "| 3|b        |     5|",
+             "| 4|b        |     7|",
+             "| 2|count/sum|    12|",
+             "|                   |",
+             "| 5|c        |     1|",
+             "| 1|count/sum|     1|",
+             "+--+---------+------+",
+             "| 5|count/sum|    23|",  # aggregates of all the records
+             "+--+---------+------+"],
+            lines[3:-1])
+
+        # same lines are printed in streaming mode
+        stream_table = PPTable(
+            iter(records), fields=['id', 'grp', 'amount'], fmt="id, grp!, amount",
+            aggregates={'id': 'count', 'amount': 'sum'}, group_aggregates=True,
+            stream_sample=10)
+        self.assertEqual(lines, [str(l) for l in stream_table.ch_text(no_color=True)])
+
+        # aggregates of all the records are calculated even if some of the
+        # records are not visible; columns are wide enough for the aggregates
+        table = PPTable(
+            records, fields=['id', 'grp', 'amount'], fmt="id, grp, amount;1:1",
+            aggregates={'grp': 'distinct', 'amount': 'avg', 'id': 'max'})
+        lines = [str(l) for l in table.ch_text(no_color=True)]
+        self.assertEqual("| 5|  3|  5.75|", lines[-3])
+
+        # views have the same aggregates
+        view = table.where(lambda rec: rec[1] != "a")
+        lines = [str(l) for l in view.ch_text(no_color=True)]
+        self.assertEqual("| 5|  2|  4.33|", lines[-3])
+
+        # the label is printed in the first column w/o aggregate
+        table = PPTable(
+            records, fields=['id', 'grp', 'amount'], fmt="id, grp, amount;1:1",
+            aggregates={'amount': 'avg'})
+        lines = [str(l) for l in table.ch_text(no_color=True)]
+        self.assertEqual("|avg|   |  5.75|", lines[-3])
+
+        # average is rounded; small values keep significant digits
+        table = PPTable(
+            [(10, 0.0012), (30, 0.0013), (40, 0.0013)], fields=['n', 'x'],
+            aggregates={'n': 'avg', 'x': 'avg'})
+        lines = [str(l) for l in table.ch_text(no_color=True)]
+        self.assertEqual("|26.67|0.0013|", lines[-3])
+
+        # aggregate function is not applicable to the values of the column
+        table = PPTable(
+            records, fields=['id', 'grp', 'amount'], aggregates={'grp': 'sum'})
+        with self.assertRaisesRegex(ValueError, "'sum'.*'grp'"):
+            str(table)
+
+        with self.assertRaises(ValueError):
+            PPTable(records, fields=['id', 'grp', 'amount'], aggregates={'id': 'median'})
+        with self.assertRaises(ValueError):
+            PPTable(records, fields=['id', 'grp', 'amount'], aggregates={'x': 'sum'})
+
+    def test_append_records(self):
+        """Test appending records to already printed table."""
+        records = [(i, f"user {i:02}", 10 if i < 4 else 20) for i in range(1, 6)]
+        mk_table = lambda recs, fmt="name, status!, id": PPTable(
+            list(recs), fields=['id', 'name', 'status'], fmt=fmt)
+
+        table = mk_table(records[:3])
+        self.assertFalse(table.append(records[3:4]))  # table was not printed yet
+        self.assertEqual(str(mk_table(records[:4])), str(table))
+
+        # new records fit into the columns
+        self.assertFalse(table.append(records[4:]))
+        expected_lines = [str(l) for l in mk_table(records).ch_text()]
+        self.assertEqual(expected_lines, [str(l) for l in table.ch_text()])
+        # the new record is the last one in the body (followed by border and footer)
+        self.assertEqual(
+            [expected_lines[-3]], [str(l) for l in table.render_appended()])
+
+        table = mk_table(records[:3])
+        str(table)
+        self.assertFalse(table.append(records[3:]))
+        # 'break_by' line and two records
+        self.assertEqual(
+            expected_lines[-5:-2], [str(l) for l in table.render_appended()])
+
+        # new records do not fit into the columns
+        long_rec = (1000, "user with long name", 20)
+        self.assertTrue(table.append([long_rec]))
+        self.assertEqual(str(mk_table(records + [long_rec])), str(table))
+
+        # table with limits
+        for n_start in range(5):
+            table = mk_table(records[:n_start], fmt="name, status!, id;1:2")
+            str(table)
+            for rec in records[n_start:]:
+                table.append([rec])
+            self.assertEqual(
+                str(mk_table(records, fmt="name, status!, id;1:2")), str(table))
+
+        # new records fill the first visible lines
+        records = [(i, f"u{i}", 10) for i in range(6)]
+        fmt = "id, name;3:1"
+        table = mk_table(records[:2], fmt=fmt)
+        str(table)
+        self.assertTrue(table.append(records[2:6]))
+        self.assertEqual(str(mk_table(records, fmt=fmt)), str(table))
+
+        # list of records passed to the constructor is not modified
+        own_records = records[:2]
+        table = PPTable(own_records, fields=['id', 'name', 'status'])
+        table.append(records[2:4])
+        table.append(records[4:])
+        self.assertEqual(2, len(own_records))
+        self.assertEqual(6, len(table.records))
+
+    def test_table_from_columns(self):
+        """Test table made of columnar data."""
+        ids = array.array('I', range(1, 8))
+        names = [f"user {i:02}" for i in ids]
+        statuses = [10 if i < 4 else 20 for i in ids]
+        records = list(zip(ids, names, statuses))
+
+        for fmt in [None, "name, status!, id", "name, id;2:2", "status, name;1:0"]:
+            table = PPTable.from_columns(
+                {'id': ids, 'name': names, 'status': statuses}, fmt=fmt)
+            self.assertIsInstance(table.records, range)
+            expected = PPTable(records, fields=['id', 'name', 'status'], fmt=fmt)
+            self.assertEqual(str(expected), str(table), fmt)
+
+        # only a part of the column is used to detect widths of columns
+        names[-1] = "user with long name"
+        table = PPTable.from_columns(
+            {'id': ids, 'name': names}, fmt="id, name;2:0")
+        verify_table_format(self, table, cols_widths=[2, 7])
+
+        field = RecordField.for_column('name', FieldType(), names)
+        self.assertEqual(names[2:4], field.fetch_values(range(2, 4)))
+        self.assertEqual([names[1], names[3]], field.fetch_values([1, 3]))
+        self.assertEqual(
+            (names[1], 'x'),
+            RecordField.make_values_getter([field, RecordField('c', FieldType(), '=x')])(1))
+
+        with self.assertRaises(ValueError):
+            PPTable.from_columns({'id': ids, 'name': names[:2]})
+
+    def test_write_parallel(self):
+        """Test rendering of a table into a file by several processes."""
+        records = [(i, f"user {i:02}", 10 * (i // 4)) for i in range(25)]
+        # record hidden by the limits; widths of the columns must fit it
+        records[10] = (10, "user with a long name", 20)
+        expected = str(PPTable(
+            records, fields=['id', 'name', 'status'], fmt="name, status!, id",
+            header="Users")) + "\n"
+
+        table = PPTable(
+            records, fields=['id', 'name', 'status'], fmt="name, status!, id;2:2",
+            header="Users")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "table.txt")
+            for workers, block_size in [(1, None), (2, 3), (3, 4), (2, 100)]:
+                table.write_parallel(filename, workers=workers, block_size=block_size)
+                with open(filename) as f:
+                    self.assertEqual(expected, f.read(), f"{workers=}, {block_size=}")
+
+            table.write_parallel(filename, workers=2, block_size=10, no_color=True)
+            with open(filename) as f:
+                self.assertEqual(CHText.strip_colors(expected), f.read())
+            # widths of the columns of the table itself are not changed
+            self.assertEqual(
+                str(PPTable(
+                    records, fields=['id', 'name', 'status'],
+                    fmt="name, status!, id;2:2", header="Users")),
+                str(table))
+
+            # lines with aggregates of the groups
+            table = PPTable(
+                records, fields=['id', 'name', 'status'], fmt="name, status!, id",
+                aggregates={'id': 'sum'}, group_aggregates=True)
+            expected = str(table) + "\n"
+            for workers, block_size in [(1, None), (2, 3), (3, 4)]:
+                table.write_parallel(filename, workers=workers, block_size=block_size)
+                with open(filename) as f:
+                    self.assertEqual(expected, f.read(), f"{workers=}, {block_size=}")
+
     def test_empty_table(self):
         """Test empty table when it's impossible to detect field names."""
 
@@ -1496,6 +2006,158 @@ class TestCustomTableLines(unittest.TestCase):
         )
 
 
+class TestStreamingPPTable(unittest.TestCase):
+    """Test PPTable in streaming mode."""
+
+    @staticmethod
+    def _mk_records(n_records):
+        return [(i, f"user {i:02}", 10 * (i // 3)) for i in range(n_records)]
+
+    def test_same_as_usual_table(self):
+        """Streaming table looks the same if the sample contains all records."""
+        for n_records in range(12):
+            records = self._mk_records(n_records)
+            for fmt in ["name, status, id", "name, status!, id;3:2", "name;0:2", "id;2:0"]:
+                table = PPTable(records, fields=['id', 'name', 'status'], fmt=fmt)
+                stream_table = PPTable(
+                    (r for r in records), fields=['id', 'name', 'status'], fmt=fmt,
+                    stream_sample=n_records)
+                self.assertEqual(
+                    str(table), str(stream_table), f"{n_records=}, {fmt=}")
+                self.assertEqual(str(table.fmt), str(stream_table.fmt))
+
+    def test_records_fetched_lazily(self):
+        """Records are fetched from iterator while lines are generated."""
+        n_fetched = 0
+
+        def gen_records():
+            nonlocal n_fetched
+            for rec in self._mk_records(1000):
+                n_fetched += 1
+                yield rec
+
+        table = PPTable(
+            gen_records(), fields=['id', 'name', 'status'], fmt="id:3, name:20;5:5",
+            stream_sample=10)
+        self.assertEqual(10, n_fetched)
+
+        lines_iter = iter(table.ch_text(no_color=True))
+        first_lines = [next(lines_iter) for _ in range(4)]
+        self.assertEqual(10, n_fetched)
+        self.assertIn("user 00", first_lines[-1].plain_text())
+
+        last_lines = [line.plain_text() for line in lines_iter]
+        self.assertEqual(1000, n_fetched)
+        self.assertEqual("Total 1000 records", last_lines[-1].strip())
+        self.assertIn("990 records skipped", "\n".join(last_lines))
+        self.assertIn("user 999", "\n".join(last_lines))
+
+        # streaming table can be printed only once
+        with self.assertRaises(ValueError):
+            str(table)
+
+    def test_widths_from_sample(self):
+        """Values longer than the sampled widths are truncated."""
+        records = [(1, "short"), (2, "much longer name")]
+        table = PPTable(
+            iter(records), fields=['id', 'name'], stream_sample=1, footer="")
+        lines = table.ch_text(no_color=True).plain_text().split("\n")
+        self.assertEqual(1, len({len(line) for line in lines}), f"{lines}")
+        self.assertIn("mu...", lines[-2])
+
+        # empty sample: widths are detected using titles and declared widths
+        table = PPTable(
+            iter(records), fields=['id', 'name'], fmt="id, name:8",
+            stream_sample=0)
+        lines = table.ch_text(no_color=True).plain_text().split("\n")
+        self.assertIn("| 2|much ...|", lines)
+
+
+class TestPPTableExport(unittest.TestCase):
+    """Test export of PPTable values in plain data formats."""
+
+    _RECORDS = [
+        (1, "user 01", 10.5, None),
+        (2, "comma, and | pipe", -1, True),
+        RecordWithTraits((3, 'quote "x"', 0, False), None, {'id': 'conn_err'}),
+    ]
+
+    def _mk_table(self, **kwargs):
+        return PPTable(
+            self._RECORDS, fields=['id', 'name', 'value', 'flag'],
+            fmt="name, id, value, flag;1:1", **kwargs)
+
+    def test_csv_export(self):
+        """Test csv and tsv formats."""
+        for fmt, delimiter in [('csv', ','), ('tsv', '\t')]:
+            stream = io.StringIO(newline='')
+            self._mk_table().export(fmt, stream, batch_size=2)
+            rows = list(csv.reader(io.StringIO(stream.getvalue()), delimiter=delimiter))
+            self.assertEqual(
+                [
+                    ['name', 'id', 'value', 'flag'],
+                    ['user 01', '1', '10.5', ''],
+                    ['comma, and | pipe', '2', '-1', 'True'],
+                    ['quote "x"', '3', '0', 'False'],
+                ],
+                rows, fmt)
+
+    def test_jsonl_export(self):
+        """Types of values are preserved in JSON Lines."""
+        stream = io.StringIO()
+        self._mk_table().export('jsonl', stream)
+        self.assertEqual(
+            [
+                {'name': "user 01", 'id': 1, 'value': 10.5, 'flag': None},
+                {'name': "comma, and | pipe", 'id': 2, 'value': -1, 'flag': True},
+                {'name': 'quote "x"', 'id': 3, 'value': 0, 'flag': False},
+            ],
+            [json.loads(line) for line in stream.getvalue().splitlines()])
+
+    def test_markdown_export(self):
+        """Test markdown format."""
+        stream = io.StringIO()
+        self._mk_table().export('markdown', stream)
+        self.assertEqual(
+            "| name | id | value | flag |\n"
+            "|---|---|---|---|\n"
+            "| user 01 | 1 | 10.5 |  |\n"
+            "| comma, and \\| pipe | 2 | -1 | True |\n"
+            '| quote "x" | 3 | 0 | False |\n',
+            stream.getvalue())
+
+    def test_streaming_table_export(self):
+        """Records of streaming table are fetched from the iterator in batches."""
+        n_fetched = 0
+        max_lag = 0
+
+        class _Stream(io.StringIO):
+            def write(self, text):
+                nonlocal max_lag
+                max_lag = max(max_lag, n_fetched - (self.getvalue().count("\n") - 1))
+                return super().write(text)
+
+        def gen_records():
+            nonlocal n_fetched
+            for i in range(1000):
+                n_fetched += 1
+                yield (i, f"user {i}")
+
+        table = PPTable(gen_records(), fields=['id', 'name'], stream_sample=5)
+        stream = _Stream(newline='')
+        table.export('csv', stream, batch_size=100)
+        self.assertEqual(1000, n_fetched)
+        self.assertEqual(1001, stream.getvalue().count("\n"))
+        self.assertLessEqual(max_lag, 100)
+
+        with self.assertRaises(ValueError):
+            table.export('csv', io.StringIO())
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            self._mk_table().export('xml', io.StringIO())
+
+
 class TestByLineTableOperations(unittest.TestCase):
     """Test how colored text is generated for table in 'line-by-line' mode."""
 
@@ -1764,6 +2426,76 @@ class TestEnhancedPPTable(unittest.TestCase):
             cols_widths=[len('seat'), len("Arnold")],
         )
 
+    def test_repr_structure_templates_cache(self):
+        """ReprStructure objects made from the same arguments are cached."""
+        ReprStructure.clear_templates_cache()
+        records = [(1, "a", "b"), (22, "cc", "dd")]
+        fields = ['id', 'name', 'descr']
+        fmt = "id, name:5, name:3, descr"
+        fields_types = {'name': FieldType()}
+
+        table = PPTable(records, fields=fields, fmt=fmt, fields_types=fields_types)
+        stats = ReprStructure.get_templates_cache_stats()
+        self.assertEqual((0, 1, 1), (stats.hits, stats.misses, stats.size))
+
+        table_1 = PPTable(
+            records[:1], fields=fields, fmt=fmt, fields_types=fields_types)
+        stats = ReprStructure.get_templates_cache_stats()
+        self.assertEqual((1, 1, 1), (stats.hits, stats.misses, stats.size))
+
+        # tables do not share mutable objects
+        self.assertEqual(str(table.fmt), str(table_1.fmt))
+        table_1.get_table_width()
+        self.assertNotEqual(str(table.fmt), str(table_1.fmt))  # widths
+        self.assertEqual(
+            ["id", "name", "name_1", "descr"],
+            [col.name for col in table_1._ppt_fmt.repr_structure.columns])
+        table_1.remove_columns(['name_1'])
+        self.assertEqual(
+            ["|id|name |...|descr|", "| 1|a    |a  |b    |"],
+            [str(l) for l in table.ch_text(no_color=True)][1:5:2])
+
+        # other field type object - other template
+        PPTable(records, fields=fields, fmt=fmt, fields_types={'name': FieldType()})
+        self.assertEqual(2, ReprStructure.get_templates_cache_stats().size)
+
+        ReprStructure.clear_templates_cache()
+        stats = ReprStructure.get_templates_cache_stats()
+        self.assertEqual((0, 0, 0), (stats.hits, stats.misses, stats.size))
+
+    def test_compiled_value_paths(self):
+        """Value paths are compiled into callables."""
+        Address = namedtuple('Address', ['zipcode', 'city'])
+        User = namedtuple('User', ['name', 'address'])
+        record = ({'user': User("Linus", Address('00100', "Helsinki"))}, 'x')
+
+        paths_and_values = [
+            (1, 'x'),
+            ("0.[user].name", "Linus"),
+            ("0.[user].address.zipcode", '00100'),
+            ("0.[user].1.city", "Helsinki"),
+            ("0.[user].address.", '00100'),  # last step is the field name
+            ("=const", "const"),
+        ]
+        fields = [
+            RecordField('zipcode', FieldType(), value_path)
+            for value_path, _ in paths_and_values]
+        for field, (value_path, value) in zip(fields, paths_and_values):
+            self.assertEqual(value, field.fetch_value(record), value_path)
+
+        values_getter = RecordField.make_values_getter(fields)
+        self.assertEqual(
+            tuple(value for _, value in paths_and_values), values_getter(record))
+        self.assertEqual((), RecordField.make_values_getter([])(record))
+
+        # attribute names which can't be used in python expressions
+        obj = type('Obj', (), {'class': 'cls_value'})()
+        field = RecordField('class', FieldType(), "0.class")
+        self.assertEqual('cls_value', field.fetch_value([obj]))
+        self.assertEqual(
+            ('cls_value', 'cls_value'),
+            RecordField.make_values_getter([field, field])([obj]))
+
 
 class TestPPTableStyle(unittest.TestCase):
     """Test PPTables with different styles."""